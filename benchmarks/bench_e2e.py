@@ -0,0 +1,238 @@
+"""
+Offline end-to-end benchmark: ingest, retrieval and tailor against a stub LLM.
+
+    python benchmarks/bench_e2e.py --files 200 --output results/HEAD.json
+    python benchmarks/bench_e2e.py --files 200 --compare results/HEAD.json
+
+Builds a synthetic vault (see synthetic_vault.py) in a temporary directory,
+starts an OpenAI-compatible stub server (see stub_llm.py) and measures:
+
+- ingest: full ingest_vault() time and chunks/sec
+- retrieval: cold first search, then p50/p99 per JD search
+- tailor: tailor_resume_section() per JD against templates/resume.tex (the first
+  run, which pays for client and index setup, is reported separately)
+
+Results are printed (and written with --output) as JSON along with the git
+commit and the settings used, so runs from different commits can be compared.
+--compare prints the relative change of every metric against an earlier file.
+
+By default the configured embedding model is used. --offline-embeddings swaps
+in a hashed bag-of-words embedder so the suite needs no model download; vector
+search is then still exercised, but embedding time is not representative.
+"""
+import argparse
+import hashlib
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import ExitStack, redirect_stdout
+from typing import Dict, List
+from unittest.mock import patch
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.stub_llm import StubLLMServer  # noqa: E402
+from benchmarks.synthetic_vault import generate_vault, synthetic_job_description  # noqa: E402
+from resume_forge import vectorstore  # noqa: E402
+from resume_forge.batch import percentile  # noqa: E402
+from resume_forge.bm25 import tokenize  # noqa: E402
+from resume_forge.config import settings  # noqa: E402
+
+TEMPLATE_PATH = os.path.join(REPO_ROOT, "templates", "resume.tex")
+
+
+class HashingEmbeddings(Embeddings):
+    """Normalized hashed bag-of-words vectors: deterministic, fast and offline."""
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def _embed(self, text: str) -> List[float]:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for term in tokenize(text):
+            bucket = int.from_bytes(hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest(), "little")
+            vector[bucket % self.dim] += 1.0
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
+
+
+def _git_commit() -> Dict[str, object]:
+    def git(*args):
+        return subprocess.run(
+            ["git", *args], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+
+    try:
+        return {"commit": git("rev-parse", "HEAD"), "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+
+
+def _latency_stats(latencies: List[float], percentiles=(50, 99)) -> Dict[str, float]:
+    stats = {f"p{p}_ms": round(percentile(latencies, p) * 1000, 3) for p in percentiles}
+    stats["mean_ms"] = round(sum(latencies) / len(latencies) * 1000, 3)
+    return stats
+
+
+def bench_ingest(vault_path: str) -> dict:
+    start = time.perf_counter()
+    chunks = vectorstore.ingest_vault(vault_path)
+    elapsed = time.perf_counter() - start
+    return {"chunks": chunks, "seconds": round(elapsed, 3), "chunks_per_sec": round(chunks / elapsed, 1)}
+
+
+def bench_retrieval(jds: List[str]) -> dict:
+    vectorstore._invalidate_vectorstore()
+    start = time.perf_counter()
+    retriever = vectorstore.get_retriever(k=settings.RETRIEVAL_FETCH_K)
+    retriever.invoke(jds[0])
+    cold = time.perf_counter() - start
+
+    latencies = []
+    for jd in jds:
+        start = time.perf_counter()
+        retriever.invoke(jd)
+        latencies.append(time.perf_counter() - start)
+    return {"queries": len(jds), "cold_ms": round(cold * 1000, 3), **_latency_stats(latencies)}
+
+
+def bench_tailor(jds: List[str], server: StubLLMServer) -> dict:
+    # Imported here so that import time is not attributed to ingest
+    from resume_forge.pipeline import tailor_resume_section
+
+    with open(TEMPLATE_PATH, "r") as f:
+        template = f.read()
+
+    requests_before = server.requests
+    latencies = []
+    for jd in jds:
+        start = time.perf_counter()
+        output = tailor_resume_section(jd, template)
+        latencies.append(time.perf_counter() - start)
+        if "% Error generating" in output:
+            raise RuntimeError("A section failed to generate; is the stub server reachable?")
+
+    warm = latencies[1:] or latencies
+    return {
+        "runs": len(jds),
+        "cold_ms": round(latencies[0] * 1000, 3),
+        **_latency_stats(warm, percentiles=(50, 95, 99)),
+        "llm_requests_per_run": (server.requests - requests_before) / len(jds),
+    }
+
+
+def run(args) -> dict:
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as workdir, ExitStack() as stack:
+        vault_path = os.path.join(workdir, "vault")
+        generate_vault(vault_path, args.files, args.bullets, args.seed)
+
+        server = stack.enter_context(StubLLMServer(
+            latency=args.latency, tokens_per_sec=args.tokens_per_sec, max_tokens=args.max_tokens
+        ))
+        overrides = {
+            "CHROMA_PERSIST_DIR": os.path.join(workdir, "store"),
+            "EMBEDDING_CACHE_ENABLED": False,  # measure real embedding work, not cache hits
+            "LLM_CACHE_ENABLED": False,
+            "LM_STUDIO_BASE_URL": server.base_url,
+            "RETRIEVAL_MODE": args.retrieval,
+            "VECTOR_BACKEND": args.backend,
+        }
+        for name, value in overrides.items():
+            stack.enter_context(patch.object(settings, name, value))
+        if args.offline_embeddings:
+            stack.enter_context(patch.object(vectorstore, "get_embeddings", lambda: HashingEmbeddings()))
+
+        results = {
+            "ingest": bench_ingest(vault_path),
+            "retrieval": bench_retrieval([synthetic_job_description(rng) for _ in range(args.queries)]),
+            "tailor": bench_tailor([synthetic_job_description(rng) for _ in range(args.runs)], server),
+        }
+        vectorstore._invalidate_vectorstore()
+
+    return {
+        "meta": {
+            **_git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": vars(args),
+            "settings": {
+                name: getattr(settings, name)
+                for name in ("EMBEDDING_MODEL", "TOP_K", "RETRIEVAL_FETCH_K", "CONTEXT_TOKEN_BUDGET",
+                             "SECTION_CONCURRENCY", "MULTI_SECTION_GENERATION")
+            },
+        },
+        "results": results,
+    }
+
+
+def _flatten(results: dict, prefix: str = "") -> Dict[str, float]:
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, name + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(baseline: dict, current: dict) -> str:
+    """Formats the relative change of every numeric metric against a baseline run."""
+    before, after = _flatten(baseline["results"]), _flatten(current["results"])
+    lines = [f"{'metric':<28} {'baseline':>12} {'current':>12} {'change':>8}"]
+    for name in sorted(before.keys() & after.keys()):
+        change = (after[name] - before[name]) / before[name] * 100 if before[name] else 0.0
+        lines.append(f"{name:<28} {before[name]:>12g} {after[name]:>12g} {change:>+7.1f}%")
+    lines.append(f"baseline commit: {baseline['meta'].get('commit')}  current: {current['meta'].get('commit')}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=100, help="Synthetic vault files")
+    parser.add_argument("--bullets", type=int, default=5, help="Lines per bullet list in each file")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--queries", type=int, default=100, help="JD searches to time")
+    parser.add_argument("--runs", type=int, default=5, help="Tailor runs to time")
+    parser.add_argument("--retrieval", default="dense", choices=["dense", "lexical", "hybrid"])
+    parser.add_argument("--backend", default=settings.VECTOR_BACKEND, choices=["chroma", "numpy"])
+    parser.add_argument("--latency", type=float, default=0.05, help="Stub server seconds before the first token")
+    parser.add_argument("--tokens-per-sec", type=float, default=0.0, help="Stub generation speed (0 = unlimited)")
+    parser.add_argument("--max-tokens", type=int, default=None, help="Stub tokens per response")
+    parser.add_argument("--offline-embeddings", action="store_true", help="Use hashed embeddings (no model)")
+    parser.add_argument("--output", help="Write the JSON results to this file")
+    parser.add_argument("--compare", help="Print changes against an earlier results file")
+    args = parser.parse_args()
+
+    # The pipeline prints progress; keep stdout for the JSON results
+    with redirect_stdout(sys.stderr):
+        results = run(args)
+    print(json.dumps(results, indent=2))
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare, "r") as f:
+            print(compare(json.load(f), results), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Micro-benchmark: single-pass LatexSanitizer vs. the original eight-pass sanitizer.
+
+    python benchmarks/bench_sanitizer.py --items 2000 --repeat 5
+
+Generates large synthetic LLM outputs (itemized bullets with markdown bold,
+italics, percentages, ampersands, dollar amounts, stray headers and hallucinated
+commands), checks both implementations agree, and reports the best time of each.
+"""
+import argparse
+import json
+import random
+import time
+
+from resume_forge.latex import LatexSanitizer, reference_sanitize_latex
+
+VERBS = ["Engineered", "Optimized", "Led", "Designed", "Automated", "Migrated", "Scaled"]
+TECH = ["Python", "Airflow", "TensorFlow", "SQL", "Kubernetes", "AWS SageMaker", "Redis"]
+
+
+def synthetic_llm_output(items: int, seed: int = 0) -> str:
+    """Builds a realistic, messy LLM section with `items` bullet points."""
+    rng = random.Random(seed)
+    lines = ["```latex", "## Experience", "\\begin{itemize}", "    \\itemsep -1pt"]
+    for i in range(items):
+        verb, tech = rng.choice(VERBS), rng.choice(TECH)
+        bullet = rng.choice([
+            f"{verb} **{tech}** pipelines, cutting latency by {rng.randint(5, 90)}% & cost by ${rng.randint(1, 50)}K",
+            f"{verb} \\textbf{{{tech}}} services for _real-time_ fraud detection across {rng.randint(2, 40)} regions",
+            f"{verb} a \\Scalable {tech} platform handling {rng.randint(1, 900)}K req/s \\& {rng.randint(1, 99)}\\% uptime",
+            f"{verb} **{tech}** & **{rng.choice(TECH)}** integrations with $x_{{i}}$ feature_store_v{i} tables",
+        ])
+        lines.append(f"    \\item {bullet}")
+        if i % 25 == 24:
+            lines.append(f"# Section {i // 25}")
+    lines += ["\\end{itemize}", "```"]
+    return "\n".join(lines)
+
+
+def pathological_output(length: int) -> str:
+    """
+    A long line of `_flag` tokens that open an _italic_ span but never close it,
+    followed by a lone closing underscore on the next line. The legacy regex scans
+    to the end of the line from every opener (quadratic in the line length).
+    """
+    return " ".join(f"_flag{i}" for i in range(length // 8)) + "\n_ done"
+
+
+def best_time(fn, text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=2000, help="Bullet points in the synthetic output")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per implementation (best is reported)")
+    parser.add_argument("--pathological-length", type=int, default=20000, help="Characters in the unclosed-italics line")
+    args = parser.parse_args()
+
+    sanitizer = LatexSanitizer()
+    cases = {
+        "synthetic": synthetic_llm_output(args.items),
+        "pathological": pathological_output(args.pathological_length),
+    }
+
+    results = {}
+    for name, text in cases.items():
+        if sanitizer.sanitize(text) != reference_sanitize_latex(text):
+            raise SystemExit(f"Outputs differ on the {name} case")
+        legacy = best_time(reference_sanitize_latex, text, args.repeat)
+        single_pass = best_time(sanitizer.sanitize, text, args.repeat)
+        results[name] = {
+            "chars": len(text),
+            "legacy_ms": round(legacy * 1000, 3),
+            "single_pass_ms": round(single_pass * 1000, 3),
+            "speedup": round(legacy / single_pass, 2) if single_pass else None,
+        }
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Micro-benchmark: NumPy vector index vs. Chroma for personal-sized vaults.
+
+    python benchmarks/bench_vector_backends.py --chunks 1000 --queries 200
+
+Indexes the same random unit vectors (no embedding model is loaded) into each
+backend, then reports cold-open time (construct a client on the persisted store
+and answer the first query) and per-query top-k latency.
+"""
+import argparse
+import hashlib
+import json
+import statistics
+import tempfile
+import time
+from typing import List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from resume_forge.numpy_store import NumpyVectorStore
+
+
+class RandomEmbeddings(Embeddings):
+    """Deterministic pseudo-random unit vectors keyed on the text."""
+
+    def __init__(self, dim: int):
+        self.dim = dim
+
+    def _embed(self, text: str) -> List[float]:
+        seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+        vector = np.random.default_rng(seed).standard_normal(self.dim)
+        return (vector / np.linalg.norm(vector)).tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
+
+
+def _open_chroma(path: str, embeddings: Embeddings):
+    from chromadb.api.client import SharedSystemClient
+    from langchain_community.vectorstores import Chroma
+
+    SharedSystemClient.clear_system_cache()
+    return Chroma(persist_directory=path, embedding_function=embeddings, collection_name="bench")
+
+
+def _open_numpy(path: str, embeddings: Embeddings, quantize: bool = False):
+    return NumpyVectorStore(path, embeddings, "bench", quantize=quantize)
+
+
+def bench_backend(name: str, opener, texts: List[str], queries: List[List[float]], k: int) -> dict:
+    embeddings = RandomEmbeddings(len(queries[0]))
+    with tempfile.TemporaryDirectory() as path:
+        store = opener(path, embeddings)
+        ids = [f"chunk-{i}" for i in range(len(texts))]
+        start = time.perf_counter()
+        store.add_texts(texts, ids=ids)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        store = opener(path, embeddings)
+        store.similarity_search_by_vector(queries[0], k=k)
+        cold_open = time.perf_counter() - start
+
+        latencies = []
+        for query in queries:
+            start = time.perf_counter()
+            store.similarity_search_by_vector(query, k=k)
+            latencies.append(time.perf_counter() - start)
+        latencies.sort()
+
+    return {
+        "build_ms": round(build * 1000, 2),
+        "cold_open_ms": round(cold_open * 1000, 2),
+        "query_p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "query_p99_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=1000, help="Vectors in the index")
+    parser.add_argument("--queries", type=int, default=200, help="Queries to time")
+    parser.add_argument("--dim", type=int, default=384, help="Vector dimension (all-MiniLM-L6-v2 is 384)")
+    parser.add_argument("--k", type=int, default=20, help="Results per query")
+    parser.add_argument("--skip-chroma", action="store_true", help="Only benchmark the NumPy backend")
+    args = parser.parse_args()
+
+    texts = [f"chunk {i} of a synthetic vault" for i in range(args.chunks)]
+    embeddings = RandomEmbeddings(args.dim)
+    queries = [embeddings.embed_query(f"query {i}") for i in range(args.queries)]
+
+    backends = {
+        "numpy": _open_numpy,
+        "numpy-int8": lambda path, emb: _open_numpy(path, emb, quantize=True),
+    }
+    if not args.skip_chroma:
+        backends["chroma"] = _open_chroma
+
+    results = {
+        name: bench_backend(name, opener, texts, queries, args.k)
+        for name, opener in backends.items()
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
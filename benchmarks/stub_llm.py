@@ -0,0 +1,171 @@
+"""
+Minimal OpenAI-compatible chat server for offline benchmarks.
+
+    python benchmarks/stub_llm.py --port 1235 --latency 0.2 --tokens-per-sec 40
+
+Point LM_STUDIO_BASE_URL at http://127.0.0.1:<port>/v1 to run the CLI against it.
+Every completion waits `latency` seconds (prompt processing), then emits a
+fixed LaTeX fragment word by word at `tokens_per_sec` (0 = as fast as possible),
+streamed as server-sent events when the request asks for it.
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+DEFAULT_RESPONSE = (
+    "\\begin{itemize}\n"
+    "  \\item Designed **Python** services that cut p95 latency by 30% for 2M daily users\n"
+    "  \\item Built Airflow pipelines and _streaming_ ingestion on Kafka and PostgreSQL\n"
+    "  \\item Led a team of 4 engineers migrating batch jobs to Kubernetes\n"
+    "\\end{itemize}"
+)
+
+
+def _tokens(text: str, count: Optional[int]) -> List[str]:
+    """Splits text into word-sized tokens (keeping whitespace), repeated up to `count` tokens."""
+    words = []
+    start = 0
+    for i, char in enumerate(text):
+        if char.isspace() and i > start:
+            words.append(text[start:i])
+            start = i
+    words.append(text[start:])
+    if not count:
+        return words
+    repeated = []
+    while len(repeated) < count:
+        repeated.extend(words if not repeated else ["\n"] + words)
+    return repeated[:count]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "StubLLMServer"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, payload: dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        # /v1/models, used by the health check
+        self._send_json({"object": "list", "data": [{"id": self.server.model, "object": "model"}]})
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        self.server.count_request()
+        tokens = _tokens(self.server.response, self.server.max_tokens)
+        if request.get("max_tokens"):
+            tokens = tokens[:request["max_tokens"]]  # the request's generation budget
+        time.sleep(self.server.latency)
+
+        if not request.get("stream"):
+            self._sleep_for(len(tokens))
+            self._send_json({
+                "id": "stub", "object": "chat.completion", "created": int(time.time()), "model": self.server.model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": "".join(tokens)},
+                             "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 0, "completion_tokens": len(tokens), "total_tokens": len(tokens)},
+            })
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for token in tokens:
+                self._sleep_for(1)
+                self._write_event({"content": token}, None)
+            self._write_event({}, "stop")
+            self._write_chunk(b"data: [DONE]\n\n")
+            self._write_chunk(b"")
+        except (BrokenPipeError, ConnectionResetError):
+            # The client stopped reading (early stop); the rest is never generated
+            self.close_connection = True
+
+    def _sleep_for(self, tokens: int) -> None:
+        if self.server.tokens_per_sec > 0:
+            time.sleep(tokens / self.server.tokens_per_sec)
+
+    def _write_event(self, delta: dict, finish_reason: Optional[str]) -> None:
+        event = {
+            "id": "stub", "object": "chat.completion.chunk", "created": int(time.time()), "model": self.server.model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        self._write_chunk(b"data: " + json.dumps(event).encode("utf-8") + b"\n\n")
+
+    def _write_chunk(self, data: bytes) -> None:
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+
+class StubLLMServer(ThreadingHTTPServer):
+    """Threaded stub server; use as a context manager to serve in a background thread."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        port: int = 0,
+        latency: float = 0.0,
+        tokens_per_sec: float = 0.0,
+        max_tokens: Optional[int] = None,
+        response: str = DEFAULT_RESPONSE,
+        model: str = "stub-model",
+    ):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.latency = latency
+        self.tokens_per_sec = tokens_per_sec
+        self.max_tokens = max_tokens
+        self.response = response
+        self.model = model
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+    def count_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def __enter__(self) -> "StubLLMServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=1235)
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds before the first token")
+    parser.add_argument("--tokens-per-sec", type=float, default=40.0, help="Generation speed (0 = unlimited)")
+    parser.add_argument("--max-tokens", type=int, default=None, help="Tokens per response (default: one fragment)")
+    args = parser.parse_args()
+
+    server = StubLLMServer(args.port, args.latency, args.tokens_per_sec, args.max_tokens)
+    print(f"Stub LLM server listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
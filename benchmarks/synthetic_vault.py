@@ -0,0 +1,123 @@
+"""
+Generates a synthetic vault from vault/_template_project.md and _template_role.md.
+
+    python benchmarks/synthetic_vault.py /tmp/vault --files 200 --bullets 8
+
+Placeholders such as [Name] or [Tech 1] are filled with seeded random values and
+every bullet list is expanded to `bullets` lines, so vault size (files and chunks
+per file) can be scaled without real data. The same seed gives the same vault.
+"""
+import argparse
+import os
+import random
+import re
+from typing import List
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "vault")
+
+TECHNOLOGIES = [
+    "Python", "Go", "Rust", "Java", "TypeScript", "C++", "SQL", "Kafka", "Airflow", "Spark",
+    "PostgreSQL", "Redis", "Kubernetes", "Terraform", "AWS", "GCP", "Docker", "FastAPI",
+    "React", "Node.js", "TensorFlow", "PyTorch", "gRPC", "GraphQL", "Elasticsearch", "Snowflake",
+]
+VERBS = [
+    "Designed", "Implemented", "Optimized", "Led", "Migrated", "Automated", "Scaled", "Built",
+    "Reduced", "Launched", "Refactored", "Mentored", "Instrumented", "Streamlined",
+]
+OBJECTS = [
+    "a multi-tenant billing service", "the event ingestion pipeline", "a feature store",
+    "the search ranking stack", "CI/CD for 40 repositories", "an internal metrics platform",
+    "the payments reconciliation job", "a real-time fraud model", "on-call runbooks",
+    "the data warehouse schema", "a recommendation API", "blue-green deployments",
+]
+OUTCOMES = [
+    "cutting p95 latency by {n}%", "saving ${n}k per year", "handling {n}k requests/sec",
+    "reducing incidents by {n}%", "improving conversion by {n}%", "shrinking build times by {n}%",
+]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises"]
+
+_PLACEHOLDER = re.compile(r"\[([^\]]+)\]")
+
+
+def _sentence(rng: random.Random) -> str:
+    tech = rng.sample(TECHNOLOGIES, 2)
+    outcome = rng.choice(OUTCOMES).format(n=rng.randint(5, 95))
+    return f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} with {tech[0]} and {tech[1]}, {outcome}"
+
+
+def _fill(placeholder: str, rng: random.Random) -> str:
+    key = placeholder.lower()
+    if "date" in key:
+        return f"{rng.choice(['Jan', 'Mar', 'Jun', 'Sep'])} {rng.randint(2012, 2024)}"
+    if any(word in key for word in ("language", "framework", "tool", "skill", "tech")):
+        return rng.choice(TECHNOLOGIES)
+    if "company" in key:
+        return rng.choice(COMPANIES)
+    if "remote" in key:
+        return rng.choice(["Remote", "Office", "Hybrid"])
+    if "role" in key or "title" in key:
+        return rng.choice(["Senior Backend Engineer", "Data Engineer", "Staff Engineer", "ML Engineer"])
+    if "name" in key:
+        return f"{rng.choice(['Project', 'Platform', 'Service'])} {rng.choice(OBJECTS).split()[-1].title()}"
+    return _sentence(rng)
+
+
+def render(template: str, rng: random.Random, bullets: int) -> str:
+    """Fills a vault template, replacing each bullet list with `bullets` generated lines."""
+    lines: List[str] = []
+    in_list = False
+    for line in template.splitlines():
+        if line.startswith("- "):
+            if not in_list:
+                lines.extend(f"- {_sentence(rng)}" for _ in range(bullets))
+            in_list = True
+            continue
+        in_list = False
+        if line.startswith("[") and "tech" in line.lower():
+            line = ", ".join(rng.sample(TECHNOLOGIES, 6))
+        elif line.startswith("What ") or line.startswith("["):
+            # Prose prompts and bare placeholder lines become a short paragraph
+            line = ". ".join(_sentence(rng) for _ in range(3)) + "."
+        lines.append(_PLACEHOLDER.sub(lambda match: _fill(match.group(1), rng), line))
+    return "\n".join(lines) + "\n"
+
+
+def generate_vault(path: str, files: int, bullets: int = 5, seed: int = 0) -> List[str]:
+    """Writes `files` markdown files (alternating project/role) to path and returns their paths."""
+    rng = random.Random(seed)
+    templates = {}
+    for kind in ("project", "role"):
+        with open(os.path.join(TEMPLATE_DIR, f"_template_{kind}.md"), "r") as f:
+            templates[kind] = f.read()
+
+    os.makedirs(path, exist_ok=True)
+    written = []
+    for i in range(files):
+        kind = "project" if i % 2 == 0 else "role"
+        file_path = os.path.join(path, f"{kind}_{i:04d}.md")
+        with open(file_path, "w") as f:
+            f.write(render(templates[kind], rng, bullets))
+        written.append(file_path)
+    return written
+
+
+def synthetic_job_description(rng: random.Random) -> str:
+    """A short job description drawing on the same vocabulary as the synthetic vault."""
+    skills = ", ".join(rng.sample(TECHNOLOGIES, 5))
+    duties = " ".join(f"You will own {rng.choice(OBJECTS)}." for _ in range(3))
+    return f"We are hiring a backend engineer experienced with {skills}. {duties}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="Directory to write the vault to")
+    parser.add_argument("--files", type=int, default=100)
+    parser.add_argument("--bullets", type=int, default=5, help="Lines per bullet list")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    written = generate_vault(args.path, args.files, args.bullets, args.seed)
+    print(f"Wrote {len(written)} files to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
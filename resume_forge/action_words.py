@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+
+from resume_forge.bm25 import tokenize
+from resume_forge.config import settings
+
+# Action word categories relevant to each section
+SECTION_ACTION_CATEGORIES = {
+    "EXPERIENCE": ["lead", "mgmt", "tech"],
+    "PROJECTS": ["tech", "crea", "rsch"],
+    "SKILLS": [],  # Skills section doesn't use action words
+}
+
+# Past tenses the suffix rules below cannot map back to their verb
+_IRREGULAR = {
+    "led": "lead", "built": "build", "wrote": "write", "ran": "run", "drove": "drive",
+    "taught": "teach", "spoke": "speak", "sold": "sell", "won": "win", "made": "make",
+    "began": "begin", "brought": "bring", "chose": "choose", "held": "hold", "kept": "keep",
+    "oversaw": "oversee", "undertook": "undertake",
+}
+
+# Longest first; stripped repeatedly while at least 3 characters remain
+_SUFFIXES = (
+    "ations", "ation", "ating", "ated", "ate",
+    "ements", "ement", "ments", "ment", "ings", "ing", "ers", "er", "ied", "ies", "ed", "es", "s", "e",
+)
+
+_cached_index: Optional["ActionWordIndex"] = None
+_cached_index_hash: Optional[str] = None
+_cached_index_stat: Optional[Tuple[str, int, int]] = None
+
+
+def stem(word: str) -> str:
+    """
+    Crude suffix-stripping stemmer, so a verb and the JD's phrasing of it meet:
+    Optimized / optimize / optimization -> "optimiz", Led / leading -> "lead".
+    """
+    word = word.lower()
+    word = _IRREGULAR.get(word, word)
+    stripped = True
+    while stripped:
+        stripped = False
+        for suffix in _SUFFIXES:
+            if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+                word = word[:-len(suffix)] + ("y" if suffix in ("ied", "ies") else "")
+                stripped = True
+                break
+    if len(word) >= 4 and word[-1] == word[-2] and word[-1] not in "lsz":
+        word = word[:-1]  # planned -> plann -> plan
+    return word
+
+
+class ActionWordIndex:
+    """
+    Lexical index over the action words file: each distinct verb's stem and
+    categories, plus stem -> verbs and category -> verbs lookups. Built once per file
+    version, so selecting verbs for a section only tokenizes the job description.
+    """
+
+    def __init__(self, action_words: Dict[str, List[str]]):
+        self.words: List[str] = []
+        self.categories: List[Set[str]] = []
+        self.by_stem: Dict[str, List[int]] = {}
+        self.by_category: Dict[str, List[int]] = {}
+        positions: Dict[str, int] = {}
+        for category, words in action_words.items():
+            for word in words:
+                position = positions.get(word)
+                if position is None:
+                    position = positions[word] = len(self.words)
+                    self.words.append(word)
+                    self.categories.append(set())
+                    self.by_stem.setdefault(stem(word), []).append(position)
+                self.categories[position].add(category)
+                self.by_category.setdefault(category, []).append(position)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def select(self, job_description: str, categories: List[str], top_n: int) -> List[str]:
+        """
+        Returns up to top_n verbs: first those whose stem occurs in the job
+        description (most mentions first, the given categories winning ties), then
+        the given categories' verbs, taken in turn from each category. top_n <= 0
+        returns every verb in the categories.
+        """
+        wanted = [category for category in categories if category in self.by_category]
+        if top_n <= 0:
+            every = {i: None for category in wanted for i in self.by_category[category]}
+            return [self.words[i] for i in every]
+
+        mentions = Counter(stem(token) for token in tokenize(job_description))
+        matched = [
+            (-mentions[word_stem], self.categories[i].isdisjoint(wanted), i)
+            for word_stem, positions in self.by_stem.items() if word_stem in mentions
+            for i in positions
+        ]
+        chosen = [i for _, _, i in sorted(matched)][:top_n]
+
+        seen = set(chosen)
+        columns = [self.by_category[category] for category in wanted]
+        for row in range(max((len(column) for column in columns), default=0)):
+            if len(chosen) >= top_n:
+                break
+            for column in columns:
+                if row < len(column) and column[row] not in seen and len(chosen) < top_n:
+                    chosen.append(column[row])
+                    seen.add(column[row])
+        return [self.words[i] for i in chosen]
+
+
+def get_action_word_index() -> ActionWordIndex:
+    """
+    Returns the index for settings.ACTION_WORDS_FILE (empty when the file is
+    missing). Cached; the file is only re-read when its mtime or size changes, and
+    the index only rebuilt when its contents hash differently.
+    """
+    global _cached_index, _cached_index_hash, _cached_index_stat
+    path = settings.ACTION_WORDS_FILE
+    try:
+        info = os.stat(path)
+    except OSError:
+        return ActionWordIndex({})
+    current_stat = (path, info.st_mtime_ns, info.st_size)
+    if _cached_index is not None and _cached_index_stat == current_stat:
+        return _cached_index
+
+    with open(path, "rb") as f:
+        raw = f.read()
+    current_hash = hashlib.sha256(raw).hexdigest()
+    if _cached_index is None or _cached_index_hash != current_hash:
+        _cached_index = ActionWordIndex(json.loads(raw))
+        _cached_index_hash = current_hash
+    _cached_index_stat = current_stat
+    return _cached_index
+
+
+def select_action_words(job_description: str, sections: List[str]) -> str:
+    """
+    Renders the action words for one or more sections as a comma-separated line:
+    settings.ACTION_WORDS_TOP_N verbs per section, ranked by relevance to the JD.
+    """
+    categories: List[str] = []
+    index = get_action_word_index()
+    for section in sections:
+        for category in SECTION_ACTION_CATEGORIES.get(section, list(index.by_category)):
+            if category not in categories:
+                categories.append(category)
+    if not categories:
+        return "N/A (Skills section does not require action words)"
+
+    sections_with_words = sum(1 for section in sections if SECTION_ACTION_CATEGORIES.get(section, True))
+    words = index.select(job_description, categories, settings.ACTION_WORDS_TOP_N * sections_with_words)
+    return ", ".join(words)
@@ -0,0 +1,159 @@
+import json
+import math
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from resume_forge.pipeline import ValidationStats, build_tailor_chain, tailor_resume_section
+
+JD_FILE_SUFFIXES = {".txt", ".md"}
+
+
+@dataclass
+class BatchJob:
+    name: str
+    job_description: str
+
+
+@dataclass
+class BatchResult:
+    name: str
+    output_path: Optional[Path]
+    latency: float
+    error: Optional[str] = None
+
+
+@dataclass
+class BatchSummary:
+    results: List[BatchResult] = field(default_factory=list)
+    wall_time: float = 0.0
+
+    @property
+    def succeeded(self) -> List[BatchResult]:
+        return [r for r in self.results if r.error is None]
+
+    @property
+    def failed(self) -> List[BatchResult]:
+        return [r for r in self.results if r.error is not None]
+
+    @property
+    def jds_per_minute(self) -> float:
+        if self.wall_time <= 0:
+            return 0.0
+        return len(self.succeeded) / self.wall_time * 60
+
+    def latency_percentile(self, pct: float) -> float:
+        return percentile([r.latency for r in self.succeeded], pct)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Returns the pct-th percentile (0-100) of values using linear interpolation."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def load_jobs(source: Path) -> List[BatchJob]:
+    """
+    Loads job descriptions from a directory of .txt/.md files (one JD per file) or
+    from a JSONL file whose lines carry a "jd"/"job_description" field and an
+    optional "id"/"name" used for the output file name.
+    """
+    source = Path(source)
+    jobs = []
+
+    if source.is_dir():
+        for path in sorted(source.iterdir()):
+            if path.is_file() and path.suffix.lower() in JD_FILE_SUFFIXES:
+                jobs.append(BatchJob(name=path.stem, job_description=path.read_text(encoding="utf-8")))
+    else:
+        with open(source, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    raise ValueError(f"Invalid JSON on line {line_number} of {source}: {e}")
+                text = record.get("jd") or record.get("job_description")
+                if not text:
+                    raise ValueError(f"Line {line_number} of {source} has no 'jd' or 'job_description' field")
+                name = str(record.get("id") or record.get("name") or f"jd_{line_number:03d}")
+                jobs.append(BatchJob(name=name, job_description=text))
+
+    return [job for job in jobs if job.job_description.strip()]
+
+
+def _output_paths(jobs: List[BatchJob], output_dir: Path) -> List[Path]:
+    """Maps each job to a unique, filesystem-safe .tex path inside output_dir."""
+    used = set()
+    paths = []
+    for job in jobs:
+        stem = re.sub(r"[^A-Za-z0-9_.-]+", "_", job.name).strip("._") or "jd"
+        candidate, n = stem, 2
+        while candidate in used:
+            candidate = f"{stem}_{n}"
+            n += 1
+        used.add(candidate)
+        paths.append(output_dir / f"{candidate}.tex")
+    return paths
+
+
+def run_batch(
+    jobs: List[BatchJob],
+    template_content: str,
+    output_dir: Path,
+    max_workers: int,
+    on_result: Optional[Callable[[BatchResult], None]] = None,
+    tailor: Optional[Callable[[str, str], str]] = None,
+    candidate: str = "",
+    validation: Optional[ValidationStats] = None,
+) -> BatchSummary:
+    """
+    Tailors the template for every job using one warm chain (and therefore one
+    embedding model and vector-store client) shared by a bounded worker pool.
+    Each tailored resume is written to its own .tex file in output_dir.
+    Pass `tailor(job_description, template_content)` to generate elsewhere
+    (e.g. on the serve daemon) instead of building a chain over the candidate's
+    index in this process; section validation outcomes of the in-process
+    tailors are also counted in validation, if given.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    if tailor is None:
+        chain = build_tailor_chain(candidate)
+
+        def tailor(job_description: str, template: str) -> str:
+            return tailor_resume_section(
+                job_description, template, chain=chain, candidate=candidate, validation=validation
+            )
+
+    def run_one(job: BatchJob, path: Path) -> BatchResult:
+        start = time.perf_counter()
+        try:
+            response = tailor(job.job_description, template_content)
+            path.write_text(response, encoding="utf-8")
+            return BatchResult(job.name, path, time.perf_counter() - start)
+        except Exception as e:
+            return BatchResult(job.name, None, time.perf_counter() - start, error=str(e))
+
+    summary = BatchSummary()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = [
+            executor.submit(run_one, job, path)
+            for job, path in zip(jobs, _output_paths(jobs, output_dir))
+        ]
+        if on_result is not None:
+            for future in as_completed(futures):
+                on_result(future.result())
+        # Keep results in input order regardless of completion order
+        summary.results = [future.result() for future in futures]
+    summary.wall_time = time.perf_counter() - start
+    return summary
@@ -0,0 +1,198 @@
+import heapq
+import json
+import math
+import os
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+INDEX_VERSION = 1
+
+# Keeps technology names intact: c++, c#, node.js, ci/cd -> "ci", "cd"
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[+#]+|(?:\.[a-z0-9]+)+)?")
+
+_STOPWORDS = frozenset("""
+    a an and are as at be by for from has have in is it its of on or that the to was
+    were will with we you our your this these those their they i me my us
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercases and splits text into BM25 terms, dropping common English stopwords."""
+    return [token for token in _TOKEN_PATTERN.findall(text.lower()) if token not in _STOPWORDS]
+
+
+class BM25Index:
+    """
+    Okapi BM25 inverted index over vault chunks.
+
+    Postings (term -> {doc position: term frequency}) are stored in a JSON file
+    next to the vector store, so searching needs neither the embedding model nor
+    a vector store client. Incremental updates re-tokenize only added chunks.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.ids: List[str] = []
+        self.texts: List[str] = []
+        self.metadatas: List[dict] = []
+        self.lengths: List[int] = []
+        self.postings: Dict[str, Dict[int, int]] = {}
+
+    @classmethod
+    def build(cls, ids: List[str], texts: List[str], metadatas: List[dict]) -> "BM25Index":
+        index = cls()
+        index.add(ids, texts, metadatas)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, ids: List[str], texts: List[str], metadatas: List[dict]) -> None:
+        """Adds chunks; an id that is already indexed is replaced."""
+        self.remove(ids)
+        for chunk_id, text, metadata in zip(ids, texts, metadatas):
+            position = len(self.ids)
+            terms = Counter(tokenize(text))
+            self.ids.append(chunk_id)
+            self.texts.append(text)
+            self.metadatas.append(metadata)
+            self.lengths.append(sum(terms.values()))
+            for term, frequency in terms.items():
+                self.postings.setdefault(term, {})[position] = frequency
+
+    def remove(self, ids: Iterable[str]) -> None:
+        """Removes chunks by id, compacting document positions."""
+        removed = set(ids) & set(self.ids)
+        if not removed:
+            return
+        keep = [i for i, chunk_id in enumerate(self.ids) if chunk_id not in removed]
+        remap = {old: new for new, old in enumerate(keep)}
+        self.ids = [self.ids[i] for i in keep]
+        self.texts = [self.texts[i] for i in keep]
+        self.metadatas = [self.metadatas[i] for i in keep]
+        self.lengths = [self.lengths[i] for i in keep]
+        postings = {}
+        for term, docs in self.postings.items():
+            kept = {remap[position]: tf for position, tf in docs.items() if position in remap}
+            if kept:
+                postings[term] = kept
+        self.postings = postings
+
+    def search(self, query: str, k: int) -> List[Tuple[int, float]]:
+        """Returns (doc position, score) for the k best-scoring chunks, best first."""
+        if not self.ids or k <= 0:
+            return []
+        total = len(self.ids)
+        average_length = sum(self.lengths) / total or 1.0
+        scores: Dict[int, float] = {}
+        # Repeated words in a long JD shouldn't outweigh distinct requirements
+        for term in set(tokenize(query)):
+            docs = self.postings.get(term)
+            if not docs:
+                continue
+            idf = math.log(1 + (total - len(docs) + 0.5) / (len(docs) + 0.5))
+            for position, tf in docs.items():
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[position] / average_length)
+                scores[position] = scores.get(position, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        return heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))
+
+    def document(self, position: int) -> Document:
+        return Document(
+            id=self.ids[position],
+            page_content=self.texts[position],
+            metadata=dict(self.metadatas[position]),
+        )
+
+    def save(self, path: str) -> None:
+        data = {
+            "version": INDEX_VERSION,
+            "k1": self.k1,
+            "b": self.b,
+            "ids": self.ids,
+            "texts": self.texts,
+            "metadatas": self.metadatas,
+            "lengths": self.lengths,
+            "postings": self.postings,
+        }
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["BM25Index"]:
+        """Loads a saved index, or returns None if it is missing or from another version."""
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != INDEX_VERSION:
+            return None
+        index = cls(k1=data["k1"], b=data["b"])
+        index.ids = data["ids"]
+        index.texts = data["texts"]
+        index.metadatas = data["metadatas"]
+        index.lengths = data["lengths"]
+        # JSON object keys are strings
+        index.postings = {
+            term: {int(position): tf for position, tf in docs.items()}
+            for term, docs in data["postings"].items()
+        }
+        return index
+
+
+class BM25Retriever(BaseRetriever):
+    """Retriever over a BM25Index; never touches the embedding model."""
+
+    index: Any
+    k: int = 4
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        return [self.index.document(position) for position, _ in self.index.search(query, self.k)]
+
+
+def _fusion_key(doc: Document) -> Tuple[str, str]:
+    # Chroma results carry no ids, so chunks are matched on source and content
+    return (doc.metadata.get("source", ""), doc.page_content)
+
+
+def reciprocal_rank_fusion(rankings: List[List[Document]], k: int, rrf_k: int = 60) -> List[Document]:
+    """Merges ranked lists by summing 1 / (rrf_k + rank) for every list a chunk appears in."""
+    scores: Dict[Tuple[str, str], float] = {}
+    docs: Dict[Tuple[str, str], Document] = {}
+    for ranking in rankings:
+        for rank, doc in enumerate(ranking, start=1):
+            key = _fusion_key(doc)
+            docs.setdefault(key, doc)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (rrf_k + rank)
+    # sorted() is stable, so ties keep the order in which chunks were first seen
+    ranked = sorted(scores, key=lambda key: scores[key], reverse=True)
+    return [docs[key] for key in ranked[:k]]
+
+
+class HybridRetriever(BaseRetriever):
+    """Fuses dense and BM25 results with reciprocal-rank fusion."""
+
+    dense: BaseRetriever
+    lexical: BM25Retriever
+    k: int = 4
+    rrf_k: int = 60
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        rankings = [
+            self.dense.invoke(query, config={"callbacks": run_manager.get_child()}),
+            self.lexical.invoke(query, config={"callbacks": run_manager.get_child()}),
+        ]
+        return reciprocal_rank_fusion(rankings, self.k, self.rrf_k)
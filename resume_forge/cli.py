@@ -1,3 +1,8 @@
+import time
+
+# Start of CLI module import, reported as the first stage by --profile
+_IMPORT_START = time.perf_counter()
+
 import warnings
 
 # Suppress non-critical warnings to keep CLI output clean
@@ -6,30 +11,165 @@ warnings.filterwarnings("ignore", category=DeprecationWarning)
 warnings.filterwarnings("ignore", message=".*LangChainDeprecationWarning.*")
 warnings.filterwarnings("ignore", message=".*NotOpenSSLWarning.*")
 
+import os
+import sys
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Optional
 
 import typer
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.table import Table
+
+_IMPORT_END = time.perf_counter()
 
-from resume_forge.llm import check_llm_status
-from resume_forge.pipeline import tailor_resume_section
-from resume_forge.vectorstore import ingest_vault
+# Heavy dependencies (torch, LangChain, Chroma, OpenAI client) are imported inside
+# the commands that need them so `--help` and argument errors return instantly.
 
 app = typer.Typer(help="Resume-Forge: Privacy-first AI Resume Tailor")
 console = Console()
 
+
+def _show_pipeline_logs():
+    """Routes resume_forge's progress logs (e.g. context packing savings) to stderr."""
+    import logging
+
+    logger = logging.getLogger("resume_forge")
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+
+
+@contextmanager
+def _profiling(command: str, trace_path: Optional[Path]):
+    """
+    Records spans while the enclosed command runs, then prints a per-stage summary
+    to stderr and writes a Chrome trace (also when the command fails).
+    """
+    from resume_forge import profiling
+    from resume_forge.config import settings
+
+    profiling.enable()
+    profiling.record("cli.import", _IMPORT_START, _IMPORT_END)
+    started_at = time.time()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        wall_time = time.perf_counter() - start
+        profiling.record(f"cli.{command}", start, start + wall_time)
+        if trace_path is None:
+            name = f"{command}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.json"
+            trace_path = Path(settings.PROFILE_DIR) / name
+        # Only run configuration is recorded; JD text stays out of the trace
+        profiling.write_trace(str(trace_path), metadata={
+            "command": command,
+            "started_at": started_at,
+            "wall_time": wall_time,
+            "model": settings.LM_STUDIO_MODEL,
+            "retrieval_mode": settings.RETRIEVAL_MODE,
+            "vector_backend": settings.VECTOR_BACKEND,
+            "multi_section_generation": settings.MULTI_SECTION_GENERATION,
+            "llm_cache_enabled": settings.LLM_CACHE_ENABLED,
+        })
+        _print_profile_summary(profiling.summary(), wall_time, trace_path)
+
+
+def _print_profile_summary(stages, wall_time: float, trace_path: Path):
+    # stderr, so LaTeX written to stdout stays clean for piping
+    stderr_console = Console(stderr=True)
+    table = Table(title=f"Profile ({wall_time:.2f}s wall time)")
+    table.add_column("Stage")
+    table.add_column("Calls", justify="right")
+    table.add_column("Total", justify="right")
+    table.add_column("Mean", justify="right")
+    table.add_column("Max", justify="right")
+    table.add_column("% of run", justify="right")
+    for stage in stages:
+        table.add_row(
+            stage["name"],
+            str(stage["calls"]),
+            f"{stage['total']:.3f}s",
+            f"{stage['mean']:.3f}s",
+            f"{stage['max']:.3f}s",
+            f"{stage['total'] / wall_time * 100:.0f}%" if wall_time else "-",
+        )
+    stderr_console.print(table)
+    stderr_console.print(
+        "[dim]Sections run in parallel, so stage totals can add up to more than the run.[/dim]"
+    )
+    stderr_console.print(f"[dim]Trace written to {trace_path} (open in chrome://tracing or ui.perfetto.dev)[/dim]")
+
+
+def _connect_daemon(command: str) -> bool:
+    """Returns True when a running `serve` daemon with matching settings can run `command`."""
+    from resume_forge.client import config_mismatch, daemon_url, find_daemon
+    from resume_forge.config import settings
+
+    if not settings.USE_DAEMON:
+        return False
+    status = find_daemon()
+    if status is None:
+        return False
+    mismatch = config_mismatch(status)
+    if mismatch is not None:
+        console.print(f"[dim]Daemon at {daemon_url()} has a different {mismatch} setting; running {command} in-process.[/dim]")
+        return False
+    console.print(f"[dim]Using the serve daemon at {daemon_url()}[/dim]")
+    return True
+
 @app.command()
 def ingest(
     vault_dir: Path = typer.Option(
         "./vault", "--vault-dir", "-v", help="Directory containing markdown files to ingest",
         exists=True, file_okay=False, dir_okay=True, readable=True
+    ),
+    incremental: bool = typer.Option(
+        False, "--incremental", "-i", help="Only re-embed chunks from files that changed since the last ingest"
+    ),
+    watch: bool = typer.Option(
+        False, "--watch", "-w", help="Keep running and re-index changed files as they are saved (implies --incremental)"
+    ),
+    candidate: str = typer.Option(
+        "", "--candidate", "-c", help="Ingest into this candidate's own index, leaving other candidates untouched"
     )
 ):
     """
     Ingest markdown files from the vault directory into the vector store.
     """
-    console.print(f"[bold blue]ingesting vault from:[/bold blue] {vault_dir}")
+    _check_candidate(candidate)
+    target = f" [dim](candidate {candidate})[/dim]" if candidate else ""
+    console.print(f"[bold blue]ingesting vault from:[/bold blue] {vault_dir}{target}")
+    incremental = incremental or watch
+
+    # A running daemon must do the ingest itself, so its open index stays consistent
+    use_daemon = _connect_daemon("ingest")
+    # Snapshot before the first sync, so edits made while it runs are picked up
+    watcher = _vault_watcher(vault_dir, use_daemon, candidate) if watch else None
+    if use_daemon:
+        _ingest_via_daemon(vault_dir, incremental, candidate)
+    else:
+        _ingest_local(vault_dir, incremental, candidate)
+    if watcher is not None:
+        _run_watcher(watcher)
+
+def _check_candidate(candidate: str):
+    """Exits with an error unless candidate is a valid candidate name (or empty)."""
+    from resume_forge.vectorstore import persist_dir
+
+    try:
+        persist_dir(candidate)
+    except ValueError as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        raise typer.Exit(code=1)
+
+def _ingest_local(vault_dir: Path, incremental: bool, candidate: str = ""):
+    """Runs the ingest command in this process."""
+    from resume_forge.embeddings import embedding_cache_stats
+    from resume_forge.vectorstore import ingest_vault, sync_vault
 
     try:
         with Progress(
@@ -38,30 +178,231 @@ def ingest(
             transient=True,
         ) as progress:
             task = progress.add_task(description="Processing files...", total=None)
-            count = ingest_vault(str(vault_dir))
+            if incremental:
+                stats = sync_vault(str(vault_dir), candidate=candidate)
+            else:
+                count = ingest_vault(str(vault_dir), candidate)
+
+        if incremental:
+            console.print(
+                f"[bold green]Vault synced:[/bold green] {stats.added} added, "
+                f"{stats.removed} removed, {stats.unchanged} unchanged "
+                f"({stats.total} chunks indexed)"
+            )
+        else:
+            console.print(f"[bold green]Successfully ingested {count} chunks![/bold green]")
 
-        console.print(f"[bold green]Successfully ingested {count} chunks![/bold green]")
+        # Only reported when this ingest used the cache (never loads the model)
+        cache_stats = embedding_cache_stats()
+        if cache_stats is not None:
+            console.print(
+                f"[dim]Embedding cache: {cache_stats['hits']} hits, "
+                f"{cache_stats['misses']} misses ({cache_stats['entries']} entries)[/dim]"
+            )
 
     except Exception as e:
         console.print(f"[bold red]Error during ingestion:[/bold red] {e}")
         raise typer.Exit(code=1)
 
+def _vault_watcher(vault_dir: Path, use_daemon: bool, candidate: str = ""):
+    """Builds a watcher that re-indexes changed files locally or on the serve daemon."""
+    from resume_forge.config import settings
+    from resume_forge.watcher import VaultWatcher
+
+    if use_daemon:
+        from resume_forge.client import request
+
+        # Paths must match the ones _ingest_via_daemon indexed under
+        vault_path = str(vault_dir.resolve())
+
+        def sync(paths):
+            return request("/ingest", {
+                "vault_dir": vault_path, "incremental": True, "changed_paths": paths, "candidate": candidate,
+            })
+    else:
+        from resume_forge.vectorstore import sync_vault
+
+        vault_path = str(vault_dir)
+
+        def sync(paths):
+            stats = sync_vault(vault_path, paths, candidate)
+            return {"added": stats.added, "removed": stats.removed, "total": stats.total}
+
+    def report(paths, result, error):
+        stamp = time.strftime("%H:%M:%S")
+        files = f"{len(paths)} file{'s' if len(paths) != 1 else ''} changed"
+        if error is not None:
+            console.print(f"[dim]{stamp}[/dim] {files}: [bold red]re-index failed:[/bold red] {error} (will retry)")
+        else:
+            console.print(
+                f"[dim]{stamp}[/dim] {files}: [green]+{result['added']}[/green] "
+                f"[red]-{result['removed']}[/red] chunks ({result['total']} indexed)"
+            )
+
+    return VaultWatcher(
+        vault_path, sync, interval=settings.WATCH_INTERVAL, debounce=settings.WATCH_DEBOUNCE, on_result=report
+    )
+
+def _run_watcher(watcher):
+    console.print(f"[bold blue]Watching {watcher.vault_path} for changes[/bold blue] [dim](Ctrl+C to stop)[/dim]")
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        console.print("[dim]Stopped watching.[/dim]")
+
+def _ingest_via_daemon(vault_dir: Path, incremental: bool, candidate: str = ""):
+    """Runs the ingest command on the serve daemon."""
+    from resume_forge.client import DaemonError, request
+
+    try:
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            transient=True,
+        ) as progress:
+            progress.add_task(description="Processing files...", total=None)
+            result = request("/ingest", {
+                "vault_dir": str(vault_dir.resolve()), "incremental": incremental, "candidate": candidate,
+            })
+    except (DaemonError, OSError) as e:
+        console.print(f"[bold red]Error during ingestion:[/bold red] {e}")
+        raise typer.Exit(code=1)
+
+    if incremental:
+        console.print(
+            f"[bold green]Vault synced:[/bold green] {result['added']} added, "
+            f"{result['removed']} removed, {result['unchanged']} unchanged "
+            f"({result['total']} chunks indexed)"
+        )
+    else:
+        console.print(f"[bold green]Successfully ingested {result['chunks']} chunks![/bold green]")
+    cache_stats = result.get("embedding_cache")
+    if cache_stats:
+        console.print(
+            f"[dim]Embedding cache: {cache_stats['hits']} hits, "
+            f"{cache_stats['misses']} misses ({cache_stats['entries']} entries)[/dim]"
+        )
+
 @app.command()
 def tailor(
     jd: str = typer.Option(..., "--jd", help="Job Description string or path to a text file"),
     template: Path = typer.Option(..., "--template", "-t", help="Path to LaTeX template file", exists=True, dir_okay=False, readable=True),
-    output: Path = typer.Option(None, "--output", "-o", help="Output file path for the tailored resume")
+    output: Path = typer.Option(None, "--output", "-o", help="Output file path for the tailored resume"),
+    cache: bool = typer.Option(None, "--cache/--no-cache", help="Reuse cached LLM responses for identical prompts [default: LLM_CACHE_ENABLED]"),
+    stream: bool = typer.Option(False, "--stream", "-s", help="Write tokens to the output (or stdout) as each section is generated"),
+    retrieval: str = typer.Option(None, "--retrieval", help="Retrieval mode: dense, lexical (BM25, no embedding model) or hybrid [default: RETRIEVAL_MODE]"),
+    candidate: str = typer.Option("", "--candidate", "-c", help="Tailor from this candidate's index (see `ingest --candidate`)"),
+    profile: bool = typer.Option(False, "--profile", help="Time each stage, print a summary table and write a Chrome trace"),
+    profile_output: Path = typer.Option(None, "--profile-output", help="Trace file for --profile [default: PROFILE_DIR/tailor-<timestamp>.json]", dir_okay=False)
 ):
     """
     Tailor a resume based on the provided Job Description and LaTeX template.
+    Uses a running `serve` daemon when one with the same settings is available
+    (except with --stream or --profile, which always run in-process).
     """
+    from resume_forge.config import settings
+
+    if cache is not None:
+        settings.LLM_CACHE_ENABLED = cache
+    if retrieval is not None:
+        settings.RETRIEVAL_MODE = retrieval
+    _check_candidate(candidate)
+    _show_pipeline_logs()
+
+    if not stream and not profile and _connect_daemon("tailor"):
+        _tailor_via_daemon(jd, template, output, candidate)
+        return
+    if not profile:
+        _tailor(jd, template, output, stream, candidate)
+        return
+    with _profiling("tailor", profile_output):
+        _tailor(jd, template, output, stream, candidate)
+
+def _tailor(jd: str, template: Path, output: Path, stream: bool, candidate: str = ""):
+    """Runs the tailor command once its options have been applied to settings."""
+    from resume_forge import profiling
+    from resume_forge.llm import check_llm_status
+
     # 0. Check LLM Status
     if not check_llm_status():
         console.print("[bold red]Error:[/bold red] LLM endpoint is not reachable or no models are loaded.")
         console.print("[dim]Please ensure LM Studio is running and a model is loaded in the 'Local Server' tab.[/dim]")
         raise typer.Exit(code=1)
 
-    # 1. Resolve Job Description (File vs String)
+    # 1-2. Resolve Job Description and read Template
+    read_start = time.perf_counter()
+    jd_text, template_content = _read_tailor_inputs(jd, template)
+    profiling.record("cli.read_inputs", read_start, time.perf_counter())
+
+    if stream:
+        _tailor_streaming(jd_text, template_content, output, candidate)
+        return
+
+    # 3. Running RAG Pipeline
+    with profiling.span("cli.import_pipeline"):
+        from resume_forge.pipeline import ValidationStats, tailor_resume_section
+
+    console.print("[bold blue]Generating tailored content...[/bold blue]")
+    validation = ValidationStats()
+
+    try:
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            transient=True,
+        ) as progress:
+            progress.add_task(description="Tailoring resume sections...", total=None)
+            response = tailor_resume_section(jd_text, template_content, candidate=candidate, validation=validation)
+
+    except Exception as e:
+        console.print(f"[bold red]Error generating resume:[/bold red] {e}")
+        raise typer.Exit(code=1)
+    _print_validation_summary(validation.stats())
+
+    # 4. Output
+    with profiling.span("cli.write_output"):
+        _write_tailor_output(response, output)
+
+def _tailor_via_daemon(jd: str, template: Path, output: Path, candidate: str = ""):
+    """Runs the tailor command on the serve daemon, which keeps the models warm."""
+    from resume_forge.client import DaemonError, request
+
+    jd_text, template_content = _read_tailor_inputs(jd, template)
+    console.print("[bold blue]Generating tailored content...[/bold blue]")
+
+    try:
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            transient=True,
+        ) as progress:
+            progress.add_task(description="Tailoring resume sections...", total=None)
+            result = request("/tailor", {
+                "job_description": jd_text, "template": template_content, "candidate": candidate,
+            })
+    except DaemonError as e:
+        console.print(f"[bold red]Error generating resume:[/bold red] {e}")
+        if e.status == 502:
+            console.print("[dim]Please ensure LM Studio is running and a model is loaded in the 'Local Server' tab.[/dim]")
+        raise typer.Exit(code=1)
+    except OSError as e:
+        console.print(f"[bold red]Error contacting the serve daemon:[/bold red] {e}")
+        raise typer.Exit(code=1)
+    _print_validation_summary(result.get("validation"))
+
+    _write_tailor_output(result["output"], output)
+
+def _print_validation_summary(counts: Optional[dict]):
+    if not counts or not counts["sections"]:
+        return
+    style = "yellow" if counts["failed"] else "dim"
+    console.print(
+        f"[{style}]LaTeX validation: {counts['sections']} sections, {counts['retried']} retried, "
+        f"{counts['failed']} still invalid[/{style}]"
+    )
+
+def _read_tailor_inputs(jd: str, template: Path):
+    """Returns the job description text (read from a file if jd is a path) and the template."""
     jd_text = ""
     try:
         jd_path = Path(jd)
@@ -84,24 +425,9 @@ def tailor(
     except Exception as e:
         console.print(f"[bold red]Error reading template:[/bold red] {e}")
         raise typer.Exit(code=1)
+    return jd_text, template_content
 
-    # 3. Running RAG Pipeline
-    console.print("[bold blue]Generating tailored content...[/bold blue]")
-
-    try:
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            transient=True,
-        ) as progress:
-            progress.add_task(description="Tailoring resume sections...", total=None)
-            response = tailor_resume_section(jd_text, template_content)
-
-    except Exception as e:
-        console.print(f"[bold red]Error generating resume:[/bold red] {e}")
-        raise typer.Exit(code=1)
-
-    # 4. Output
+def _write_tailor_output(response: str, output: Optional[Path]):
     if output:
         try:
             output.write_text(response, encoding="utf-8")
@@ -113,5 +439,194 @@ def tailor(
         # Print to stdout if no output file specified
         print(response)
 
+def _tailor_streaming(jd_text: str, template_content: str, output: Path, candidate: str = ""):
+    """Streams the tailored resume to the output file (or stdout) and reports per-section latency."""
+    from resume_forge import profiling
+
+    with profiling.span("cli.import_pipeline"):
+        from resume_forge.pipeline import stream_tailored_resume
+
+    # Status goes to stderr so streamed LaTeX on stdout stays clean for piping
+    status_console = console if output else Console(stderr=True)
+
+    try:
+        if output:
+            status_console.print(f"[bold blue]Streaming tailored resume to:[/bold blue] {output}")
+            with output.open("w", encoding="utf-8") as f:
+                def write(text: str):
+                    f.write(text)
+                    f.flush()
+                stats = stream_tailored_resume(jd_text, template_content, write, candidate=candidate)
+        else:
+            def write(text: str):
+                sys.stdout.write(text)
+                sys.stdout.flush()
+            stats = stream_tailored_resume(jd_text, template_content, write, candidate=candidate)
+            sys.stdout.write("\n")
+    except Exception as e:
+        status_console.print(f"[bold red]Error generating resume:[/bold red] {e}")
+        raise typer.Exit(code=1)
+
+    table = Table(title="Section Streaming")
+    table.add_column("Section")
+    table.add_column("TTFT", justify="right")
+    table.add_column("Tokens", justify="right")
+    table.add_column("Tokens/s", justify="right")
+    table.add_column("Total", justify="right")
+    for s in stats:
+        ttft = f"{s.time_to_first_token:.2f}s" if s.time_to_first_token is not None else "-"
+        name = s.section if s.error is None else f"{s.section} [red](error)[/red]"
+        table.add_row(name, ttft, str(s.tokens), f"{s.tokens_per_second:.1f}", f"{s.elapsed:.2f}s")
+    status_console.print(table)
+
+@app.command("tailor-batch")
+def tailor_batch(
+    jds: Path = typer.Option(..., "--jds", help="Directory of .txt/.md JD files, or a JSONL file with one JD per line", exists=True, readable=True),
+    template: Path = typer.Option(..., "--template", "-t", help="Path to LaTeX template file", exists=True, dir_okay=False, readable=True),
+    output_dir: Path = typer.Option("./tailored", "--output-dir", "-o", help="Directory to write one tailored .tex file per JD", file_okay=False),
+    workers: int = typer.Option(None, "--workers", "-w", min=1, help="Number of JDs tailored in parallel [default: BATCH_CONCURRENCY]"),
+    cache: bool = typer.Option(None, "--cache/--no-cache", help="Reuse cached LLM responses for identical prompts [default: LLM_CACHE_ENABLED]"),
+    retrieval: str = typer.Option(None, "--retrieval", help="Retrieval mode: dense, lexical (BM25, no embedding model) or hybrid [default: RETRIEVAL_MODE]"),
+    candidate: str = typer.Option("", "--candidate", "-c", help="Tailor from this candidate's index (see `ingest --candidate`)")
+):
+    """
+    Tailor the template for many Job Descriptions in one run, keeping models warm.
+    """
+    from resume_forge.batch import BatchResult, load_jobs, run_batch
+    from resume_forge.config import settings
+    from resume_forge.llm import check_llm_status
+    from resume_forge.pipeline import ValidationStats
+
+    workers = workers or settings.BATCH_CONCURRENCY
+    if cache is not None:
+        settings.LLM_CACHE_ENABLED = cache
+    if retrieval is not None:
+        settings.RETRIEVAL_MODE = retrieval
+    _check_candidate(candidate)
+    _show_pipeline_logs()
+
+    tailor = None
+    validation = ValidationStats()
+    use_daemon = _connect_daemon("tailor-batch")
+    if use_daemon:
+        from resume_forge.client import request
+
+        def tailor(job_description: str, template_text: str) -> str:
+            result = request("/tailor", {
+                "job_description": job_description, "template": template_text, "candidate": candidate,
+            })
+            validation.add(result.get("validation", {}))
+            return result["output"]
+    elif not check_llm_status():
+        console.print("[bold red]Error:[/bold red] LLM endpoint is not reachable or no models are loaded.")
+        console.print("[dim]Please ensure LM Studio is running and a model is loaded in the 'Local Server' tab.[/dim]")
+        raise typer.Exit(code=1)
+
+    try:
+        jobs = load_jobs(jds)
+        template_content = template.read_text(encoding="utf-8")
+    except (OSError, ValueError) as e:
+        console.print(f"[bold red]Error reading inputs:[/bold red] {e}")
+        raise typer.Exit(code=1)
+
+    if not jobs:
+        console.print(f"[bold red]Error:[/bold red] No job descriptions found in {jds}.")
+        raise typer.Exit(code=1)
+
+    console.print(f"[bold blue]Tailoring {len(jobs)} job descriptions with {workers} workers...[/bold blue]")
+
+    def report(result: BatchResult):
+        if result.error is None:
+            console.print(f"[green]✓[/green] {result.name} -> {result.output_path} [dim]({result.latency:.1f}s)[/dim]")
+        else:
+            console.print(f"[red]✗[/red] {result.name}: {result.error}")
+
+    try:
+        summary = run_batch(
+            jobs, template_content, output_dir, workers, on_result=report, tailor=tailor, candidate=candidate,
+            validation=validation,
+        )
+    except Exception as e:
+        console.print(f"[bold red]Error during batch tailoring:[/bold red] {e}")
+        raise typer.Exit(code=1)
+    validation = validation.stats()
+
+    table = Table(title="Batch Summary")
+    table.add_column("Metric")
+    table.add_column("Value", justify="right")
+    table.add_row("JDs tailored", f"{len(summary.succeeded)}/{len(summary.results)}")
+    table.add_row("Wall time", f"{summary.wall_time:.1f}s")
+    table.add_row("Throughput", f"{summary.jds_per_minute:.2f} JDs/min")
+    table.add_row("Latency p50", f"{summary.latency_percentile(50):.1f}s")
+    table.add_row("Latency p95", f"{summary.latency_percentile(95):.1f}s")
+    if validation["sections"]:
+        sections = validation["sections"]
+        table.add_row("Sections retried", f"{validation['retried']}/{sections} ({validation['retried'] / sections:.0%})")
+        table.add_row("Sections invalid", f"{validation['failed']}/{sections} ({validation['failed'] / sections:.0%})")
+    console.print(table)
+
+    if summary.failed:
+        raise typer.Exit(code=1)
+
+@app.command()
+def serve(
+    host: str = typer.Option(None, "--host", help="Address to listen on [default: SERVE_HOST]"),
+    port: int = typer.Option(None, "--port", "-p", help="Port to listen on [default: SERVE_PORT]"),
+    workers: int = typer.Option(None, "--workers", "-w", min=1, help="Requests handled at once [default: SERVE_WORKERS]")
+):
+    """
+    Run a long-lived daemon that keeps the embedding model, index and chain warm.
+    While it runs, `ingest` and `tailor` hand their work to it automatically.
+    """
+    from resume_forge.config import settings
+
+    if host is not None:
+        settings.SERVE_HOST = host
+    if port is not None:
+        settings.SERVE_PORT = port
+    workers = workers or settings.SERVE_WORKERS
+    _show_pipeline_logs()
+
+    from resume_forge.client import daemon_url, find_daemon
+    from resume_forge.llm import check_llm_status
+    from resume_forge.server import ForgeServer, ForgeService
+
+    if find_daemon() is not None:
+        console.print(f"[bold red]Error:[/bold red] A daemon is already running at {daemon_url()}.")
+        raise typer.Exit(code=1)
+
+    service = ForgeService(workers=workers, max_queue=settings.SERVE_MAX_QUEUE)
+    start = time.perf_counter()
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        transient=True,
+    ) as progress:
+        progress.add_task(description="Loading models and index...", total=None)
+        try:
+            service.warm_up()
+        except Exception as e:
+            console.print(f"[bold red]Error during warm-up:[/bold red] {e}")
+            raise typer.Exit(code=1)
+    console.print(f"[dim]Warm-up took {time.perf_counter() - start:.1f}s[/dim]")
+    if not check_llm_status():
+        console.print("[yellow]Warning:[/yellow] LLM endpoint is not reachable yet; tailor requests will fail until it is.")
+
+    try:
+        server = ForgeServer(settings.SERVE_HOST, settings.SERVE_PORT, service)
+    except OSError as e:
+        console.print(f"[bold red]Error:[/bold red] Cannot listen on {daemon_url()}: {e}")
+        raise typer.Exit(code=1)
+
+    console.print(f"[bold green]Serving on {daemon_url()}[/bold green] with {workers} workers (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+        console.print("[dim]Daemon stopped.[/dim]")
+
 if __name__ == "__main__":
     app()
@@ -0,0 +1,78 @@
+import json
+import os
+import urllib.error
+import urllib.request
+from typing import Optional
+
+from resume_forge.config import settings
+
+# Only the standard library is used here: the CLI imports this on every command to
+# look for a daemon, and must stay fast when none is running.
+
+
+class DaemonError(Exception):
+    """Raised when the daemon answers a request with an error."""
+
+    def __init__(self, message: str, status: int):
+        super().__init__(message)
+        self.status = status
+
+
+def daemon_url() -> str:
+    return f"http://{settings.SERVE_HOST}:{settings.SERVE_PORT}"
+
+
+def daemon_config() -> dict:
+    """
+    Settings that change what a tailor or ingest produces. The CLI only hands work
+    to a daemon whose configuration matches its own.
+    """
+    return {
+        "base_url": settings.LM_STUDIO_BASE_URL,
+        "model": settings.LM_STUDIO_MODEL,
+        "persist_dir": os.path.abspath(settings.CHROMA_PERSIST_DIR),
+        "collection": settings.COLLECTION_NAME,
+        "vector_backend": settings.VECTOR_BACKEND,
+        "embedding_model": settings.EMBEDDING_MODEL,
+        "retrieval_mode": settings.RETRIEVAL_MODE,
+        "multi_section_generation": settings.MULTI_SECTION_GENERATION,
+        "llm_cache_enabled": settings.LLM_CACHE_ENABLED,
+        "prompts_file": os.path.abspath(settings.PROMPTS_FILE),
+    }
+
+
+def find_daemon() -> Optional[dict]:
+    """Returns the status of a running daemon, or None if none answers quickly."""
+    try:
+        with urllib.request.urlopen(daemon_url() + "/health", timeout=settings.SERVE_CONNECT_TIMEOUT) as response:
+            return json.load(response)
+    except (OSError, ValueError):
+        return None
+
+
+def config_mismatch(status: dict) -> Optional[str]:
+    """Names the first setting on which the daemon differs from this process, if any."""
+    theirs = status.get("config", {})
+    for name, value in daemon_config().items():
+        if theirs.get(name) != value:
+            return name
+    return None
+
+
+def request(path: str, payload: dict, timeout: Optional[float] = None) -> dict:
+    """POSTs a JSON payload to the daemon and returns its JSON response."""
+    req = urllib.request.Request(
+        daemon_url() + path,
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=timeout or settings.LLM_REQUEST_TIMEOUT) as response:
+            return json.load(response)
+    except urllib.error.HTTPError as e:
+        try:
+            message = json.load(e).get("error", e.reason)
+        except ValueError:
+            message = e.reason
+        raise DaemonError(message, e.code)
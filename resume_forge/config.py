@@ -1,16 +1,57 @@
 import os
+from typing import Dict, List
+
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     LM_STUDIO_BASE_URL: str = "http://localhost:1234/v1"
     LM_STUDIO_MODEL: str = "local-model"  # Placeholder, LM Studio ignores this
+    LLM_REQUEST_TIMEOUT: float = 600.0  # Seconds; long sections on slow hardware take a while
+    LLM_HEALTH_CHECK_MODE: str = "light"  # 'light' (skip generation ping after a good check) or 'full'
+    LLM_HEALTH_TTL_SECONDS: int = 60
+    LLM_HEALTH_CACHE_PATH: str = ".cache/llm_health.json"
     CHROMA_PERSIST_DIR: str = ".chromadb"
     COLLECTION_NAME: str = "resume_vault"
+    VECTOR_BACKEND: str = "chroma"  # 'chroma' or 'numpy' (exact in-process search, no Chroma client)
+    NUMPY_INDEX_QUANTIZE: bool = False  # numpy backend: store int8 vectors (4x smaller, near-exact scores)
     EMBEDDING_MODEL: str = "all-MiniLM-L6-v2"
     DEVICE: str = "auto"  # 'auto', 'cpu', 'mps', 'cuda'
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_DIR: str = ".cache/embeddings"
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 20000
+    INGEST_WORKERS: int = 4  # Threads reading and chunking vault files during a full ingest
+    WATCH_INTERVAL: float = 1.0  # `ingest --watch`: seconds between polls of the vault
+    WATCH_DEBOUNCE: float = 1.0  # `ingest --watch`: quiet seconds after the last change before re-indexing
     TOP_K: int = 10
+    RETRIEVAL_MODE: str = "dense"  # 'dense', 'lexical' (BM25 only, never loads the embedding model) or 'hybrid'
+    RRF_K: int = 60  # Reciprocal-rank fusion constant for hybrid retrieval
+    RETRIEVAL_FETCH_K: int = 20  # Chunks fetched once per JD before per-section re-ranking
+    CONTEXT_TOKEN_BUDGET: int = 1000  # Estimated prompt tokens of context per section (0 = no limit)
+    CONTEXT_MMR_LAMBDA: float = 0.7  # Context ordering: 1.0 = retrieval rank only, lower = more diverse
+    SECTION_CONCURRENCY: int = 3  # Max sections generated in parallel (1 = sequential)
+    MULTI_SECTION_GENERATION: bool = False  # Generate all sections in one LLM call (split on markers)
+    SECTION_MAX_RETRIES: int = 1  # Regenerations of a section whose LaTeX fails validation (0 = only report)
+    SECTION_MAX_TOKENS: int = 1500  # Generation budget per section (0 = no limit)
+    SECTION_TOKEN_BUDGETS: Dict[str, int] = {"SKILLS": 500}  # Per-section overrides of SECTION_MAX_TOKENS
+    SECTION_STOP_AFTER: Dict[str, str] = {"SKILLS": "tabular"}  # Stop once this environment closes at the top level
+    GENERATION_STOP_MARKERS: List[str] = ["\\header{", "\\section{"]  # Output is cut before these (another section starts)
+    BATCH_CONCURRENCY: int = 2  # Max JDs tailored in parallel by tailor-batch
+    LLM_CACHE_ENABLED: bool = False  # Opt-in: reuse responses for identical prompts
+    LLM_CACHE_PATH: str = ".cache/llm_responses.sqlite"
+    LLM_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    LLM_CACHE_MAX_ENTRIES: int = 1000
     ACTION_WORDS_FILE: str = "templates/action_words.json"
+    ACTION_WORDS_TOP_N: int = 20  # Verbs per section prompt, most relevant to the JD first (0 = every verb in the section's categories)
     PROMPTS_FILE: str = "templates/prompts.yaml"
+    PROFILE_DIR: str = ".cache/profiles"  # Where `tailor --profile` writes Chrome traces
+    SERVE_HOST: str = "127.0.0.1"  # Address of the `serve` daemon (keep it local: requests carry JD text)
+    SERVE_PORT: int = 8765
+    SERVE_WORKERS: int = 4  # Requests the daemon works on at once
+    SERVE_MAX_QUEUE: int = 32  # Requests allowed to wait for a worker before the daemon answers 503
+    SERVE_CONNECT_TIMEOUT: float = 0.25  # Seconds the CLI waits for a daemon before running in-process
+    USE_DAEMON: bool = True  # Let `ingest`/`tailor` hand work to a running `serve` daemon
+    RETRIEVAL_CACHE_MAX_ENTRIES: int = 256  # JDs whose search results are memoized per process
+    STORE_CACHE_MAX_ENTRIES: int = 8  # Candidate indexes (store clients + BM25 indexes) kept open per process
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,147 @@
+from dataclasses import dataclass
+from typing import List, Optional, Set, Tuple
+
+from langchain_core.documents import Document
+
+from resume_forge.bm25 import tokenize
+
+# Local models vary, so prompt sizes are estimated rather than tokenized exactly
+CHARS_PER_TOKEN = 4
+
+# Shortest shared boundary text treated as splitter overlap rather than coincidence
+MIN_OVERLAP_CHARS = 20
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for prompt budgeting (about four characters per token)."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+@dataclass
+class ContextPackStats:
+    """Size of a section's context before and after packing."""
+    chunks_before: int = 0
+    chunks_after: int = 0
+    tokens_before: int = 0
+    tokens_after: int = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+    @property
+    def savings_ratio(self) -> float:
+        return self.tokens_saved / self.tokens_before if self.tokens_before else 0.0
+
+
+def _overlap(left: str, right: str) -> int:
+    """Returns the length of the longest suffix of left that is a prefix of right."""
+    probe = right[:MIN_OVERLAP_CHARS]
+    if len(probe) < MIN_OVERLAP_CHARS:
+        return 0
+    start = left.find(probe, max(0, len(left) - len(right)))
+    while start != -1:
+        if right.startswith(left[start:]):
+            return len(left) - start
+        start = left.find(probe, start + 1)
+    return 0
+
+
+def _merge_pair(a: str, b: str) -> Optional[str]:
+    """Joins two chunks of the same file if one contains or overlaps the other."""
+    if b in a:
+        return a
+    if a in b:
+        return b
+    overlap = _overlap(a, b)
+    if overlap:
+        return a + b[overlap:]
+    overlap = _overlap(b, a)
+    if overlap:
+        return b + a[overlap:]
+    return None
+
+
+def merge_overlapping_chunks(docs: List[Document]) -> List[Document]:
+    """
+    Merges chunks from the same source whose text overlaps (the splitter repeats
+    up to chunk_overlap characters between neighbours) or is contained in another.
+    A merged chunk takes the rank and metadata of its best-ranked part.
+    """
+    merged: List[Tuple[int, str, str, dict]] = []  # (rank, source, text, metadata)
+    for rank, doc in enumerate(docs):
+        source = doc.metadata.get("source", "")
+        current = (rank, source, doc.page_content, doc.metadata)
+        i = 0
+        while i < len(merged):
+            other = merged[i]
+            joined = _merge_pair(other[2], current[2]) if other[1] == source else None
+            if joined is None:
+                i += 1
+                continue
+            # The longer text may now overlap chunks it did not touch before, so rescan
+            del merged[i]
+            best = other if other[0] < current[0] else current
+            current = (best[0], source, joined, best[3])
+            i = 0
+        merged.append(current)
+
+    merged.sort(key=lambda entry: entry[0])
+    return [Document(page_content=text, metadata=dict(metadata)) for _, _, text, metadata in merged]
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def mmr_order(docs: List[Document], lambda_mult: float) -> List[Document]:
+    """
+    Reorders ranked chunks by maximal marginal relevance. Relevance comes from the
+    retrieval rank and redundancy from term overlap with already chosen chunks, so
+    no embeddings are needed (this also works in lexical retrieval mode).
+    """
+    if len(docs) <= 1 or lambda_mult >= 1:
+        return list(docs)
+    terms = [set(tokenize(doc.page_content)) for doc in docs]
+    relevance = [1 - rank / len(docs) for rank in range(len(docs))]
+    remaining = list(range(len(docs)))
+    chosen: List[int] = []
+    while remaining:
+        best = max(
+            remaining,
+            key=lambda i: lambda_mult * relevance[i] - (1 - lambda_mult) * max(
+                (_jaccard(terms[i], terms[j]) for j in chosen), default=0.0
+            ),
+        )
+        chosen.append(best)
+        remaining.remove(best)
+    return [docs[i] for i in chosen]
+
+
+def pack_context(
+    docs: List[Document], token_budget: int, lambda_mult: float, separator: str = "\n\n"
+) -> Tuple[List[Document], ContextPackStats]:
+    """
+    Merges overlapping chunks, orders them by MMR and keeps as many as fit in
+    token_budget (0 = unlimited). At least one chunk is always kept.
+    """
+    stats = ContextPackStats(
+        chunks_before=len(docs),
+        tokens_before=estimate_tokens(separator.join(doc.page_content for doc in docs)),
+    )
+    candidates = mmr_order(merge_overlapping_chunks(docs), lambda_mult)
+
+    packed: List[Document] = []
+    used = 0
+    for doc in candidates:
+        cost = estimate_tokens(doc.page_content) + (estimate_tokens(separator) if packed else 0)
+        if token_budget and packed and used + cost > token_budget:
+            continue  # a smaller, later chunk may still fit
+        packed.append(doc)
+        used += cost
+
+    stats.chunks_after = len(packed)
+    stats.tokens_after = estimate_tokens(separator.join(doc.page_content for doc in packed))
+    return packed, stats
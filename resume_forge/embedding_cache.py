@@ -0,0 +1,251 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from resume_forge import profiling
+
+
+def _normalize_text(text: str) -> str:
+    """Collapses whitespace so trivially reformatted text shares a cache entry."""
+    return " ".join(text.split())
+
+
+def _model_slug(model_name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+
+
+class EmbeddingCache:
+    """
+    Persistent embedding store keyed on (model name, normalized text hash).
+
+    Vectors live in a memory-mapped float32 matrix with a fixed number of slots;
+    a small SQLite index maps each key to its slot and tracks recency so the least
+    recently used entry is evicted once the cache is full. The database lock also
+    guards the matrix: writers hold it exclusively, readers look up and copy
+    vectors under a shared lock.
+    """
+
+    def __init__(self, cache_dir: str, model_name: str, max_entries: int):
+        self.cache_dir = cache_dir
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._vectors: Optional[np.memmap] = None
+        self._dim: Optional[int] = None
+        self._clock = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        slug = _model_slug(model_name)
+        self._vectors_path = os.path.join(cache_dir, f"{slug}.f32")
+        self._conn = sqlite3.connect(
+            os.path.join(cache_dir, f"{slug}.sqlite"), check_same_thread=False
+        )
+        # In WAL mode readers would not wait for a writer, which rewrites slots in place
+        self._conn.execute("PRAGMA journal_mode=DELETE")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, slot INTEGER NOT NULL, last_used INTEGER NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON entries(last_used)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER)")
+        self._conn.commit()
+        self._open_vectors()
+
+    def _key(self, text: str) -> str:
+        payload = f"{self.model_name}\0{_normalize_text(text)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _meta(self, name: str) -> Optional[int]:
+        row = self._conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def _open_vectors(self) -> None:
+        """
+        Maps the vector file if it holds entries in this instance's layout. Never
+        modifies the cache: another process may be allocating it right now, so
+        only a writer holding the database lock (see _prepare_write) starts over.
+        """
+        dim = self._meta("dim")
+        capacity = self._meta("capacity")
+        if dim is None or capacity != self.max_entries or not self._file_matches(dim):
+            self._vectors = None
+            self._dim = None
+            return
+        if self._vectors is None or self._dim != dim:
+            self._dim = dim
+            self._vectors = np.memmap(
+                self._vectors_path, dtype=np.float32, mode="r+", shape=(capacity, dim)
+            )
+        row = self._conn.execute("SELECT MAX(last_used) FROM entries").fetchone()
+        self._clock = max(self._clock, row[0] or 0)
+
+    def _file_matches(self, dim: int) -> bool:
+        try:
+            return os.path.getsize(self._vectors_path) == self.max_entries * dim * 4
+        except OSError:
+            return False
+
+    def _prepare_write(self, dim: int) -> None:
+        """
+        Called inside a write transaction (BEGIN EXCLUSIVE), so no other process can
+        change the layout meanwhile: maps the existing vector file, or creates it
+        (dropping all entries) when it is missing or was sized for another
+        dimension or capacity.
+        """
+        self._open_vectors()
+        if self._vectors is not None and self._dim == dim:
+            return
+        self._conn.execute("DELETE FROM entries")
+        self._dim = dim
+        self._vectors = np.memmap(
+            self._vectors_path, dtype=np.float32, mode="w+", shape=(self.max_entries, dim)
+        )
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)",
+            [("dim", dim), ("capacity", self.max_entries)],
+        )
+        self._clock = 0
+
+    def get_many(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """Returns the cached vector for each text, or None where it is missing."""
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        with self._lock:
+            touched = []
+            # One read transaction: no writer can reuse a slot between lookup and copy
+            self._conn.execute("BEGIN")
+            try:
+                # Another process may have stored the first vectors, or resized the file, since
+                self._open_vectors()
+                if self._vectors is None:
+                    self.misses += len(texts)
+                    return results
+
+                for i, text in enumerate(texts):
+                    key = self._key(text)
+                    row = self._conn.execute(
+                        "SELECT slot FROM entries WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row is None:
+                        self.misses += 1
+                        continue
+                    self.hits += 1
+                    self._clock += 1
+                    touched.append((self._clock, key))
+                    results[i] = self._vectors[row[0]].tolist()
+            finally:
+                self._conn.commit()
+
+            if touched:
+                self._conn.executemany("UPDATE entries SET last_used = ? WHERE key = ?", touched)
+                self._conn.commit()
+        return results
+
+    def put_many(self, texts: List[str], vectors: List[List[float]]) -> None:
+        """
+        Stores vectors, evicting the least recently used entries when full. Slots
+        are chosen and filled inside one exclusive transaction, so processes
+        sharing the cache (the serve daemon and a CLI run) never hand out the same
+        slot, and none is reading a slot while it is rewritten.
+        """
+        if not texts:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN EXCLUSIVE")
+            try:
+                self._prepare_write(len(vectors[0]))
+                count = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+                for text, vector in zip(texts, vectors):
+                    key = self._key(text)
+                    row = self._conn.execute(
+                        "SELECT slot FROM entries WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row is not None:
+                        slot = row[0]
+                    elif count < self.max_entries:
+                        slot = count
+                        count += 1
+                    else:
+                        slot, evicted = self._conn.execute(
+                            "SELECT slot, key FROM entries ORDER BY last_used LIMIT 1"
+                        ).fetchone()
+                        self._conn.execute("DELETE FROM entries WHERE key = ?", (evicted,))
+
+                    self._clock += 1
+                    self._vectors[slot] = np.asarray(vector, dtype=np.float32)
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO entries (key, slot, last_used) VALUES (?, ?, ?)",
+                        (key, slot, self._clock),
+                    )
+
+                # Vectors reach the file before the entries pointing at them are visible
+                self._vectors.flush()
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def stats(self) -> Dict[str, int]:
+        """Returns hit/miss counters for this process plus the current entry count."""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self)}
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that serves vectors from an EmbeddingCache.
+
+    The underlying model is only constructed (via embedder_factory) when a text
+    is not in the cache, so fully cached ingests and queries never load it.
+    """
+
+    def __init__(self, cache: EmbeddingCache, embedder_factory: Callable[[], Embeddings]):
+        self.cache = cache
+        self._embedder_factory = embedder_factory
+        self._embedder: Optional[Embeddings] = None
+        self._embedder_lock = threading.Lock()
+
+    @property
+    def embedder(self) -> Embeddings:
+        with self._embedder_lock:
+            if self._embedder is None:
+                self._embedder = self._embedder_factory()
+            return self._embedder
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        with profiling.span("embeddings.embed_documents", texts=len(texts)) as embed_span:
+            vectors = self.cache.get_many(texts)
+            missing = [i for i, vector in enumerate(vectors) if vector is None]
+            embed_span.set(cache_misses=len(missing))
+            if missing:
+                # Deduplicate so repeated chunks inside one batch are embedded once
+                unique_texts = list(dict.fromkeys(texts[i] for i in missing))
+                computed = self.embedder.embed_documents(unique_texts)
+                self.cache.put_many(unique_texts, computed)
+                by_text = dict(zip(unique_texts, computed))
+                for i in missing:
+                    vectors[i] = by_text[texts[i]]
+            return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        with profiling.span("embeddings.embed_query") as embed_span:
+            vector = self.cache.get_many([text])[0]
+            embed_span.set(cached=vector is not None)
+            if vector is None:
+                vector = self.embedder.embed_query(text)
+                self.cache.put_many([text], [vector])
+            return vector
+
+    def stats(self) -> Dict[str, int]:
+        return self.cache.stats()
@@ -1,36 +1,74 @@
-import torch
-from langchain_community.embeddings import HuggingFaceEmbeddings
+from typing import Dict, Optional
+
+from resume_forge import profiling
 from resume_forge.config import settings
+from resume_forge.embedding_cache import CachedEmbeddings, EmbeddingCache
 
 _cached_embeddings = None
 
 
+def _load_model():
+    """Loads the HuggingFace embeddings model on the configured device."""
+    with profiling.span("embeddings.load_model", model=settings.EMBEDDING_MODEL):
+        # Imported lazily so that torch and sentence-transformers are only loaded
+        # when a text actually needs embedding (and torch only for device detection)
+        from langchain_community.embeddings import HuggingFaceEmbeddings
+
+        device = settings.DEVICE
+        if device == "auto":
+            import torch
+
+            if torch.backends.mps.is_available():
+                device = "mps"
+            elif torch.cuda.is_available():
+                device = "cuda"
+            else:
+                device = "cpu"
+
+        model_kwargs = {'device': device}
+        encode_kwargs = {'normalize_embeddings': True}
+        return HuggingFaceEmbeddings(
+            model_name=settings.EMBEDDING_MODEL,
+            model_kwargs=model_kwargs,
+            encode_kwargs=encode_kwargs
+        )
+
+
 def get_embeddings():
-    """Returns the HuggingFace embeddings model, cached as a singleton."""
+    """
+    Returns the embeddings model, cached as a singleton.
+    When the persistent embedding cache is enabled the model is wrapped so that
+    previously seen texts skip the forward pass, and it is only loaded on a miss.
+    """
     global _cached_embeddings
     if _cached_embeddings is not None:
         return _cached_embeddings
 
-    device = settings.DEVICE
-    if device == "auto":
-        if torch.backends.mps.is_available():
-            device = "mps"
-        elif torch.cuda.is_available():
-            device = "cuda"
-        else:
-            device = "cpu"
-
-    model_kwargs = {'device': device}
-    encode_kwargs = {'normalize_embeddings': True}
-    _cached_embeddings = HuggingFaceEmbeddings(
-        model_name=settings.EMBEDDING_MODEL,
-        model_kwargs=model_kwargs,
-        encode_kwargs=encode_kwargs
-    )
+    if settings.EMBEDDING_CACHE_ENABLED:
+        cache = EmbeddingCache(
+            cache_dir=settings.EMBEDDING_CACHE_DIR,
+            model_name=settings.EMBEDDING_MODEL,
+            max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+        )
+        _cached_embeddings = CachedEmbeddings(cache, _load_model)
+    else:
+        _cached_embeddings = _load_model()
     return _cached_embeddings
 
 
+def embedding_cache_stats() -> Optional[Dict[str, int]]:
+    """
+    Stats of the persistent embedding cache in use, or None when no cached
+    embeddings instance exists. Never creates one (or loads the model).
+    """
+    embeddings = _cached_embeddings
+    return embeddings.stats() if isinstance(embeddings, CachedEmbeddings) else None
+
+
 def clear_embeddings_cache():
-    """Clears the cached embeddings instance. Called on re-ingest."""
+    """
+    Clears the cached embeddings instance. Open vector store clients keep the old
+    one, so drop them too (vectorstore._invalidate_vectorstore) to free it.
+    """
     global _cached_embeddings
     _cached_embeddings = None
@@ -0,0 +1,333 @@
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from typing import FrozenSet, Iterable, List, Set
+
+# Commands the sanitizer never strips the backslash from, on top of whatever the
+# template itself defines (see commands_from_template)
+DEFAULT_KNOWN_COMMANDS = frozenset([
+    "textbf", "textit", "textsc", "emph", "underline", "href", "hfill", "vspace", "hspace",
+    "begin", "end", "item", "itemsep", "section", "subsection", "header", "lineunder",
+    "contact", "employer", "school", "area", "bull", "cdot", "input", "pdfgentounicode",
+    "documentclass", "usepackage", "pagestyle", "raggedright", "newcommand",
+    "newenvironment", "def", "renewcommand", "tabular", "topsep",
+])
+
+# Every branch starts with a literal character (lookbehinds come after it), and the
+# leading lookahead lets the regex engine reject every other position cheaply
+# instead of trying each branch in turn.
+_TOKEN_PATTERN = r"""
+  (?=[\#*_%&$\\])
+  (?:
+    (?P<header>(?P<hashes>\#(?<![^\n]\#)\#{0,2})\s+.*$)  # stray markdown header line
+  | (?P<bold>\*\*(?P<bold_body>.*?)\*\*)                 # **bold**
+  | (?P<stray_bold>\*\*)                                 # unpaired ** (e.g. \textbf{text**)
+  | (?P<italic>_(?<!\w_))                                # opens _italic_ (not __dunder__)
+  | (?P<percent>%(?<=\d%)(?<!\\\d%))                     # 30% -> 30\%
+  | (?P<amp>&(?<!\\&))                                   # & -> \&
+  | (?P<dollar>\$(?<!\\\$))                              # $ -> \$ (decided after the scan)
+  | (?P<bad_command>\\(?!(?:<KNOWN>)\b)(?P<word>[A-Z][a-zA-Z]*))  # \Hallucinated -> Hallucinated
+  )
+"""
+
+# An underscore that can close an italic span
+_ITALIC_CLOSE = re.compile(r"_(?!\w)")
+
+_TEMPLATE_COMMAND_PATTERN = re.compile(
+    r"\\(?:newcommand|renewcommand|providecommand)\*?\s*\{?\s*\\([A-Za-z]+)"
+    r"|\\def\s*\\([A-Za-z]+)"
+    r"|\\(?:newenvironment|renewenvironment)\s*\{([A-Za-z]+)\}"
+)
+
+
+# A produced fragment is a [lookahead, output, is_dollar] list. `lookahead` is the
+# text as the legacy pipeline saw it when deciding whether to escape a $ (after
+# bold/italic/%/& fixes, before header and command cleanup); `output` is what ends
+# up in the result.
+_LOOKAHEAD, _OUTPUT, _IS_DOLLAR = 0, 1, 2
+
+
+class _Scan:
+    """Per-call state shared by the recursive scan of one text."""
+    __slots__ = ("text", "pieces", "bold_starts", "italic_closes", "newlines")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.pieces: List[list] = []
+        self.bold_starts: List[int] = []
+        self.italic_closes = [m.start() for m in _ITALIC_CLOSE.finditer(text)]
+        self.newlines = [m.start() for m in re.finditer("\n", text)]
+
+
+class LatexSanitizer:
+    """
+    Cleans up common LLM output artifacts that break LaTeX compilation in a single
+    tokenizing pass over the text, using one regex compiled up front.
+
+    Bold and italic bodies are sanitized recursively, italic spans are closed via a
+    precomputed index of closing underscores (no rescanning of long lines), and
+    unescaped $ signs are resolved in one backward sweep over the produced
+    fragments, so the result matches the previous eight-pass sanitizer. The only
+    intended difference is overlapping markup (e.g. an _italic_ span straddling a
+    **bold** span), which is resolved left to right instead of bold-first.
+    """
+
+    def __init__(self, known_commands: Iterable[str] = DEFAULT_KNOWN_COMMANDS):
+        self.known_commands: FrozenSet[str] = frozenset(known_commands)
+        # Longest first so a command is never shadowed by one of its prefixes
+        alternation = "|".join(
+            re.escape(c) for c in sorted(self.known_commands, key=len, reverse=True)
+        ) or "(?!)"
+        pattern = _TOKEN_PATTERN.replace("<KNOWN>", alternation)
+        self._pattern = re.compile(pattern, re.MULTILINE | re.VERBOSE)
+        # Italic bodies are not re-scanned for italics (the old pass ran only once)
+        self._pattern_no_italic = re.compile(
+            "\n".join(line for line in pattern.splitlines() if "P<italic>" not in line),
+            re.MULTILINE | re.VERBOSE,
+        )
+
+    def sanitize(self, text: str) -> str:
+        scan = _Scan(text)
+        self._scan(scan, self._pattern, 0, len(text), removed=False)
+        self._resolve_dollars(scan.pieces)
+        return "".join([piece[_OUTPUT] for piece in scan.pieces])
+
+    __call__ = sanitize
+
+    def _italic_close(self, scan: _Scan, open_pos: int, end: int) -> int:
+        """Returns the index of the underscore closing an italic opened at open_pos, or -1."""
+        i = bisect_right(scan.italic_closes, open_pos)
+        if i == len(scan.italic_closes):
+            return -1
+        close = scan.italic_closes[i]
+        j = bisect_right(scan.newlines, open_pos)
+        same_line = j == len(scan.newlines) or scan.newlines[j] > close
+        return close if close < end and same_line else -1
+
+    def _scan(self, scan: _Scan, pattern, start: int, end: int, removed: bool) -> None:
+        text = scan.text
+        append = scan.pieces.append
+
+        def emit(lookahead: str, output: str, is_dollar: bool = False) -> None:
+            append([lookahead, "" if removed else output, is_dollar])
+
+        literal_start = pos = start
+        while True:
+            match = pattern.search(text, pos, end)
+            if match is None:
+                break
+            kind = match.lastgroup
+
+            if kind == "italic":
+                close = self._italic_close(scan, match.start(), end)
+                if close == -1:
+                    # Not an italic span; the underscore stays part of the literal text
+                    pos = match.end()
+                    continue
+
+            if match.start() > literal_start:
+                literal = text[literal_start:match.start()]
+                emit(literal, literal)
+
+            if kind == "header":
+                # Sanitized for the $ lookahead like any other text, then dropped
+                emit(match.group("hashes"), "")
+                self._scan(scan, pattern, match.end("hashes"), match.end(), removed=True)
+                pos = match.end()
+            elif kind == "bold":
+                scan.bold_starts.append(match.start())
+                emit("\\textbf{", "\\textbf{")
+                self._scan(scan, pattern, match.start("bold_body"), match.end("bold_body"), removed)
+                emit("}", "}")
+                pos = match.end()
+            elif kind == "italic":
+                emit("\\textit{", "\\textit{")
+                self._scan(scan, self._pattern_no_italic, match.end(), close, removed)
+                emit("}", "}")
+                pos = close + 1
+            elif kind == "stray_bold":
+                # Closes a \textbf{ opened earlier on the same line, otherwise left alone
+                line_start = text.rfind("\n", 0, match.start()) + 1
+                # bold_starts is in increasing order, so only the latest one matters
+                closes = "\\textbf{" in text[line_start:match.start()] or (
+                    bool(scan.bold_starts) and scan.bold_starts[-1] >= line_start
+                )
+                replacement = "}" if closes else "**"
+                emit(replacement, replacement)
+                pos = match.end()
+            elif kind == "percent":
+                emit("\\%", "\\%")
+                pos = match.end()
+            elif kind == "amp":
+                emit("\\&", "\\&")
+                pos = match.end()
+            elif kind == "dollar":
+                emit("$", "$", is_dollar=True)
+                pos = match.end()
+            else:  # bad_command
+                emit(match.group(0), match.group("word"))
+                pos = match.end()
+            literal_start = pos
+
+        if end > literal_start:
+            literal = text[literal_start:end]
+            emit(literal, literal)
+
+    @staticmethod
+    def _resolve_dollars(pieces: List[list]) -> None:
+        """
+        Escapes each unescaped $ unless a backslash appears before the next $ (or
+        the end of the text), i.e. it is likely the start of inline math.
+        """
+        backslash_ahead = False
+        for piece in reversed(pieces):
+            lookahead = piece[_LOOKAHEAD]
+            if piece[_IS_DOLLAR]:
+                if piece[_OUTPUT]:
+                    piece[_OUTPUT] = "$" if backslash_ahead else "\\$"
+                backslash_ahead = False
+            elif "$" in lookahead:
+                backslash_ahead = "\\" in lookahead[:lookahead.index("$")]
+            elif "\\" in lookahead:
+                backslash_ahead = True
+
+
+# Tokens the validator tracks; escapes come first so \{ \} \% never count as
+# braces or comments
+_VALIDATION_TOKEN = re.compile(
+    r"""
+      (?P<escape>\\[^A-Za-z])
+    | \\(?P<env>begin|end)[ \t]*\{(?P<env_name>[^{}\n]*)\}
+    | \\(?P<command>[A-Za-z]+)
+    | (?P<comment>%.*$)
+    | (?P<open>\{)
+    | (?P<close>\})
+    | (?P<markdown>\*\*|```|^[ \t]*\#{1,6}[ \t]|\[[^\]\n]*\]\([^)\n]*\))
+    """,
+    re.MULTILINE | re.VERBOSE,
+)
+
+# Commands every fragment may use even if the template does not
+_COMMON_TEXT_COMMANDS = frozenset(["small", "footnotesize", "textnormal", "url", "newline", "linebreak"])
+
+
+class LatexValidator:
+    """
+    Fast structural check of a generated fragment in one regex pass: balanced
+    braces, matching \\begin/\\end environments, no leftover markdown, and only
+    commands the template already uses (or common text commands). Comments and
+    escaped characters are skipped. Returns a short list of problems.
+    """
+
+    def __init__(self, allowed_commands: Iterable[str] = DEFAULT_KNOWN_COMMANDS):
+        self.allowed_commands: FrozenSet[str] = (
+            frozenset(allowed_commands) | DEFAULT_KNOWN_COMMANDS | _COMMON_TEXT_COMMANDS
+        )
+
+    def validate(self, text: str, max_problems: int = 5) -> List[str]:
+        problems: List[str] = []
+        depth = 0
+        environments: List[str] = []
+        unknown: List[str] = []
+        markdown: List[str] = []
+
+        def add(problem: str) -> None:
+            if problem not in problems:
+                problems.append(problem)
+
+        for match in _VALIDATION_TOKEN.finditer(text):
+            kind = match.lastgroup
+            if kind == "open":
+                depth += 1
+            elif kind == "close":
+                if depth == 0:
+                    add("unbalanced braces: '}' without a matching '{'")
+                else:
+                    depth -= 1
+            elif kind == "env_name":
+                name = match.group("env_name").strip()
+                if match.group("env") == "begin":
+                    environments.append(name)
+                elif not environments:
+                    add(f"\\end{{{name}}} without a matching \\begin{{{name}}}")
+                elif environments[-1] != name:
+                    add(f"\\begin{{{environments[-1]}}} closed by \\end{{{name}}}")
+                    environments.pop()
+                else:
+                    environments.pop()
+            elif kind == "command":
+                name = match.group("command")
+                if name not in self.allowed_commands and name not in unknown:
+                    unknown.append(name)
+            elif kind == "markdown":
+                token = match.group("markdown").strip()
+                token = token if token in ("**", "```") else ("# header" if token.startswith("#") else "[link](url)")
+                if token not in markdown:
+                    markdown.append(token)
+
+        if depth:
+            add(f"unbalanced braces: {depth} '{{' never closed")
+        for name in reversed(environments):
+            add(f"\\begin{{{name}}} is never closed")
+        if unknown:
+            add("unknown commands: " + ", ".join(f"\\{name}" for name in unknown))
+        if markdown:
+            add("markdown left in the fragment: " + ", ".join(markdown))
+        return problems[:max_problems]
+
+    __call__ = validate
+
+
+def commands_used_in(template: str) -> Set[str]:
+    """Returns the name of every command a LaTeX template mentions."""
+    return set(re.findall(r"\\([A-Za-z]+)", template))
+
+
+@lru_cache(maxsize=32)
+def _cached_validator(allowed_commands: FrozenSet[str]) -> LatexValidator:
+    return LatexValidator(allowed_commands)
+
+
+def get_validator(allowed_commands: Iterable[str] = ()) -> LatexValidator:
+    """Returns a validator that also accepts allowed_commands, cached per command set."""
+    return _cached_validator(frozenset(allowed_commands))
+
+
+def commands_from_template(template: str) -> Set[str]:
+    """Returns the command and environment names a LaTeX template defines itself."""
+    return {
+        next(name for name in match.groups() if name)
+        for match in _TEMPLATE_COMMAND_PATTERN.finditer(template)
+    }
+
+
+@lru_cache(maxsize=32)
+def _cached_sanitizer(extra_commands: FrozenSet[str]) -> LatexSanitizer:
+    return LatexSanitizer(DEFAULT_KNOWN_COMMANDS | extra_commands)
+
+
+def get_sanitizer(extra_commands: Iterable[str] = ()) -> LatexSanitizer:
+    """Returns a compiled sanitizer that also accepts extra_commands, cached per command set."""
+    return _cached_sanitizer(frozenset(extra_commands))
+
+
+def reference_sanitize_latex(text: str) -> str:
+    """
+    The original eight-pass sanitizer. Kept as the oracle for equivalence tests
+    and as the baseline for benchmarks/bench_sanitizer.py; not used at runtime.
+    """
+    text = re.sub(r'\*\*(.*?)\*\*', r'\\textbf{\1}', text)
+    text = re.sub(r'\\textbf\{(.*?)\*\*', r'\\textbf{\1}', text)
+    text = re.sub(r'(?<!\w)_(.*?)_(?!\w)', r'\\textit{\1}', text)
+    text = re.sub(r'(?<!\\)(\d+)%', r'\1\\%', text)
+    text = re.sub(r'(?<!\\)&', r'\\&', text)
+    text = re.sub(r'(?<!\\)\$(?![^$]*\\)', r'\\$', text)
+    text = re.sub(r'^#{1,3}\s+.*$', '', text, flags=re.MULTILINE)
+    known_commands = (
+        r'textbf|textit|textsc|emph|underline|href|hfill|vspace|hspace|begin|end|'
+        r'item|itemsep|section|subsection|header|lineunder|contact|employer|school|'
+        r'area|bull|cdot|input|pdfgentounicode|documentclass|usepackage|pagestyle|'
+        r'raggedright|newcommand|newenvironment|def|renewcommand|tabular|topsep'
+    )
+    text = re.sub(rf'\\(?!(?:{known_commands})\b)([A-Z][a-zA-Z]*)', r'\1', text)
+    return text
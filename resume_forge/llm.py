@@ -1,30 +1,96 @@
-import requests
-from langchain_openai import ChatOpenAI
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+import httpx
+from resume_forge import profiling
 from resume_forge.config import settings
 
+LLM_TEMPERATURE = 0.1  # Lower for higher precision and deterministic formatting
+
+_http_client = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client() -> httpx.Client:
+    """
+    Returns a keep-alive HTTP client shared by the health check and the ChatOpenAI
+    client, so every request to the local server reuses pooled connections.
+    """
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            _http_client = httpx.Client(
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+                timeout=httpx.Timeout(settings.LLM_REQUEST_TIMEOUT, connect=5.0),
+            )
+        return _http_client
+
+
 def get_llm():
     """Returns a ChatOpenAI instance configured for the local LM Studio server."""
-    return ChatOpenAI(
-        base_url=settings.LM_STUDIO_BASE_URL,
-        api_key="lm-studio",  # Placeholder, not used but required by client
-        model=settings.LM_STUDIO_MODEL,
-        temperature=0.1, # Lower for higher precision and deterministic formatting
-        streaming=True
-    )
-
-def check_llm_status() -> bool:
-    """Checks if the LLM endpoint is reachable and usable."""
+    with profiling.span("llm.client_init"):
+        # Imported lazily: langchain_openai is slow to import and the health check doesn't need it
+        from langchain_openai import ChatOpenAI
+
+        return ChatOpenAI(
+            base_url=settings.LM_STUDIO_BASE_URL,
+            api_key="lm-studio",  # Placeholder, not used but required by client
+            model=settings.LM_STUDIO_MODEL,
+            temperature=LLM_TEMPERATURE,
+            streaming=True,
+            http_client=get_http_client()
+        )
+
+
+def _load_health_record() -> Optional[dict]:
+    """Returns the last persisted health check for the configured server and model, if any."""
+    try:
+        with open(settings.LLM_HEALTH_CACHE_PATH, "r") as f:
+            record = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if record.get("base_url") != settings.LM_STUDIO_BASE_URL or record.get("model") != settings.LM_STUDIO_MODEL:
+        return None
+    return record
+
+
+def _save_health_record(ok: bool) -> None:
+    record = {
+        "base_url": settings.LM_STUDIO_BASE_URL,
+        "model": settings.LM_STUDIO_MODEL,
+        "ok": ok,
+        "checked_at": time.time(),
+    }
+    try:
+        directory = os.path.dirname(settings.LLM_HEALTH_CACHE_PATH)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(settings.LLM_HEALTH_CACHE_PATH, "w") as f:
+            json.dump(record, f)
+    except OSError:
+        pass  # The cache is an optimization; never fail the check because of it
+
+
+def _probe_llm(ping: bool) -> bool:
+    """Queries the server; only sends a generation ping when `ping` is set."""
+    client = get_http_client()
     try:
         # 1. Connectivity Check
-        response = requests.get(f"{settings.LM_STUDIO_BASE_URL}/models", timeout=2)
+        response = client.get(f"{settings.LM_STUDIO_BASE_URL}/models", timeout=2)
         if response.status_code != 200:
             return False
-            
+
         # 2. Model Availability Check
         data = response.json()
         if not data.get("data"):
             return False
-            
+
+        if not ping:
+            return True
+
         # 3. Usability Check (ensure a model is actually LOADED)
         # We send a tiny request to verify the server can actually generate
         test_payload = {
@@ -32,8 +98,35 @@ def check_llm_status() -> bool:
             "messages": [{"role": "user", "content": "ping"}],
             "max_tokens": 1
         }
-        res = requests.post(f"{settings.LM_STUDIO_BASE_URL}/chat/completions", json=test_payload, timeout=3)
+        res = client.post(f"{settings.LM_STUDIO_BASE_URL}/chat/completions", json=test_payload, timeout=3)
         return res.status_code == 200
-        
-    except (requests.exceptions.RequestException, ValueError):
+
+    except (httpx.HTTPError, ValueError):
         return False
+
+
+def check_llm_status(use_cache: bool = True) -> bool:
+    """
+    Checks if the LLM endpoint is reachable and usable.
+
+    A successful result is persisted and reused for settings.LLM_HEALTH_TTL_SECONDS
+    across invocations. In "light" mode (LLM_HEALTH_CHECK_MODE) the generation ping
+    is skipped unless the previous check failed or none is on record; "full" mode
+    always pings.
+    """
+    with profiling.span("llm.health_check") as health_span:
+        record = _load_health_record()
+        if (
+            use_cache
+            and record is not None
+            and record.get("ok")
+            and time.time() - record.get("checked_at", 0) < settings.LLM_HEALTH_TTL_SECONDS
+        ):
+            health_span.set(cached=True)
+            return True
+
+        ping = settings.LLM_HEALTH_CHECK_MODE != "light" or record is None or not record.get("ok")
+        health_span.set(cached=False, ping=ping)
+        ok = _probe_llm(ping=ping)
+        _save_health_record(ok)
+        return ok
@@ -0,0 +1,96 @@
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+# Sections longer than this are split further by size
+CHUNK_SIZE = 500
+CHUNK_OVERLAP = 50
+
+_HEADER = re.compile(r"^(#{1,6})[ \t]+(.+?)[ \t#]*$")
+_FENCE = re.compile(r"^[ \t]*(```|~~~)")
+
+_splitter = RecursiveCharacterTextSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
+
+
+def list_markdown_files(vault_path: str) -> List[str]:
+    """Returns the markdown files in the vault, skipping templates (files starting with _) unread."""
+    return sorted(
+        str(path) for path in Path(vault_path).glob("**/*.md")
+        if path.is_file() and not path.name.startswith("_")
+    )
+
+
+def split_sections(text: str) -> List[Tuple[Optional[str], List[str], str]]:
+    """
+    Splits markdown on ATX headers (outside code fences) into (title, header path,
+    text) triples. The title is the first level-1 header; the header path lists the
+    enclosing level-2+ headers. Each section's text starts with its own header
+    line, so the sections concatenate back to the original text.
+    """
+    sections = []
+    title: Optional[str] = None
+    stack: List[Tuple[int, str]] = []
+    current: List[str] = []
+    path: List[str] = []
+    in_fence = False
+
+    for line in text.splitlines(keepends=True):
+        if _FENCE.match(line):
+            in_fence = not in_fence
+        match = None if in_fence else _HEADER.match(line.rstrip("\r\n"))
+        if match is not None:
+            if current:
+                sections.append((title, path, "".join(current)))
+            level, name = len(match.group(1)), match.group(2).strip()
+            if level == 1 and title is None:
+                title = name
+            while stack and stack[-1][0] >= level:
+                stack.pop()
+            if level > 1:
+                stack.append((level, name))
+            path = [name for _, name in stack]
+            current = []
+        current.append(line)
+    if current:
+        sections.append((title, path, "".join(current)))
+    return sections
+
+
+def load_markdown_chunks(path: str) -> List[Document]:
+    """
+    Reads one markdown file and chunks it: one chunk per header section, with
+    sections over CHUNK_SIZE characters split further by size. Chunks carry
+    `source`, `title` (first # header, else the file name) and `section`
+    (enclosing headers joined with " > ", empty before the first ## header).
+    Sections consisting of just a header line are dropped.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+
+    fallback_title = os.path.splitext(os.path.basename(path))[0]
+    chunks = []
+    for title, headers, section_text in split_sections(text):
+        body = section_text.strip()
+        if not body or (_HEADER.match(body) and "\n" not in body):
+            continue
+        metadata = {
+            "source": path,
+            "title": title or fallback_title,
+            "section": " > ".join(headers),
+        }
+        pieces = [body] if len(body) <= CHUNK_SIZE else _splitter.split_text(body)
+        chunks.extend(Document(page_content=piece, metadata=dict(metadata)) for piece in pieces)
+    return chunks
+
+
+def load_vault_chunks(paths: List[str], max_workers: int) -> List[Document]:
+    """Chunks many markdown files on a thread pool, keeping the order of paths."""
+    if max_workers <= 1 or len(paths) <= 1:
+        return [chunk for path in paths for chunk in load_markdown_chunks(path)]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return [chunk for chunks in executor.map(load_markdown_chunks, paths) for chunk in chunks]
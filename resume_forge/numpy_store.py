@@ -0,0 +1,258 @@
+import json
+import os
+import threading
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+INDEX_VERSION = 1
+
+
+@dataclass
+class _Index:
+    """An immutable snapshot of the stored vectors; replaced wholesale on every write."""
+    ids: List[str] = field(default_factory=list)
+    texts: List[str] = field(default_factory=list)
+    metadatas: List[dict] = field(default_factory=list)
+    vectors: Optional[np.ndarray] = None  # (n, dim) float32, or int8 when quantized
+    scales: Optional[np.ndarray] = None  # (n,) float32 per-row scale for int8 vectors
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def _quantize(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Symmetric per-row int8 quantization; returns (int8 rows, float32 scales)."""
+    scales = np.abs(vectors).max(axis=1) / 127
+    scales = np.where(scales == 0, 1, scales).astype(np.float32)
+    quantized = np.rint(vectors / scales[:, None]).astype(np.int8)
+    return quantized, scales
+
+
+class NumpyVectorStore(VectorStore):
+    """
+    In-process vector store for personal-sized vaults.
+
+    Vectors are L2-normalized and kept in a float32 (or int8-quantized) .npy matrix
+    that is memory-mapped on open, with ids, texts and metadata in a JSON sidecar.
+    Search is exact cosine similarity: one matrix-vector product followed by
+    argpartition for the top k. Writes rewrite the (small) files atomically and
+    swap in a new snapshot, so concurrent readers never see a partial index.
+    """
+
+    def __init__(
+        self,
+        persist_directory: str,
+        embedding_function: Embeddings,
+        collection_name: str,
+        quantize: bool = False,
+    ):
+        self.persist_directory = persist_directory
+        self.collection_name = collection_name
+        self.quantize = quantize
+        self._embedding_function = embedding_function
+        self._index: Optional[_Index] = None
+        self._lock = threading.Lock()
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self._embedding_function
+
+    def _path(self, suffix: str) -> str:
+        return os.path.join(self.persist_directory, f"{self.collection_name}.{suffix}")
+
+    def _get_index(self) -> _Index:
+        index = self._index
+        if index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = self._read_index()
+                index = self._index
+        return index
+
+    def _read_index(self) -> _Index:
+        meta_path = self._path("meta.json")
+        if not os.path.exists(meta_path):
+            return _Index()
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+        if meta.get("version") != INDEX_VERSION or not meta["ids"]:
+            return _Index()
+        vectors = np.load(self._path("vectors.npy"), mmap_mode="r")
+        scales = np.load(self._path("scales.npy")) if meta["quantized"] else None
+        return _Index(meta["ids"], meta["texts"], meta["metadatas"], vectors, scales)
+
+    def _write_index(self, index: _Index) -> None:
+        """Persists a snapshot (vectors first, sidecar last) and makes it current."""
+        os.makedirs(self.persist_directory, exist_ok=True)
+        quantized = index.scales is not None
+        if index.vectors is not None:
+            self._save_array("vectors.npy", index.vectors)
+            if quantized:
+                self._save_array("scales.npy", index.scales)
+
+        meta = {
+            "version": INDEX_VERSION,
+            "quantized": quantized,
+            "ids": index.ids,
+            "texts": index.texts,
+            "metadatas": index.metadatas,
+        }
+        tmp_path = self._path("meta.json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._path("meta.json"))
+        self._index = index
+
+    def _save_array(self, name: str, array: np.ndarray) -> None:
+        tmp_path = self._path(name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.save(f, np.ascontiguousarray(array))
+        os.replace(tmp_path, self._path(name))
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        texts = list(texts)
+        if not texts:
+            return []
+        metadatas = list(metadatas) if metadatas is not None else [{} for _ in texts]
+        ids = list(ids) if ids is not None else [uuid.uuid4().hex for _ in texts]
+
+        new_vectors = _normalize(
+            np.asarray(self._embedding_function.embed_documents(texts), dtype=np.float32)
+        )
+        with self._lock:
+            current = self._index if self._index is not None else self._read_index()
+
+            # Re-adding an existing id replaces it, as in Chroma's upsert
+            replaced = set(ids)
+            keep = [i for i, chunk_id in enumerate(current.ids) if chunk_id not in replaced]
+            index = self._concat(current, keep, ids, texts, metadatas, new_vectors)
+            self._write_index(index)
+        return ids
+
+    def _concat(
+        self,
+        current: _Index,
+        keep: List[int],
+        ids: List[str],
+        texts: List[str],
+        metadatas: List[dict],
+        new_vectors: np.ndarray,
+    ) -> _Index:
+        new_scales = None
+        if self.quantize:
+            new_vectors, new_scales = _quantize(new_vectors)
+
+        vectors, scales = new_vectors, new_scales
+        if current.vectors is not None and keep:
+            if (current.scales is not None) != self.quantize:
+                raise ValueError(
+                    f"Index '{self.collection_name}' was stored with a different precision; re-ingest it"
+                )
+            vectors = np.concatenate([np.asarray(current.vectors[keep]), new_vectors])
+            if self.quantize:
+                scales = np.concatenate([current.scales[keep], new_scales])
+
+        return _Index(
+            ids=[current.ids[i] for i in keep] + ids,
+            texts=[current.texts[i] for i in keep] + texts,
+            metadatas=[current.metadatas[i] for i in keep] + metadatas,
+            vectors=vectors,
+            scales=scales,
+        )
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        if not ids:
+            return None
+        removed = set(ids)
+        with self._lock:
+            current = self._index if self._index is not None else self._read_index()
+            keep = [i for i, chunk_id in enumerate(current.ids) if chunk_id not in removed]
+            if len(keep) == len(current.ids):
+                return True
+            index = _Index(
+                ids=[current.ids[i] for i in keep],
+                texts=[current.texts[i] for i in keep],
+                metadatas=[current.metadatas[i] for i in keep],
+                vectors=np.asarray(current.vectors[keep]) if keep else None,
+                scales=current.scales[keep] if current.scales is not None and keep else None,
+            )
+            self._write_index(index)
+        return True
+
+    def __len__(self) -> int:
+        return len(self._get_index().ids)
+
+    def _top_k(self, embedding: List[float], k: int) -> List[Tuple[int, float]]:
+        """Returns (row, cosine similarity) for the k most similar rows, best first."""
+        index = self._get_index()
+        if not index.ids or k <= 0:
+            return []
+        query = _normalize(np.asarray(embedding, dtype=np.float32))
+        scores = index.vectors @ query
+        if index.scales is not None:
+            scores = scores * index.scales
+
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(i), float(scores[i])) for i in top]
+
+    def similarity_search_by_vector_with_score(
+        self, embedding: List[float], k: int = 4
+    ) -> List[Tuple[Document, float]]:
+        index = self._get_index()
+        return [
+            (
+                Document(id=index.ids[i], page_content=index.texts[i], metadata=dict(index.metadatas[i])),
+                score,
+            )
+            for i, score in self._top_k(embedding, k)
+        ]
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_by_vector_with_score(embedding, k)]
+
+    def similarity_search_with_score(self, query: str, k: int = 4, **kwargs: Any) -> List[Tuple[Document, float]]:
+        return self.similarity_search_by_vector_with_score(self._embedding_function.embed_query(query), k)
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k)]
+
+    def _select_relevance_score_fn(self) -> Callable[[float], float]:
+        # Scores are already cosine similarities
+        return lambda score: score
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        persist_directory: str = ".vectors",
+        collection_name: str = "resume_vault",
+        quantize: bool = False,
+        **kwargs: Any,
+    ) -> "NumpyVectorStore":
+        store = cls(
+            persist_directory=persist_directory,
+            embedding_function=embedding,
+            collection_name=collection_name,
+            quantize=quantize,
+        )
+        store.add_texts(texts, metadatas=metadatas, ids=ids)
+        return store
@@ -1,159 +1,736 @@
-import json
-import os
+import logging
 import re
-from typing import Dict, Any, List
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
 
-from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import RunnablePassthrough
+from langchain_core.runnables import RunnableGenerator, RunnableLambda
 
+from resume_forge import profiling
+from resume_forge.action_words import select_action_words
 from resume_forge.config import settings
-from resume_forge.llm import get_llm
+from resume_forge.context import pack_context
+from resume_forge.latex import LatexSanitizer, LatexValidator, get_sanitizer, get_validator
+from resume_forge.llm import LLM_TEMPERATURE, get_llm
+from resume_forge.llm_cache import get_response_cache
+from resume_forge.retrieval import retrieve_for_jd, select_for_section
 from resume_forge.vectorstore import get_retriever
-from resume_forge.prompts import load_prompts
+from resume_forge.prompts import get_prompts_hash, load_prompts
+from resume_forge.template_engine import ParsedTemplate, describe_options, parse_template
+
+logger = logging.getLogger(__name__)
 
 
 def format_docs(docs) -> str:
     return "\n\n".join(doc.page_content for doc in docs)
 
 
-def _load_action_words() -> dict:
-    """Loads the action words JSON file from disk."""
-    action_words_path = settings.ACTION_WORDS_FILE
-    if os.path.exists(action_words_path):
-        with open(action_words_path, "r") as f:
-            return json.load(f)
-    return {}
+def _section_context(
+    job_description: str, section_name: str, retriever, token_budget: Optional[int] = None, candidate: str = ""
+) -> str:
+    """
+    Builds a section's context: the shared JD results re-ranked for the section,
+    then packed (overlapping chunks merged, MMR-ordered, cut to token_budget,
+    default settings.CONTEXT_TOKEN_BUDGET) so less prompt is processed per section.
+    """
+    if token_budget is None:
+        token_budget = settings.CONTEXT_TOKEN_BUDGET
+    docs = select_for_section(retrieve_for_jd(job_description, retriever, candidate), section_name)
+    with profiling.span("pipeline.pack_context", section=section_name) as pack_span:
+        packed, stats = pack_context(docs, token_budget, settings.CONTEXT_MMR_LAMBDA)
+        pack_span.set(tokens_before=stats.tokens_before, tokens_after=stats.tokens_after)
+    logger.info(
+        "Context for %s: %d -> %d chunks, ~%d -> ~%d prompt tokens (saved ~%d, %.0f%%)",
+        section_name, stats.chunks_before, stats.chunks_after, stats.tokens_before,
+        stats.tokens_after, stats.tokens_saved, stats.savings_ratio * 100,
+    )
+    return format_docs(packed)
+
+
+# The OpenAI API rejects requests with more stop sequences than this
+MAX_SERVER_STOP_SEQUENCES = 4
 
 
-def _select_relevant_action_words(action_words: dict, section_name: str) -> str:
+@dataclass(frozen=True)
+class GenerationLimits:
     """
-    Selects a relevant subset of action words based on the section type,
-    rather than dumping the entire 300-line JSON into the prompt.
+    Per-call generation bounds: a token budget and stop sequences (the first
+    MAX_SERVER_STOP_SEQUENCES sent to the server, all of them checked on the
+    stream), plus the environment whose top-level closing completes the fragment
+    (see FragmentMonitor).
     """
-    section_category_map = {
-        "EXPERIENCE": ["lead", "mgmt", "tech"],
-        "PROJECTS": ["tech", "crea", "rsch"],
-        "SKILLS": [],  # Skills section doesn't use action words
-    }
+    max_tokens: Optional[int] = None
+    stop: Tuple[str, ...] = ()
+    stop_after: Optional[str] = None
+
+    def llm_kwargs(self) -> dict:
+        kwargs: Dict[str, Any] = {}
+        if self.max_tokens:
+            kwargs["max_tokens"] = self.max_tokens
+        if self.stop:
+            kwargs["stop"] = list(self.stop[:MAX_SERVER_STOP_SEQUENCES])
+        return kwargs
+
+
+def _section_budget(section: str, options: Optional[Mapping[str, object]] = None) -> Optional[int]:
+    options = options or {}
+    budget = options.get("max_tokens") or settings.SECTION_TOKEN_BUDGETS.get(section, settings.SECTION_MAX_TOKENS)
+    return int(budget) or None
 
-    categories = section_category_map.get(section_name, list(action_words.keys()))
 
-    if not categories:
-        return "N/A (Skills section does not require action words)"
+def section_limits(section: str, options: Optional[Mapping[str, object]] = None) -> GenerationLimits:
+    """
+    Limits for one section: its token budget (placeholder max_tokens, else
+    SECTION_TOKEN_BUDGETS, else SECTION_MAX_TOKENS), GENERATION_STOP_MARKERS plus
+    the single-call section marker, and its SECTION_STOP_AFTER environment
+    (placeholder stop_after overrides it).
+    """
+    options = options or {}
+    return GenerationLimits(
+        max_tokens=_section_budget(section, options),
+        stop=tuple(settings.GENERATION_STOP_MARKERS) + ("%%% SECTION",),
+        stop_after=options.get("stop_after") or settings.SECTION_STOP_AFTER.get(section),
+    )
+
+
+def combined_limits(sections: List[str], options: Optional[Mapping[str, Mapping[str, object]]] = None) -> GenerationLimits:
+    """Limits for a single-call generation: the sum of the section budgets (unlimited if any is)."""
+    options = options or {}
+    budgets = [_section_budget(section, options.get(section)) for section in sections]
+    return GenerationLimits(
+        max_tokens=sum(budgets) if budgets and all(budgets) else None,
+        stop=tuple(settings.GENERATION_STOP_MARKERS),
+    )
 
-    subset = {}
-    for cat in categories:
-        if cat in action_words:
-            subset[cat] = action_words[cat]
 
-    return json.dumps(subset, indent=2)
+_ENVIRONMENT = re.compile(r"\\(begin|end)[ \t]*\{([^{}\n]*)\}")
 
 
-def build_rag_chain():
+class FragmentMonitor:
     """
-    Builds the RAG chain:
-    Retriever -> Format Docs -> Prompt -> LLM -> Output Parser
+    Watches a streamed fragment for its end: the first stop marker (another
+    section starting) or, with stop_after, the closing of that environment at
+    the top level (e.g. SKILLS is done once its tabular closes). feed() returns
+    the text to pass on, cut at the end; text that could be the start of a
+    marker is held back until it is known not to be one.
     """
-    prompts = load_prompts()
-    system_prompt = prompts.get("system_prompt", "")
-    user_prompt_template = prompts.get("user_prompt", "")
 
+    def __init__(self, markers: Iterable[str] = (), stop_after: Optional[str] = None):
+        self.markers = tuple(marker for marker in markers if marker)
+        self.stop_after = stop_after
+        self.stopped = False
+        self._line = ""  # current, incomplete line
+        self._released = 0  # characters of _line already passed on
+        self._depth = 0  # open stop_after environments before _line
+
+    def _find_end(self, line: str) -> Tuple[Optional[int], int]:
+        """Returns where the fragment ends in line (or None) and the depth after it."""
+        cut = None
+        for marker in self.markers:
+            index = line.find(marker)
+            if index != -1 and (cut is None or index < cut):
+                cut = index
+        depth = self._depth
+        if self.stop_after:
+            for match in _ENVIRONMENT.finditer(line, 0, len(line) if cut is None else cut):
+                if match.group(2).strip() != self.stop_after:
+                    continue
+                if match.group(1) == "begin":
+                    depth += 1
+                elif depth:
+                    depth -= 1
+                    if not depth:
+                        return match.end(), depth
+        return cut, depth
+
+    def _held_back(self, line: str) -> int:
+        """Length of the longest suffix of line that is a proper prefix of a marker."""
+        for size in range(min(len(line), max(map(len, self.markers), default=1) - 1), 0, -1):
+            if any(marker.startswith(line[-size:]) for marker in self.markers):
+                return size
+        return 0
+
+    def feed(self, chunk: str) -> str:
+        if self.stopped:
+            return ""
+        self._line += chunk
+        out = []
+        while True:
+            newline = self._line.find("\n")
+            line = self._line if newline == -1 else self._line[:newline]
+            cut, depth = self._find_end(line)
+            if cut is not None:
+                out.append(self._line[self._released:max(cut, self._released)])
+                self.stopped = True
+                self._line, self._released = "", 0
+                return "".join(out)
+            if newline == -1:
+                safe = len(line) - self._held_back(line)
+                out.append(self._line[self._released:safe])
+                self._released = max(self._released, safe)
+                return "".join(out)
+            out.append(self._line[self._released:newline + 1])
+            self._line, self._released, self._depth = self._line[newline + 1:], 0, depth
+
+    def flush(self) -> str:
+        """Returns any held-back text once the stream has ended."""
+        rest = "" if self.stopped else self._line[self._released:]
+        self._line, self._released = "", 0
+        return rest
+
+
+def _stream_generation(llm, prompt_value, limits: GenerationLimits, config) -> Iterator[str]:
+    """
+    Streams one generation's text within limits. Once the FragmentMonitor sees the
+    end of the fragment the stream is closed, which drops the connection so the
+    server stops generating instead of running to its token budget. The model is
+    streamed directly rather than through a runnable sequence, whose tracing would
+    read the rest of the response when the stream is closed.
+    """
+    kwargs = limits.llm_kwargs()
+    model = llm.bind(**kwargs) if kwargs else llm
+    stream = model.stream(prompt_value, config)
+    monitor = FragmentMonitor(limits.stop, limits.stop_after)
+    try:
+        for chunk in _timed_stream(stream):
+            text = monitor.feed(chunk if isinstance(chunk, str) else chunk.content)
+            if text:
+                yield text
+            if monitor.stopped:
+                logger.debug("Fragment complete; stopped generation early")
+                return
+        text = monitor.flush()
+        if text:
+            yield text
+    finally:
+        stream.close()
+
+
+def _with_response_cache(llm):
+    """
+    Generates within each call's GenerationLimits (see _stream_generation), with
+    the persistent response cache (when enabled) keyed on the rendered prompt,
+    limits, model, temperature and prompts.yaml hash. Takes {"prompt", "limits"}.
+    Tokens are passed through as they stream in; a response is only stored once
+    it has been generated completely.
+    """
+    cache = get_response_cache()
+    prompts_hash = get_prompts_hash()
+
+    def generate(inputs_stream: Iterator, config) -> Iterator[str]:
+        for inputs in inputs_stream:
+            prompt_value, limits = inputs["prompt"], inputs["limits"]
+            if cache is None:
+                yield from _stream_generation(llm, prompt_value, limits, config)
+                continue
+
+            key = cache.make_key(
+                f"{prompt_value.to_string()}\0{limits!r}", settings.LM_STUDIO_MODEL, LLM_TEMPERATURE, prompts_hash
+            )
+            cached = cache.get(key)
+            if cached is not None:
+                yield cached
+                continue
+
+            parts = []
+            for chunk in _stream_generation(llm, prompt_value, limits, config):
+                parts.append(chunk)
+                yield chunk
+            cache.put(key, "".join(parts))
+
+    return RunnableGenerator(generate)
+
+
+def _timed_stream(chunks: Iterator) -> Iterator:
+    """
+    When profiling is enabled, records an LLM call's time to first token and
+    generation time (first token to last) while passing the chunks through.
+    """
+    if not profiling.is_enabled():
+        yield from chunks
+        return
+
+    start = time.perf_counter()
+    first_token = None
+    count = 0
+    try:
+        for chunk in chunks:
+            if first_token is None:
+                first_token = time.perf_counter()
+                profiling.record("llm.time_to_first_token", start, first_token)
+            count += 1
+            yield chunk
+    finally:
+        # Also recorded when the stream is closed early
+        if first_token is not None:
+            profiling.record("llm.generate", first_token, time.perf_counter(), chunks=count)
+
+
+def _chat_prompt(prompts: dict, user_prompt_key: str):
+    """Renders the prompt and passes the call's GenerationLimits ("limits") along with it."""
     prompt = ChatPromptTemplate.from_messages([
-        ("system", system_prompt),
-        ("user", user_prompt_template)
+        ("system", prompts.get("system_prompt", "")),
+        ("user", prompts.get(user_prompt_key, ""))
     ])
 
-    retriever = get_retriever()
-    llm = get_llm()
-    action_words = _load_action_words()
+    def render(inputs: dict, config):
+        with profiling.span("pipeline.render_prompt"):
+            return {"prompt": prompt.invoke(inputs, config), "limits": inputs["limits"]}
+
+    return RunnableLambda(render)
+
+
+def build_rag_chain(candidate: str = ""):
+    """
+    Builds the RAG chain over a candidate's index (the default one unless named):
+    Retriever (once per JD) -> Section Re-rank -> Context Packing -> Format Docs -> Prompt -> [Response Cache] -> LLM (stopped early once the fragment is complete)
+    Optional inputs: section_constraints, retry_feedback and section_options (see section_limits).
+    """
+    prompts = load_prompts()
+    prompt = _chat_prompt(prompts, "user_prompt")
+    section_formats = prompts.get("section_formats", "")
+
+    with profiling.span("pipeline.build_chain"):
+        retriever = get_retriever(k=settings.RETRIEVAL_FETCH_K, candidate=candidate)
+        llm = get_llm()
 
     chain = (
         {
-            "context": (lambda x: x["job_description"]) | retriever | format_docs,
+            "context": lambda x: _section_context(
+                x["job_description"], x["section_name"], retriever, candidate=candidate
+            ),
             "job_description": lambda x: x["job_description"],
+            "section_formats": lambda x: section_formats,
             "section_name": lambda x: x["section_name"],
-            "action_words": lambda x: _select_relevant_action_words(
-                action_words, x["section_name"]
-            ),
+            "section_constraints": lambda x: _constraint_line(x.get("section_constraints", "")),
+            "retry_feedback": lambda x: x.get("retry_feedback", ""),
+            "action_words": lambda x: select_action_words(x["job_description"], [x["section_name"]]),
+            "limits": lambda x: section_limits(x["section_name"], x.get("section_options")),
         }
         | prompt
-        | llm
-        | StrOutputParser()
+        | _with_response_cache(llm)
     )
 
     return chain
 
 
-def tailor_resume_section(job_description: str, template_content: str) -> str:
+def build_multi_section_chain(candidate: str = ""):
     """
-    Detects placeholders (%% SECTION %%) in the template and fills them sequentially.
+    Builds a chain that generates several sections in one LLM call. Takes
+    {"job_description", "section_names": [...]} and returns the raw response, with
+    each section introduced by a `%%% SECTION: NAME %%%` marker (see split_sections).
+    The context is packed once with a budget of CONTEXT_TOKEN_BUDGET per section.
     """
-    placeholders = ["SKILLS", "EXPERIENCE", "PROJECTS"]
-    final_output = template_content
-    chain = build_rag_chain()
+    prompts = load_prompts()
+    prompt = _chat_prompt(prompts, "multi_section_prompt")
+    section_formats = prompts.get("section_formats", "")
+
+    with profiling.span("pipeline.build_chain", multi_section=True):
+        retriever = get_retriever(k=settings.RETRIEVAL_FETCH_K, candidate=candidate)
+        llm = get_llm()
+
+    chain = (
+        {
+            "context": lambda x: _section_context(
+                x["job_description"], "ALL", retriever,
+                token_budget=settings.CONTEXT_TOKEN_BUDGET * len(x["section_names"]), candidate=candidate,
+            ),
+            "job_description": lambda x: x["job_description"],
+            "section_formats": lambda x: section_formats,
+            "section_names": lambda x: _describe_sections(x["section_names"], x.get("section_options", {})),
+            "action_words": lambda x: select_action_words(x["job_description"], x["section_names"]),
+            "limits": lambda x: combined_limits(x["section_names"], x.get("section_options")),
+        }
+        | prompt
+        | _with_response_cache(llm)
+    )
+
+    return chain
 
-    for section in placeholders:
-        # Match %% SECTION %% with any amount of internal whitespace
-        pattern = rf"%%\s+{section}\s+%%"
-        if re.search(pattern, final_output):
-            print(f"Generating section: {section}...")
-            try:
-                response = chain.invoke({
-                    "job_description": job_description,
-                    "section_name": section
-                })
 
-                # Clean up markdown fences
-                cleaned_response = re.sub(r'^```(latex)?\n', '', response, flags=re.MULTILINE | re.IGNORECASE)
-                cleaned_response = re.sub(r'\n```$', '', cleaned_response, flags=re.MULTILINE)
-                cleaned_response = cleaned_response.strip()
+def _constraint_line(constraint: str) -> str:
+    return f"Limit: {constraint}." if constraint else ""
 
-                # Sanitize LaTeX (convert **bold** to \textbf{bold}, etc.)
-                cleaned_response = sanitize_latex(cleaned_response)
 
-                final_output = re.sub(pattern, lambda m: cleaned_response, final_output)
-            except Exception as e:
-                print(f"Error generating section {section}: {e}")
-                final_output = re.sub(pattern, f"% Error generating {section}: {e}", final_output)
+def _describe_sections(sections: List[str], options: Mapping[str, Mapping[str, object]]) -> str:
+    """Lists the target sections, e.g. "SKILLS, EXPERIENCE (at most 3 items)"."""
+    described = []
+    for section in sections:
+        constraint = describe_options(options.get(section, {}))
+        described.append(f"{section} ({constraint})" if constraint else section)
+    return ", ".join(described)
 
-    return final_output.strip()
 
+def build_tailor_chain(candidate: str = ""):
+    """Builds the chain tailor_resume_section expects for settings.MULTI_SECTION_GENERATION."""
+    if settings.MULTI_SECTION_GENERATION:
+        return build_multi_section_chain(candidate)
+    return build_rag_chain(candidate)
 
-def sanitize_latex(text: str) -> str:
+
+_SECTION_MARKER = re.compile(r"^[ \t]*%%%[ \t]*SECTION:[ \t]*([A-Za-z][A-Za-z0-9_]*)[ \t]*%%%[ \t]*$", re.MULTILINE)
+
+
+def split_sections(response: str, sections: List[str]) -> Dict[str, str]:
     """
-    Cleans up common LLM output artifacts that break LaTeX compilation.
+    Splits a single-call response on its `%%% SECTION: NAME %%%` markers. Returns
+    the raw text for each requested section that was found (first occurrence wins).
+    """
+    markers = list(_SECTION_MARKER.finditer(response))
+    parts: Dict[str, str] = {}
+    for marker, following in zip(markers, markers[1:] + [None]):
+        name = marker.group(1).upper()
+        if name in sections and name not in parts:
+            end = following.start() if following is not None else len(response)
+            parts[name] = response[marker.end():end]
+    return parts
+
+
+def _section_inputs(
+    job_description: str, section: str, options: Optional[Mapping[str, object]] = None, feedback: str = ""
+) -> dict:
+    inputs: Dict[str, Any] = {"job_description": job_description, "section_name": section}
+    if options:
+        inputs["section_options"] = dict(options)
+        constraint = describe_options(options)
+        if constraint:
+            inputs["section_constraints"] = constraint
+    if feedback:
+        inputs["retry_feedback"] = feedback
+    return inputs
+
+
+def _generate_section(
+    chain, job_description: str, section: str, sanitizer: Optional[LatexSanitizer] = None,
+    options: Optional[Mapping[str, object]] = None, feedback: str = "",
+) -> str:
+    """Runs the chain for one section and returns the cleaned LaTeX fragment."""
+    with profiling.span("pipeline.section", section=section, retry=bool(feedback)):
+        response = chain.invoke(_section_inputs(job_description, section, options, feedback))
+        return _clean_fragment(response, sanitizer)
+
+
+def _retry_feedback(problems: List[str]) -> str:
+    return (
+        "Your previous answer for this section was rejected as invalid LaTeX: "
+        + "; ".join(problems) + ". Return a corrected fragment."
+    )
+
+
+def _generate_valid_section(
+    chain, job_description: str, section: str, sanitizer: LatexSanitizer, validator: LatexValidator,
+    options: Optional[Mapping[str, object]] = None, previous: Optional[str] = None,
+) -> Tuple[str, int, List[str]]:
+    """
+    Generates a section (or starts from a previous attempt) and regenerates it,
+    with the validator's findings added to the prompt, while it fails validation
+    and settings.SECTION_MAX_RETRIES allows. Returns the fragment, the number of
+    retries and the problems still left.
+    """
+    content = previous if previous is not None else _generate_section(
+        chain, job_description, section, sanitizer, options
+    )
+    with profiling.span("pipeline.validate", section=section):
+        problems = validator(content)
+    retries = 0
+    while problems and retries < settings.SECTION_MAX_RETRIES:
+        retries += 1
+        logger.info("Retrying section %s (%s)...", section, "; ".join(problems))
+        content = _generate_section(chain, job_description, section, sanitizer, options, _retry_feedback(problems))
+        with profiling.span("pipeline.validate", section=section):
+            problems = validator(content)
+    return content, retries, problems
+
+
+class ValidationStats:
+    """
+    Counters of section validation outcomes: sections checked, sections that
+    needed at least one retry, retries made, and sections still invalid after
+    their retries. One instance counts for the whole process (see
+    get_validation_stats); callers can pass their own to count a single run.
     """
-    # 1. Convert **text** to \textbf{text}
-    text = re.sub(r'\*\*(.*?)\*\*', r'\\textbf{\1}', text)
 
-    # 2. Fix misclosed bold: \textbf{text** -> \textbf{text}
-    text = re.sub(r'\\textbf\{(.*?)\*\*', r'\\textbf{\1}', text)
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {"sections": 0, "retried": 0, "retries": 0, "failed": 0}
 
-    # 3. Convert _text_ (markdown italic) to \textit{text}
-    #    Only match single underscores not preceded/followed by word chars (avoid __dunder__)
-    text = re.sub(r'(?<!\w)_(.*?)_(?!\w)', r'\\textit{\1}', text)
+    def record(self, retries: int, failed: bool) -> None:
+        with self._lock:
+            self._counts["sections"] += 1
+            self._counts["retried"] += retries > 0
+            self._counts["retries"] += retries
+            self._counts["failed"] += failed
 
-    # 4. Escape lone % signs that follow a number (e.g. "30%" -> "30\%")
-    text = re.sub(r'(?<!\\)(\d+)%', r'\1\\%', text)
+    def add(self, counts: Mapping[str, int]) -> None:
+        """Adds counts reported elsewhere (e.g. by the serve daemon for one request)."""
+        with self._lock:
+            for key in self._counts:
+                self._counts[key] += counts.get(key, 0)
 
-    # 5. Escape unescaped & signs (not already \&)
-    text = re.sub(r'(?<!\\)&', r'\\&', text)
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
 
-    # 6. Escape unescaped $ signs (not already \$ and not part of LaTeX math)
-    text = re.sub(r'(?<!\\)\$(?![^$]*\\)', r'\\$', text)
 
-    # 7. Remove stray markdown headers (# Header) that the LLM sometimes outputs
-    text = re.sub(r'^#{1,3}\s+.*$', '', text, flags=re.MULTILINE)
+_validation_stats = ValidationStats()
+
+
+def get_validation_stats() -> ValidationStats:
+    return _validation_stats
 
-    # 8. Remove hallucinated backslashes before capitalized words that aren't LaTeX commands
-    #    Matches \Word where Word is not a known LaTeX command
-    known_commands = (
-        r'textbf|textit|textsc|emph|underline|href|hfill|vspace|hspace|begin|end|'
-        r'item|itemsep|section|subsection|header|lineunder|contact|employer|school|'
-        r'area|bull|cdot|input|pdfgentounicode|documentclass|usepackage|pagestyle|'
-        r'raggedright|newcommand|newenvironment|def|renewcommand|tabular|topsep'
-    )
-    text = re.sub(rf'\\(?!(?:{known_commands})\b)([A-Z][a-zA-Z]*)', r'\1', text)
 
-    return text
+def _clean_fragment(response: str, sanitizer: Optional[LatexSanitizer] = None) -> str:
+    """
+    Strips markdown fences and sanitizes one generated LaTeX fragment, line by line
+    through StreamingSanitizer, so buffered and streamed output are identical.
+    """
+    with profiling.span("pipeline.sanitize", chars=len(response)):
+        cleaner = StreamingSanitizer(sanitizer)
+        return cleaner.feed(response) + cleaner.flush()
+
+
+def _generate_sections_combined(
+    chain, job_description: str, sections: List[str], sanitizer: Optional[LatexSanitizer] = None,
+    options: Optional[Mapping[str, Mapping[str, object]]] = None,
+) -> Dict[str, str]:
+    """
+    Generates all sections with one call of a multi-section chain and splits the
+    response. Sections missing from the response are left out of the result.
+    """
+    logger.info("Generating sections in one call: %s...", ", ".join(sections))
+    with profiling.span("pipeline.section", section="+".join(sections)):
+        inputs = {"job_description": job_description, "section_names": sections}
+        if options:
+            inputs["section_options"] = options
+        response = chain.invoke(inputs)
+    return {
+        section: _clean_fragment(text, sanitizer)
+        for section, text in split_sections(response, sections).items()
+    }
+
+
+def tailor_resume_section(
+    job_description: str, template_content, chain=None, candidate: str = "",
+    validation: Optional[ValidationStats] = None,
+) -> str:
+    """
+    Fills every placeholder (%% SECTION %%, see parse_template) in the template,
+    given as text or as an already parsed template.
+    Sections are generated concurrently (up to settings.SECTION_CONCURRENCY at a
+    time) and substituted in placeholder order once all of them have finished.
+    With settings.MULTI_SECTION_GENERATION all sections come from a single LLM
+    call instead; any section the model leaves out is generated on its own.
+    Pass a prebuilt chain (see build_tailor_chain) to reuse it across calls
+    (e.g. when tailoring many JDs); otherwise chains are built over the
+    candidate's index.
+
+    Every fragment is checked by a structural LaTeX validator; only the sections
+    that fail are regenerated (see _generate_valid_section). A section still
+    invalid after its retries is kept, preceded by a warning comment. Outcomes
+    are counted in get_validation_stats() and, if given, in validation.
+    """
+    counters = [_validation_stats] + ([validation] if validation is not None else [])
+    template = template_content if isinstance(template_content, ParsedTemplate) else parse_template(template_content)
+    sections = template.sections
+    options = template.section_options()
+    multi_section = settings.MULTI_SECTION_GENERATION
+
+    # Commands the template defines itself are legitimate in generated fragments
+    sanitizer = get_sanitizer(template.commands)
+    validator = get_validator(template.used_commands)
+
+    combined: Dict[str, str] = {}
+    results: Dict[str, str] = {}
+    errors: Dict[str, Exception] = {}
+    if multi_section and sections:
+        try:
+            combined = _generate_sections_combined(
+                chain or build_multi_section_chain(candidate), job_description, sections, sanitizer, options
+            )
+        except Exception as e:
+            logger.error("Error generating sections in one call: %s", e)
+        chain = None  # the per-section fallback below needs the per-section chain
+    elif chain is None:
+        chain = build_rag_chain(candidate)
+
+    # Sections from the single call are kept unless they fail validation
+    for section, content in combined.items():
+        if not validator(content):
+            results[section] = content
+            for counter in counters:
+                counter.record(0, failed=False)
+
+    remaining = [s for s in sections if s not in results]
+    if remaining:
+        if chain is None:
+            chain = build_rag_chain(candidate)
+        max_workers = max(1, min(settings.SECTION_CONCURRENCY, len(remaining)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+            for section in remaining:
+                if section not in combined:
+                    logger.info("Generating section: %s...", section)
+                futures[section] = executor.submit(
+                    _generate_valid_section, chain, job_description, section, sanitizer, validator,
+                    options.get(section), combined.get(section),
+                )
+
+            for section in remaining:
+                try:
+                    content, retries, problems = futures[section].result()
+                except Exception as e:
+                    logger.error("Error generating section %s: %s", section, e)
+                    errors[section] = e
+                    continue
+                for counter in counters:
+                    counter.record(retries, failed=bool(problems))
+                if problems:
+                    logger.warning("Section %s failed LaTeX validation: %s", section, "; ".join(problems))
+                    content = f"% Warning: {section} failed LaTeX validation: {'; '.join(problems)}\n{content}"
+                results[section] = content
+
+    for section, error in errors.items():
+        results[section] = f"% Error generating {section}: {error}"
+    return template.render(results).strip()
+
+
+@dataclass
+class SectionStreamStats:
+    """Latency metrics for one streamed section (tokens are counted as stream chunks)."""
+    section: str
+    time_to_first_token: Optional[float] = None
+    tokens: int = 0
+    elapsed: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def tokens_per_second(self) -> float:
+        if self.time_to_first_token is None:
+            return 0.0
+        generation_time = self.elapsed - self.time_to_first_token
+        return self.tokens / generation_time if generation_time > 0 else 0.0
+
+
+_FENCE_LINE = re.compile(r"^```(latex)?\s*$", re.IGNORECASE)
+
+
+class StreamingSanitizer:
+    """
+    Cleans generated LaTeX line by line, as tokens stream in or (via
+    _clean_fragment) all at once: markdown fence lines (```, ```latex, with any
+    trailing whitespace) are dropped, each completed line goes through
+    sanitize_latex, and line breaks are only written once a following non-blank
+    line arrives, so the output is a stripped fragment. The unescaped-$ lookahead
+    therefore only sees the current line, in both paths.
+    """
+
+    def __init__(self, sanitizer: Optional[LatexSanitizer] = None):
+        self._sanitizer = sanitizer or get_sanitizer()
+        self._buffer = ""
+        self._separator = ""
+        self._started = False
+
+    def _emit_line(self, line: str) -> str:
+        if _FENCE_LINE.match(line):
+            return ""
+        if not line.strip():
+            if self._started:
+                self._separator += line + "\n"
+            return ""
+
+        # Trailing whitespace is deferred too, in case this turns out to be the last line
+        sanitized = self._sanitizer(line if self._started else line.lstrip())
+        content = sanitized.rstrip()
+        out = self._separator + content
+        self._separator = sanitized[len(content):] + "\n"
+        self._started = True
+        return out
+
+    def feed(self, chunk: str) -> str:
+        """Adds streamed text and returns whatever complete lines are ready to write."""
+        self._buffer += chunk
+        out = []
+        while "\n" in self._buffer:
+            line, self._buffer = self._buffer.split("\n", 1)
+            out.append(self._emit_line(line))
+        return "".join(out)
+
+    def flush(self) -> str:
+        """Returns the final partial line, dropping trailing whitespace."""
+        line, self._buffer = self._buffer.rstrip(), ""
+        return self._emit_line(line) if line else ""
+
+
+def stream_tailored_resume(
+    job_description: str,
+    template_content: str,
+    write: Callable[[str], None],
+    chain=None,
+    candidate: str = "",
+) -> List[SectionStreamStats]:
+    """
+    Streaming counterpart of tailor_resume_section: writes the template and each
+    generated section through `write` as tokens arrive, in template order, and
+    returns time-to-first-token and tokens/sec for every section.
+    """
+    if chain is None:
+        chain = build_rag_chain(candidate)
+
+    template = parse_template(template_content.strip())
+    options = template.section_options()
+    sanitizer = get_sanitizer(template.commands)
+    generated: Dict[str, str] = {}
+    stats: List[SectionStreamStats] = []
+
+    for segment, placeholder in zip(template.segments, template.placeholders):
+        write(segment)
+        section = placeholder.name
+
+        # A placeholder repeated in the template reuses the first generation
+        if section in generated:
+            write(generated[section])
+            continue
+
+        section_stats = SectionStreamStats(section=section)
+        stream_sanitizer = StreamingSanitizer(sanitizer)
+        parts = []
+        start = time.perf_counter()
+        try:
+            for chunk in chain.stream(_section_inputs(job_description, section, options.get(section))):
+                if not chunk:
+                    continue
+                if section_stats.time_to_first_token is None:
+                    section_stats.time_to_first_token = time.perf_counter() - start
+                section_stats.tokens += 1
+                text = stream_sanitizer.feed(chunk)
+                if text:
+                    parts.append(text)
+                    write(text)
+            text = stream_sanitizer.flush()
+        except Exception as e:
+            section_stats.error = str(e)
+            text = ("\n" if parts else "") + f"% Error generating {section}: {e}"
+        if text:
+            parts.append(text)
+            write(text)
+
+        end = time.perf_counter()
+        section_stats.elapsed = end - start
+        profiling.record("pipeline.section", start, end, section=section, streamed=True)
+        generated[section] = "".join(parts)
+        stats.append(section_stats)
+
+    write(template.segments[-1])
+    return stats
+
+
+def sanitize_latex(text: str, sanitizer: Optional[LatexSanitizer] = None) -> str:
+    """
+    Cleans up common LLM output artifacts that break LaTeX compilation.
+    Uses the default compiled sanitizer unless one (e.g. aware of the template's
+    own \\newcommands) is given.
+    """
+    return (sanitizer or get_sanitizer())(text)
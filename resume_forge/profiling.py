@@ -0,0 +1,153 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# Spans are only recorded after enable(); until then span() hands back a shared
+# no-op object, so instrumented code pays one global lookup and a method call.
+_enabled = False
+_events: List[Dict[str, Any]] = []
+_events_lock = threading.Lock()
+_origin = time.perf_counter()
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+    def set(self, **args: Any) -> None:
+        return None
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name: str, args: Dict[str, Any]):
+        self.name = name
+        self.args = args
+        self.start = 0.0
+
+    def __enter__(self) -> "_Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        record(self.name, self.start, time.perf_counter(), **self.args)
+
+    def set(self, **args: Any) -> None:
+        """Attaches extra arguments (e.g. counts known only at the end) to the span."""
+        self.args.update(args)
+
+
+def enable() -> None:
+    """Starts recording spans for this process."""
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset() -> None:
+    """Drops all recorded spans."""
+    with _events_lock:
+        _events.clear()
+
+
+def span(name: str, **args: Any):
+    """
+    Context manager timing the enclosed block as a span named `name`.
+    Does nothing (and records nothing) unless profiling is enabled.
+    """
+    if not _enabled:
+        return _NOOP_SPAN
+    return _Span(name, args)
+
+
+def record(name: str, start: float, end: float, **args: Any) -> None:
+    """Records a span from time.perf_counter() timestamps, e.g. one measured before enable()."""
+    if not _enabled:
+        return
+    event = {
+        "name": name,
+        "start": start - _origin,
+        "duration": end - start,
+        "thread": threading.get_ident(),
+        "args": args,
+    }
+    with _events_lock:
+        _events.append(event)
+
+
+def events() -> List[Dict[str, Any]]:
+    """Returns a copy of the recorded spans, in start order."""
+    with _events_lock:
+        return sorted(_events, key=lambda event: event["start"])
+
+
+def summary() -> List[Dict[str, Any]]:
+    """Aggregates spans by name (calls, total/mean/max seconds), in order of first occurrence."""
+    stages: Dict[str, Dict[str, Any]] = {}
+    for event in events():
+        stage = stages.setdefault(
+            event["name"], {"name": event["name"], "calls": 0, "total": 0.0, "max": 0.0}
+        )
+        stage["calls"] += 1
+        stage["total"] += event["duration"]
+        stage["max"] = max(stage["max"], event["duration"])
+    for stage in stages.values():
+        stage["mean"] = stage["total"] / stage["calls"]
+    return list(stages.values())
+
+
+def write_trace(path: str, metadata: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Writes the spans as a Chrome trace (open in chrome://tracing or Perfetto).
+    The per-stage summary and any metadata go under "otherData", so traces from
+    many runs can be aggregated without re-deriving it.
+    """
+    pid = os.getpid()
+    thread_ids: Dict[int, int] = {}
+    trace_events = []
+    for event in events():
+        # Small, stable lane numbers read better than raw thread idents
+        tid = thread_ids.setdefault(event["thread"], len(thread_ids))
+        trace_events.append({
+            "name": event["name"],
+            "cat": event["name"].split(".", 1)[0],
+            "ph": "X",
+            "ts": round(event["start"] * 1e6, 1),
+            "dur": round(event["duration"] * 1e6, 1),
+            "pid": pid,
+            "tid": tid,
+            "args": event["args"],
+        })
+
+    trace = {
+        "traceEvents": trace_events,
+        "displayTimeUnit": "ms",
+        "otherData": {
+            **(metadata or {}),
+            "summary": summary(),
+        },
+    }
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(trace, f, indent=1, default=str)
@@ -41,6 +41,14 @@ def load_prompts() -> dict:
     return _cached_prompts
 
 
+def get_prompts_hash() -> str:
+    """Returns the hash of the currently loaded prompts file ("" when using fallback prompts)."""
+    load_prompts()
+    if not os.path.exists(settings.PROMPTS_FILE):
+        return ""
+    return _cached_prompts_hash or ""
+
+
 def get_system_prompt() -> str:
     return load_prompts().get("system_prompt", "")
 
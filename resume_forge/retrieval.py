@@ -0,0 +1,92 @@
+import hashlib
+import os
+import threading
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+
+from langchain_core.documents import Document
+
+from resume_forge import profiling
+from resume_forge.config import settings
+from resume_forge.vectorstore import get_retriever, index_generation, persist_dir
+
+# Vault file-name prefixes that each section prefers when re-ranking
+SECTION_SOURCE_PREFIXES = {
+    "EXPERIENCE": ("role_",),
+    "PROJECTS": ("project_",),
+}
+
+_retrieval_cache: Dict[Tuple, "Future[List[Document]]"] = {}
+_retrieval_lock = threading.Lock()
+
+
+def _cache_key(job_description: str, candidate: str) -> Tuple:
+    jd_hash = hashlib.sha256(job_description.encode("utf-8")).hexdigest()
+    return (
+        persist_dir(candidate),
+        settings.COLLECTION_NAME,
+        settings.RETRIEVAL_MODE,
+        settings.RETRIEVAL_FETCH_K,
+        index_generation(candidate),
+        jd_hash,
+    )
+
+
+def retrieve_for_jd(job_description: str, retriever=None, candidate: str = "") -> List[Document]:
+    """
+    Searches the candidate's index once for the job description (see get_retriever;
+    a given retriever must search that index), returning the
+    top settings.RETRIEVAL_FETCH_K chunks. Results are memoized per JD (dropped when
+    this process re-ingests the vault, and limited to the most recently used
+    settings.RETRIEVAL_CACHE_MAX_ENTRIES so a long-running daemon stays bounded);
+    concurrent callers for the same JD share a single search.
+    """
+    key = _cache_key(job_description, candidate)
+    with _retrieval_lock:
+        future = _retrieval_cache.pop(key, None)
+        owner = future is None
+        if owner:
+            future = Future()
+        # Re-inserting keeps the dict in least- to most-recently-used order
+        _retrieval_cache[key] = future
+        while len(_retrieval_cache) > max(1, settings.RETRIEVAL_CACHE_MAX_ENTRIES):
+            del _retrieval_cache[next(iter(_retrieval_cache))]
+
+    if owner:
+        try:
+            with profiling.span("retrieval.search", mode=settings.RETRIEVAL_MODE):
+                if retriever is None:
+                    retriever = get_retriever(k=settings.RETRIEVAL_FETCH_K, candidate=candidate)
+                future.set_result(retriever.invoke(job_description))
+        except BaseException as e:
+            # Don't memoize failures; the next caller retries the search
+            with _retrieval_lock:
+                if _retrieval_cache.get(key) is future:
+                    del _retrieval_cache[key]
+            future.set_exception(e)
+
+    return future.result()
+
+
+def select_for_section(docs: List[Document], section_name: str, k: Optional[int] = None) -> List[Document]:
+    """
+    Cheap section-specific re-ranking of the shared JD results: chunks from vault
+    files matching the section (role_* for EXPERIENCE, project_* for PROJECTS) are
+    moved ahead of the rest, preserving similarity order within each group.
+    """
+    k = k or settings.TOP_K
+    prefixes = SECTION_SOURCE_PREFIXES.get(section_name)
+    if not prefixes:
+        return docs[:k]
+
+    preferred, others = [], []
+    for doc in docs:
+        source = os.path.basename(doc.metadata.get("source", ""))
+        (preferred if source.startswith(prefixes) else others).append(doc)
+    return (preferred + others)[:k]
+
+
+def clear_retrieval_cache() -> None:
+    """Drops all memoized retrieval results."""
+    with _retrieval_lock:
+        _retrieval_cache.clear()
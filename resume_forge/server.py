@@ -0,0 +1,362 @@
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+from resume_forge import vectorstore
+from resume_forge.client import daemon_config
+from resume_forge.config import settings
+from resume_forge.template_engine import TemplateError
+
+logger = logging.getLogger(__name__)
+
+
+class BusyError(Exception):
+    """Raised when the worker pool and its queue are full."""
+
+
+class LLMUnavailableError(Exception):
+    """Raised when the LLM endpoint fails its health check."""
+
+
+class _ReadWriteLock:
+    """Many concurrent tailors (readers) or one ingest (writer); waiting writers go first."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    def acquire_read(self) -> None:
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+
+    def release_read(self) -> None:
+        with self._cond:
+            self._readers -= 1
+            if not self._readers:
+                self._cond.notify_all()
+
+    def acquire_write(self) -> None:
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+
+    def release_write(self) -> None:
+        with self._cond:
+            self._writer = False
+            self._cond.notify_all()
+
+
+class ForgeService:
+    """
+    Keeps the embedding model, index clients and tailor chains warm in one process.
+
+    Each candidate (see vectorstore.persist_dir) has its own index, lock and
+    chain; the chains of the STORE_CACHE_MAX_ENTRIES most recently used candidates
+    are kept, and all of them share one embedding model. Tailors share an index
+    and run concurrently. A full ingest waits for the candidate's running tailors
+    and blocks new ones until its index has been rebuilt; an incremental one
+    prepares its changes (hashing, splitting, embedding) while tailors keep
+    running and only locks them out to apply the changes. Tailors for other
+    candidates are never blocked. A chain is rebuilt when its index or
+    prompts.yaml changes, including when another process rewrote the index
+    (detected through the ingest manifest's modification time).
+    Work runs on a bounded pool: at most `workers` requests execute at once and at
+    most `max_queue` more wait, beyond which BusyError is raised.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.started_at = time.time()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="forge-worker")
+        self._pending = 0
+        self._active = 0
+        self._counter_lock = threading.Lock()
+        self._index_locks: Dict[str, _ReadWriteLock] = {}  # per candidate
+        self._index_locks_lock = threading.Lock()
+        self._ingest_lock = threading.Lock()  # one ingest at a time
+        self._chains: Dict[str, Tuple[Tuple, object]] = {}  # candidate -> (key, chain), least recently used first
+        self._chain_lock = threading.Lock()
+        self._manifest_mtimes: Dict[str, Optional[float]] = {"": self._read_manifest_mtime("")}
+
+    def warm_up(self) -> None:
+        """Imports the pipeline and loads the models and index so the first request is fast."""
+        from resume_forge.embeddings import get_embeddings
+        from resume_forge.pipeline import build_tailor_chain  # noqa: F401 (heavy import)
+
+        if settings.RETRIEVAL_MODE != "lexical":
+            embeddings = get_embeddings()
+            # The cache wrapper loads the model lazily; force it now
+            getattr(embeddings, "embedder", embeddings)
+        try:
+            self._get_chain()
+        except FileNotFoundError:
+            logger.info("No index found yet; run `resume-forge ingest` to build it")
+
+    def status(self) -> dict:
+        from resume_forge.pipeline import get_validation_stats
+
+        with self._counter_lock:
+            active, queued = self._active, self._pending - self._active
+        return {
+            "status": "ok",
+            "pid": os.getpid(),
+            "started_at": self.started_at,
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "active": active,
+            "queued": queued,
+            "config": daemon_config(),
+            "validation": get_validation_stats().stats(),
+            "stores": vectorstore.store_cache_stats(),
+        }
+
+    def submit(self, fn: Callable, *args):
+        """Runs fn on the worker pool and waits for its result (BusyError when full)."""
+        with self._counter_lock:
+            if self._pending >= self.workers + self.max_queue:
+                raise BusyError(f"{self._pending} requests in progress or queued")
+            self._pending += 1
+
+        def run():
+            with self._counter_lock:
+                self._active += 1
+            try:
+                return fn(*args)
+            finally:
+                with self._counter_lock:
+                    self._active -= 1
+                    self._pending -= 1
+
+        return self._executor.submit(run).result()
+
+    def tailor(self, job_description: str, template_content: str, candidate: str = "", validation=None) -> str:
+        from resume_forge.llm import check_llm_status
+        from resume_forge.pipeline import tailor_resume_section
+
+        if not check_llm_status():
+            raise LLMUnavailableError("LLM endpoint is not reachable or no models are loaded.")
+        self._refresh_if_index_changed(candidate)
+        index_lock = self._index_lock(candidate)
+        index_lock.acquire_read()
+        try:
+            return tailor_resume_section(
+                job_description, template_content, chain=self._get_chain(candidate), candidate=candidate,
+                validation=validation,
+            )
+        finally:
+            index_lock.release_read()
+
+    def ingest(
+        self, vault_dir: str, incremental: bool, changed_paths: Optional[List[str]] = None, candidate: str = ""
+    ) -> dict:
+        from resume_forge.embeddings import embedding_cache_stats
+
+        with self._ingest_lock:
+            plan = vectorstore.plan_sync(vault_dir, changed_paths, candidate) if incremental else None
+            index_lock = self._index_lock(candidate)
+            index_lock.acquire_write()
+            try:
+                if plan is not None:
+                    stats = vectorstore.apply_sync(vault_dir, plan, candidate)
+                    result = {
+                        "added": stats.added, "removed": stats.removed,
+                        "unchanged": stats.unchanged, "total": stats.total,
+                    }
+                else:
+                    result = {"chunks": vectorstore.ingest_vault(vault_dir, candidate)}
+                self._manifest_mtimes[candidate] = self._read_manifest_mtime(candidate)
+            finally:
+                index_lock.release_write()
+
+        cache_stats = embedding_cache_stats()
+        if cache_stats is not None:
+            result["embedding_cache"] = cache_stats
+        return result
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def _index_lock(self, candidate: str) -> _ReadWriteLock:
+        with self._index_locks_lock:
+            return self._index_locks.setdefault(candidate, _ReadWriteLock())
+
+    def _get_chain(self, candidate: str = ""):
+        from resume_forge.pipeline import build_tailor_chain
+        from resume_forge.prompts import get_prompts_hash
+
+        key = (vectorstore.index_generation(candidate), settings.MULTI_SECTION_GENERATION, get_prompts_hash())
+        with self._chain_lock:
+            entry = self._chains.pop(candidate, None)
+            if entry is None or entry[0] != key:
+                entry = (key, build_tailor_chain(candidate))
+            # Re-inserting keeps the dict in least- to most-recently-used order
+            self._chains[candidate] = entry
+            while len(self._chains) > max(1, settings.STORE_CACHE_MAX_ENTRIES):
+                del self._chains[next(iter(self._chains))]
+            return entry[1]
+
+    @staticmethod
+    def _read_manifest_mtime(candidate: str = "") -> Optional[float]:
+        try:
+            return os.stat(vectorstore._manifest_path(candidate)).st_mtime
+        except OSError:
+            return None
+
+    def _refresh_if_index_changed(self, candidate: str = "") -> None:
+        mtime = self._read_manifest_mtime(candidate)
+        if candidate not in self._manifest_mtimes:
+            # First request for this candidate: its index is opened fresh anyway
+            self._manifest_mtimes[candidate] = mtime
+            return
+        if mtime == self._manifest_mtimes[candidate]:
+            return
+        index_lock = self._index_lock(candidate)
+        index_lock.acquire_write()
+        try:
+            if mtime != self._manifest_mtimes[candidate]:
+                logger.info("Index of candidate %r changed on disk; reopening it", candidate or "default")
+                vectorstore._invalidate_vectorstore(candidate)
+                self._manifest_mtimes[candidate] = mtime
+        finally:
+            index_lock.release_write()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "ForgeServer"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _send(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _reject(self, status: int, error: str) -> None:
+        self.close_connection = True  # any request body is left unread
+        self._send(status, {"error": error})
+
+    def _cross_site(self) -> bool:
+        """
+        Answers 403 for requests a web page could have sent: a browser always sets
+        Origin on cross-site fetches, and a DNS-rebinding page's Host names its own
+        domain rather than the address the daemon is bound to.
+        """
+        if self.headers.get("Host", "").lower() not in self.server.allowed_hosts:
+            self._reject(403, "Host header does not match the daemon's address")
+            return True
+        if "Origin" in self.headers:
+            self._reject(403, "Cross-origin requests are not allowed")
+            return True
+        return False
+
+    def do_GET(self):
+        if self._cross_site():
+            return
+        if self.path == "/health":
+            self._send(200, self.server.service.status())
+        else:
+            self._send(404, {"error": f"Unknown path: {self.path}"})
+
+    def do_POST(self):
+        if self._cross_site():
+            return
+        # Only non-"simple" content types: a browser cannot send them cross-site without a preflight
+        content_type = self.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        if content_type != "application/json":
+            self._reject(415, "Content-Type must be application/json")
+            return
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        except ValueError as e:
+            self._send(400, {"error": f"Invalid JSON body: {e}"})
+            return
+
+        service = self.server.service
+        candidate = payload.get("candidate") or ""
+        try:
+            vectorstore.persist_dir(candidate)  # validates the name
+        except ValueError as e:
+            self._send(400, {"error": str(e)})
+            return
+
+        start = time.perf_counter()
+        try:
+            if self.path == "/tailor":
+                job_description = payload.get("job_description", "")
+                template = payload.get("template", "")
+                if not job_description.strip() or not template:
+                    self._send(400, {"error": "job_description and template are required"})
+                    return
+                from resume_forge.pipeline import ValidationStats
+
+                # This request's own outcomes; the /health counters mix in every other client's
+                validation = ValidationStats()
+                output = service.submit(service.tailor, job_description, template, candidate, validation)
+                result = {"output": output, "validation": validation.stats()}
+            elif self.path == "/ingest":
+                vault_dir = payload.get("vault_dir", "")
+                if not os.path.isdir(vault_dir):
+                    self._send(400, {"error": f"Vault directory not found: {vault_dir}"})
+                    return
+                result = service.submit(
+                    service.ingest, vault_dir, bool(payload.get("incremental")), payload.get("changed_paths"),
+                    candidate,
+                )
+            else:
+                self._send(404, {"error": f"Unknown path: {self.path}"})
+                return
+        except BusyError as e:
+            self._send(503, {"error": f"Server busy: {e}"})
+            return
+        except LLMUnavailableError as e:
+            self._send(502, {"error": str(e)})
+            return
+        except TemplateError as e:
+            self._send(400, {"error": str(e)})
+            return
+        except Exception as e:
+            logger.exception("Request to %s failed", self.path)
+            self._send(500, {"error": str(e)})
+            return
+
+        result["elapsed"] = time.perf_counter() - start
+        self._send(200, result)
+
+
+_LOOPBACK_NAMES = {"127.0.0.1", "localhost"}
+
+
+class ForgeServer(ThreadingHTTPServer):
+    """
+    Local HTTP API over a ForgeService. Connections get their own thread (so
+    /health answers even when busy), while tailor and ingest work is bounded by
+    the service's worker pool.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host: str, port: int, service: ForgeService):
+        super().__init__((host, port), _Handler)
+        self.service = service
+        bound_port = self.server_address[1]
+        names = {host} | (_LOOPBACK_NAMES if host in _LOOPBACK_NAMES else set())
+        # Host headers a local client may send; anything else is refused
+        self.allowed_hosts = {f"{name}:{bound_port}".lower() for name in names}
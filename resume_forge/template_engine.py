@@ -0,0 +1,112 @@
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Mapping, Tuple
+
+from resume_forge.latex import commands_from_template, commands_used_in
+
+# %% NAME %% or %% NAME key=value ... %%, on one line. Names are upper case and
+# the delimiters exactly two %, so comment rules (%%%% TITLE %%%%) and prose in
+# comments are never mistaken for a placeholder.
+_PLACEHOLDER = re.compile(
+    r"(?<!%)%%[ \t]+(?P<name>[A-Z][A-Z0-9_]*)(?P<options>(?:[ \t]+[a-z_]+=[^\s%]+)*)[ \t]+%%(?!%)"
+)
+_OPTION = re.compile(r"([a-z_]+)=([^\s%]+)")
+
+# Options a placeholder may carry, with their parsers
+PLACEHOLDER_OPTIONS = {
+    "max_items": int,  # upper bound on bullet points / rows the model should produce
+    "max_tokens": int,  # generation budget for the section (overrides SECTION_TOKEN_BUDGETS)
+    "stop_after": str,  # environment whose closing completes the section, e.g. tabular
+}
+
+
+class TemplateError(ValueError):
+    """Raised when a template placeholder carries an unknown or invalid option."""
+
+
+@dataclass(frozen=True)
+class Placeholder:
+    name: str
+    options: Mapping[str, object] = field(default_factory=dict)
+
+
+def describe_options(options: Mapping[str, object]) -> str:
+    """Renders placeholder options as an instruction for the prompt ("" when none apply)."""
+    max_items = options.get("max_items")
+    return f"at most {max_items} items" if max_items else ""
+
+
+@dataclass(frozen=True)
+class ParsedTemplate:
+    """
+    A template split into literal segments around its placeholders:
+    segments[0], placeholders[0], segments[1], ..., segments[-1]. A section that
+    appears more than once is generated once; the options of its first
+    occurrence apply.
+    """
+    segments: Tuple[str, ...]
+    placeholders: Tuple[Placeholder, ...]
+    commands: FrozenSet[str]  # commands the template defines (kept by the sanitizer)
+    used_commands: FrozenSet[str]  # every command the template mentions (allowed by the validator)
+
+    @property
+    def sections(self) -> List[str]:
+        """Distinct placeholder names, in template order."""
+        return list(dict.fromkeys(placeholder.name for placeholder in self.placeholders))
+
+    def section_options(self) -> Dict[str, Mapping[str, object]]:
+        """Options of each section's first placeholder, for sections that have any."""
+        options: Dict[str, Mapping[str, object]] = {}
+        for placeholder in self.placeholders:
+            options.setdefault(placeholder.name, placeholder.options)
+        return {name: value for name, value in options.items() if value}
+
+    def render(self, contents: Mapping[str, str]) -> str:
+        """Fills every placeholder from contents, assembling the output in one join."""
+        parts = [self.segments[0]]
+        for placeholder, segment in zip(self.placeholders, self.segments[1:]):
+            parts.append(contents[placeholder.name])
+            parts.append(segment)
+        return "".join(parts)
+
+
+def _parse_options(name: str, text: str) -> Dict[str, object]:
+    options = {}
+    for key, value in _OPTION.findall(text):
+        if key not in PLACEHOLDER_OPTIONS:
+            known = ", ".join(sorted(PLACEHOLDER_OPTIONS))
+            raise TemplateError(f"Unknown option {key!r} on placeholder {name} (known: {known})")
+        try:
+            options[key] = PLACEHOLDER_OPTIONS[key](value)
+        except ValueError:
+            raise TemplateError(f"Invalid value {value!r} for {key} on placeholder {name}") from None
+    for key in ("max_items", "max_tokens"):
+        if options.get(key, 1) < 1:
+            raise TemplateError(f"{key} on placeholder {name} must be at least 1")
+    return options
+
+
+@lru_cache(maxsize=64)
+def parse_template(content: str) -> ParsedTemplate:
+    """
+    Parses a template into segments and `%% NAME %%` placeholders (any upper-case
+    name, optionally with options such as `%% EXPERIENCE max_items=3 %%`). The
+    parsed form is cached by content, so tailoring the same template for many
+    job descriptions scans it once.
+    """
+    segments, placeholders = [], []
+    position = 0
+    for match in _PLACEHOLDER.finditer(content):
+        name = match.group("name")
+        segments.append(content[position:match.start()])
+        placeholders.append(Placeholder(name, _parse_options(name, match.group("options"))))
+        position = match.end()
+    segments.append(content[position:])
+    return ParsedTemplate(
+        segments=tuple(segments),
+        placeholders=tuple(placeholders),
+        commands=frozenset(commands_from_template(content)),
+        used_commands=frozenset(commands_used_in(content)),
+    )
+
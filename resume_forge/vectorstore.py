@@ -1,67 +1,559 @@
+import hashlib
+import json
 import os
+import re
 import shutil
-from typing import List
-from langchain_community.vectorstores import Chroma
-from langchain_community.document_loaders import DirectoryLoader, UnstructuredMarkdownLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_core.vectorstores import VectorStoreRetriever
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.vectorstores import VectorStore
 from langchain_core.documents import Document
 
+from resume_forge import profiling
+from resume_forge.bm25 import BM25Index, BM25Retriever, HybridRetriever
 from resume_forge.config import settings
-from resume_forge.embeddings import get_embeddings, clear_embeddings_cache
+from resume_forge.embeddings import get_embeddings
+from resume_forge.markdown_loader import list_markdown_files, load_markdown_chunks, load_vault_chunks
 
-def ingest_vault(vault_path: str) -> int:
+MANIFEST_FILENAME = "ingest_manifest.json"
+MANIFEST_VERSION = 2  # 2: header-aware chunking (chunk text and ids changed)
+CANDIDATES_DIRNAME = "candidates"  # Named candidate indexes live under CHROMA_PERSIST_DIR/candidates/<name>
+
+_CANDIDATE_NAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]{0,62}$")
+
+# Open clients per index, least recently used first (see _cached_client)
+_store_clients: Dict[Tuple, VectorStore] = {}
+_lexical_indexes: Dict[Tuple, BM25Index] = {}
+_store_cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+# Queries and updates using each open store (by id), and dropped stores whose close waits for them
+_store_borrowers: Dict[int, int] = {}
+_retired_stores: Dict[int, VectorStore] = {}
+_index_generation = 0
+_index_generations: Dict[str, int] = {}  # persist dir -> _index_generation when it last changed
+_all_invalidated_at = 0
+_vectorstore_lock = threading.RLock()
+
+
+@dataclass
+class IngestStats:
+    """Chunk counts reported by an incremental ingest."""
+    added: int = 0
+    removed: int = 0
+    unchanged: int = 0
+
+    @property
+    def total(self) -> int:
+        """Number of chunks in the collection after the ingest."""
+        return self.added + self.unchanged
+
+
+def _chunk_ids(chunks: List[Document]) -> List[str]:
+    """
+    Derives a stable ID for each chunk from its source path and content.
+    Identical chunks within one file are disambiguated by occurrence, so an edit
+    only changes the IDs of the chunks whose text actually changed.
+    """
+    seen: Dict[str, int] = {}
+    ids = []
+    for chunk in chunks:
+        source = chunk.metadata.get("source", "")
+        digest = hashlib.sha256(
+            f"{source}\0{chunk.page_content}".encode("utf-8")
+        ).hexdigest()[:32]
+        occurrence = seen.get(digest, 0)
+        seen[digest] = occurrence + 1
+        ids.append(f"{digest}-{occurrence}")
+    return ids
+
+
+def _file_hash(path: str) -> str:
+    """Returns the SHA-256 hex digest of a file's contents."""
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def persist_dir(candidate: str = "") -> str:
+    """
+    Directory holding a candidate's index: CHROMA_PERSIST_DIR for the default
+    (unnamed) candidate, CHROMA_PERSIST_DIR/candidates/<name> for a named one.
+    """
+    if not candidate:
+        return settings.CHROMA_PERSIST_DIR
+    if not isinstance(candidate, str) or not _CANDIDATE_NAME.match(candidate):
+        raise ValueError(
+            f"Invalid candidate name {candidate!r}: use letters, digits, '-' and '_' (at most 63 characters)"
+        )
+    return os.path.join(settings.CHROMA_PERSIST_DIR, CANDIDATES_DIRNAME, candidate)
+
+
+def list_candidates() -> List[str]:
+    """Names of the candidates that have an index (the default candidate is not listed)."""
+    root = os.path.join(settings.CHROMA_PERSIST_DIR, CANDIDATES_DIRNAME)
+    try:
+        names = os.listdir(root)
+    except OSError:
+        return []
+    return sorted(
+        name for name in names
+        if _CANDIDATE_NAME.match(name) and os.path.exists(os.path.join(root, name, MANIFEST_FILENAME))
+    )
+
+
+def _manifest_path(candidate: str = "") -> str:
+    return os.path.join(persist_dir(candidate), MANIFEST_FILENAME)
+
+
+def _load_manifest(candidate: str = "") -> Optional[dict]:
+    """Loads the ingest manifest, or returns None if it is missing or unusable."""
+    path = _manifest_path(candidate)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    # A manifest written for another model or collection cannot be reused
+    if (
+        manifest.get("version") != MANIFEST_VERSION
+        or manifest.get("collection") != settings.COLLECTION_NAME
+        or manifest.get("embedding_model") != settings.EMBEDDING_MODEL
+        or manifest.get("backend") != _backend_id()
+    ):
+        return None
+    return manifest
+
+
+def _save_manifest(files: Dict[str, dict], candidate: str = "") -> None:
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "collection": settings.COLLECTION_NAME,
+        "embedding_model": settings.EMBEDDING_MODEL,
+        "backend": _backend_id(),
+        "files": files,
+    }
+    path = _manifest_path(candidate)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _backend_id() -> str:
+    """Identifies the storage format, so switching backends forces a full re-ingest."""
+    if settings.RETRIEVAL_MODE == "lexical":
+        # Only the BM25 index is built; dense or hybrid retrieval needs a full ingest
+        return "lexical"
+    if settings.VECTOR_BACKEND == "numpy" and settings.NUMPY_INDEX_QUANTIZE:
+        return "numpy-int8"
+    return settings.VECTOR_BACKEND
+
+
+def _store_class():
+    """Returns the VectorStore class for settings.VECTOR_BACKEND, imported lazily."""
+    if settings.VECTOR_BACKEND == "numpy":
+        from resume_forge.numpy_store import NumpyVectorStore
+        return NumpyVectorStore
+    if settings.VECTOR_BACKEND == "chroma":
+        from langchain_community.vectorstores import Chroma
+        return Chroma
+    raise ValueError(f"Unknown VECTOR_BACKEND: {settings.VECTOR_BACKEND!r} (expected 'chroma' or 'numpy')")
+
+
+def _store_kwargs(candidate: str = "") -> dict:
+    kwargs = {
+        "persist_directory": persist_dir(candidate),
+        "collection_name": settings.COLLECTION_NAME,
+    }
+    if settings.VECTOR_BACKEND == "numpy":
+        kwargs["quantize"] = settings.NUMPY_INDEX_QUANTIZE
+    return kwargs
+
+
+def _open_vectorstore(candidate: str = "") -> VectorStore:
+    return _store_class()(embedding_function=get_embeddings(), **_store_kwargs(candidate))
+
+
+def _cache_key(candidate: str) -> Tuple:
+    return (os.path.abspath(persist_dir(candidate)), settings.COLLECTION_NAME, _backend_id())
+
+
+def _cached_client(cache: Dict[Tuple, object], key: Tuple, load: Callable[[], object]):
     """
-    Loads markdown files from vault_path, splits them, and indexes into ChromaDB.
+    Returns cache[key], loading it on a miss. The vector store clients and BM25
+    indexes of at most STORE_CACHE_MAX_ENTRIES candidates are kept open; the least
+    recently used one is dropped to make room (see _retire_client).
+    """
+    with _vectorstore_lock:
+        client = cache.pop(key, None)
+        if client is None:
+            _store_cache_stats["misses"] += 1
+            client = load()
+        else:
+            _store_cache_stats["hits"] += 1
+        # Re-inserting keeps the dict in least- to most-recently-used order
+        cache[key] = client
+        while len(cache) > max(1, settings.STORE_CACHE_MAX_ENTRIES):
+            _retire_client(cache.pop(next(iter(cache))))
+            _store_cache_stats["evictions"] += 1
+        return client
+
+
+def _close_client(client) -> None:
+    """
+    Releases a store client's resources. A Chroma client keeps its System (SQLite
+    connections, segment readers) registered per persist path until it is closed;
+    closing the last client of a path stops that System and unregisters it.
+    """
+    chroma_client = getattr(client, "_client", None)
+    if chroma_client is not None and hasattr(chroma_client, "close"):
+        chroma_client.close()
+
+
+def _retire_client(client) -> None:
+    """
+    Closes a client dropped from the cache (called with _vectorstore_lock held),
+    or, while queries borrowed it (see _borrowed_vectorstore), once the last one
+    returns it.
+    """
+    if _store_borrowers.get(id(client)):
+        _retired_stores[id(client)] = client
+    else:
+        _close_client(client)
+
+
+@contextmanager
+def _borrowed_vectorstore(candidate: str = "") -> Iterator[VectorStore]:
+    """Yields a candidate's cached store, which is not closed before the block exits even if evicted meanwhile."""
+    with _vectorstore_lock:
+        store = get_vectorstore(candidate)
+        _store_borrowers[id(store)] = _store_borrowers.get(id(store), 0) + 1
+    try:
+        yield store
+    finally:
+        with _vectorstore_lock:
+            _store_borrowers[id(store)] -= 1
+            if not _store_borrowers[id(store)]:
+                del _store_borrowers[id(store)]
+                if _retired_stores.pop(id(store), None) is not None:
+                    _close_client(store)
+
+
+def get_vectorstore(candidate: str = "") -> VectorStore:
+    """
+    Returns the client for a candidate's local store. Clients are cached per
+    candidate (see _cached_client) and all share the one embedding model.
+    """
+    def load():
+        with profiling.span("vectorstore.open", backend=settings.VECTOR_BACKEND, candidate=candidate):
+            return _open_vectorstore(candidate)
+
+    return _cached_client(_store_clients, _cache_key(candidate), load)
+
+
+def _lexical_index_path(candidate: str = "") -> str:
+    return os.path.join(persist_dir(candidate), f"{settings.COLLECTION_NAME}.bm25.json")
+
+
+def get_lexical_index(candidate: str = "") -> BM25Index:
+    """Returns the BM25 index written by a candidate's last ingest, cached per candidate."""
+    def load():
+        with profiling.span("vectorstore.load_lexical_index", candidate=candidate):
+            index = BM25Index.load(_lexical_index_path(candidate))
+        if index is None:
+            raise FileNotFoundError(f"No lexical index found in {persist_dir(candidate)}. Run 'ingest' first.")
+        return index
+
+    return _cached_client(_lexical_indexes, _cache_key(candidate), load)
+
+
+def store_cache_stats() -> dict:
+    """Open clients and hit/miss/eviction counts of the per-candidate client cache."""
+    with _vectorstore_lock:
+        return {
+            **_store_cache_stats,
+            "open_stores": len(_store_clients),
+            "open_lexical_indexes": len(_lexical_indexes),
+            "max_entries": settings.STORE_CACHE_MAX_ENTRIES,
+        }
+
+
+def _invalidate_vectorstore(candidate: Optional[str] = None) -> None:
+    """
+    Drops a candidate's cached clients and bumps its index generation after its
+    index changes. With no candidate, every cached client is dropped.
+    """
+    global _index_generation, _all_invalidated_at
+    with _vectorstore_lock:
+        _index_generation += 1
+        if candidate is None:
+            for client in _store_clients.values():
+                _retire_client(client)
+            _store_clients.clear()
+            _lexical_indexes.clear()
+            _index_generations.clear()
+            _all_invalidated_at = _index_generation
+            return
+        key = _cache_key(candidate)
+        client = _store_clients.pop(key, None)
+        if client is not None:
+            _retire_client(client)
+        _lexical_indexes.pop(key, None)
+        _index_generations[key[0]] = _index_generation
+
+
+def index_generation(candidate: str = "") -> int:
+    """Returns a counter that changes whenever this process modifies the candidate's index."""
+    with _vectorstore_lock:
+        return max(_all_invalidated_at, _index_generations.get(os.path.abspath(persist_dir(candidate)), 0))
+
+
+def _clear_index_dir(candidate: str) -> None:
+    """Deletes a candidate's index files; the default candidate keeps the named candidates' indexes."""
+    directory = persist_dir(candidate)
+    if not os.path.exists(directory):
+        return
+    if candidate:
+        shutil.rmtree(directory)
+        return
+    for name in os.listdir(directory):
+        if name == CANDIDATES_DIRNAME:
+            continue
+        path = os.path.join(directory, name)
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+
+
+def ingest_vault(vault_path: str, candidate: str = "") -> int:
+    """
+    Loads markdown files from vault_path (on INGEST_WORKERS threads), splits them
+    on headers and then by size (see markdown_loader), and indexes them into the
+    configured vector store (ChromaDB by default) and a BM25 index stored next to it.
+    In lexical retrieval mode only the BM25 index is built, so the embedding model
+    is never loaded. Only the candidate's own index (see persist_dir) is replaced.
     Returns the number of chunks indexed.
     """
     if not os.path.exists(vault_path):
         raise FileNotFoundError(f"Vault directory not found: {vault_path}")
 
-    # Clear caches so the embedding model is re-initialized fresh
-    clear_embeddings_cache()
+    # Closes this process's client of the old index before its files go
+    _invalidate_vectorstore(candidate)
 
     # Recreate collection to avoid duplicates on re-ingest
-    if os.path.exists(settings.CHROMA_PERSIST_DIR):
-        shutil.rmtree(settings.CHROMA_PERSIST_DIR)
-
-    loader = DirectoryLoader(
-        vault_path,
-        glob="**/*.md",
-        loader_cls=UnstructuredMarkdownLoader,
-        show_progress=True
-    )
-    documents = loader.load()
-    
-    # Filter out templates (files starting with _)
-    documents = [
-        doc for doc in documents 
-        if not os.path.basename(doc.metadata.get("source", "")).startswith("_")
-    ]
-    
-    if not documents:
+    _clear_index_dir(candidate)
+
+    # Templates (files starting with _) are skipped before they are read
+    paths = list_markdown_files(vault_path)
+    with profiling.span("ingest.load_documents", files=len(paths)):
+        chunks = load_vault_chunks(paths, settings.INGEST_WORKERS)
+    if not chunks:
         return 0
+    ids = _chunk_ids(chunks)
 
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=500,
-        chunk_overlap=50
-    )
-    chunks = text_splitter.split_documents(documents)
+    if settings.RETRIEVAL_MODE != "lexical":
+        with profiling.span("ingest.index_vectors", chunks=len(chunks)):
+            store = _store_class().from_documents(
+                documents=chunks,
+                ids=ids,
+                embedding=get_embeddings(),
+                **_store_kwargs(candidate)
+            )
+            # Searches reopen it through the client cache
+            _close_client(store)
+    with profiling.span("ingest.index_lexical", chunks=len(chunks)):
+        BM25Index.build(
+            ids, [chunk.page_content for chunk in chunks], [chunk.metadata for chunk in chunks]
+        ).save(_lexical_index_path(candidate))
+    _invalidate_vectorstore(candidate)
+
+    # Record what was indexed so later runs can ingest incrementally
+    files = {}
+    for chunk, chunk_id in zip(chunks, ids):
+        source = chunk.metadata.get("source", "")
+        if source not in files:
+            files[source] = {"hash": _file_hash(source), "chunks": []}
+        files[source]["chunks"].append(chunk_id)
+    _save_manifest(files, candidate)
 
-    Chroma.from_documents(
-        documents=chunks,
-        embedding=get_embeddings(),
-        persist_directory=settings.CHROMA_PERSIST_DIR,
-        collection_name=settings.COLLECTION_NAME
-    )
-    
     return len(chunks)
 
-def get_retriever() -> VectorStoreRetriever:
-    """Returns a retriever connected to the local ChromaDB."""
-    vectorstore = Chroma(
-        persist_directory=settings.CHROMA_PERSIST_DIR,
-        embedding_function=get_embeddings(),
-        collection_name=settings.COLLECTION_NAME
-    )
-    return vectorstore.as_retriever(search_kwargs={"k": settings.TOP_K})
+
+@dataclass
+class SyncPlan:
+    """Chunk changes computed by plan_sync, applied to the index by apply_sync."""
+    stats: IngestStats = field(default_factory=IngestStats)
+    files: Dict[str, dict] = field(default_factory=dict)
+    to_delete: List[str] = field(default_factory=list)
+    to_add: List[Document] = field(default_factory=list)
+    to_add_ids: List[str] = field(default_factory=list)
+    full_ingest: bool = False  # no usable manifest or BM25 index
+
+
+def plan_sync(
+    vault_path: str, changed_paths: Optional[Iterable[str]] = None, candidate: str = ""
+) -> SyncPlan:
+    """
+    Works out which chunks an incremental ingest has to add and delete, without
+    touching the index. Files whose content hash matches the manifest are skipped;
+    changed files are re-split and only chunks whose text changed are added.
+    With changed_paths (e.g. from a file watcher), only those files are hashed
+    and all other files still in the vault are taken as unchanged.
+
+    New chunks are embedded here when the embedding cache is enabled, so that
+    apply_sync (which may run while readers are locked out) only hits the cache.
+    """
+    if not os.path.exists(vault_path):
+        raise FileNotFoundError(f"Vault directory not found: {vault_path}")
+
+    manifest = _load_manifest(candidate)
+    if manifest is None or not os.path.exists(_lexical_index_path(candidate)):
+        return SyncPlan(full_ingest=True)
+
+    previous = manifest.get("files", {})
+    vault_files = list_markdown_files(vault_path)
+    if changed_paths is None:
+        current = {path: _file_hash(path) for path in vault_files}
+    else:
+        changed = set(changed_paths)
+        current = {
+            path: _file_hash(path) if path in changed or path not in previous else previous[path]["hash"]
+            for path in vault_files
+        }
+
+    plan = SyncPlan()
+    for source, entry in previous.items():
+        if source not in current:
+            plan.to_delete.extend(entry["chunks"])
+            plan.stats.removed += len(entry["chunks"])
+
+    for source, file_hash in current.items():
+        entry = previous.get(source)
+        if entry is not None and entry["hash"] == file_hash:
+            plan.files[source] = entry
+            plan.stats.unchanged += len(entry["chunks"])
+            continue
+
+        chunks = load_markdown_chunks(source)
+        ids = _chunk_ids(chunks)
+        old_ids = set(entry["chunks"]) if entry is not None else set()
+        new_ids = set(ids)
+
+        stale = [chunk_id for chunk_id in old_ids if chunk_id not in new_ids]
+        plan.to_delete.extend(stale)
+        plan.stats.removed += len(stale)
+
+        for chunk, chunk_id in zip(chunks, ids):
+            if chunk_id in old_ids:
+                plan.stats.unchanged += 1
+            else:
+                plan.to_add.append(chunk)
+                plan.to_add_ids.append(chunk_id)
+                plan.stats.added += 1
+
+        plan.files[source] = {"hash": file_hash, "chunks": ids}
+
+    if plan.to_add and settings.RETRIEVAL_MODE != "lexical" and settings.EMBEDDING_CACHE_ENABLED:
+        with profiling.span("ingest.embed", chunks=len(plan.to_add)):
+            get_embeddings().embed_documents([chunk.page_content for chunk in plan.to_add])
+    return plan
+
+
+def apply_sync(vault_path: str, plan: SyncPlan, candidate: str = "") -> IngestStats:
+    """Applies a plan from plan_sync to the candidate's index, then saves the manifest."""
+    if plan.full_ingest:
+        return IngestStats(added=ingest_vault(vault_path, candidate))
+
+    if plan.to_delete or plan.to_add:
+        if settings.RETRIEVAL_MODE != "lexical":
+            with _borrowed_vectorstore(candidate) as vectorstore:
+                if plan.to_delete:
+                    vectorstore.delete(ids=plan.to_delete)
+                if plan.to_add:
+                    vectorstore.add_documents(plan.to_add, ids=plan.to_add_ids)
+        lexical_index = BM25Index.load(_lexical_index_path(candidate))
+        if lexical_index is None:
+            return IngestStats(added=ingest_vault(vault_path, candidate))
+        lexical_index.remove(plan.to_delete)
+        lexical_index.add(
+            plan.to_add_ids,
+            [chunk.page_content for chunk in plan.to_add],
+            [chunk.metadata for chunk in plan.to_add],
+        )
+        lexical_index.save(_lexical_index_path(candidate))
+        _invalidate_vectorstore(candidate)
+
+    _save_manifest(plan.files, candidate)
+    return plan.stats
+
+
+def sync_vault(
+    vault_path: str, changed_paths: Optional[Iterable[str]] = None, candidate: str = ""
+) -> IngestStats:
+    """
+    Incrementally brings the index in line with vault_path (see plan_sync):
+    only chunks from added, edited or deleted files are embedded or removed.
+    Falls back to a full ingest when no usable manifest is present.
+    """
+    return apply_sync(vault_path, plan_sync(vault_path, changed_paths, candidate), candidate)
+
+
+class CandidateRetriever(BaseRetriever):
+    """
+    Searches a candidate's index, borrowing its clients from the client cache
+    for each query. A long-lived chain therefore never holds on to a client the
+    cache has evicted; it is simply reopened on the next query, and one evicted
+    mid-query is only closed once that query is done.
+    """
+
+    candidate: str = ""
+    k: int = 4
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        with _borrowed_retriever(self.k, self.candidate) as retriever:
+            return retriever.invoke(query, config={"callbacks": run_manager.get_child()})
+
+
+def get_retriever(k: Optional[int] = None, candidate: str = "") -> BaseRetriever:
+    """
+    Returns a retriever over a candidate's index (the default one unless named)
+    for settings.RETRIEVAL_MODE (top settings.TOP_K by default):
+    'dense' searches the vector store, 'lexical' the BM25 index only (no embedding
+    model or vector store client is loaded), and 'hybrid' fuses both rankings with
+    reciprocal-rank fusion. The index is opened now, so a missing one fails here
+    rather than on the first query (see CandidateRetriever).
+    """
+    k = k or settings.TOP_K
+    with _borrowed_retriever(k, candidate):
+        pass
+    return CandidateRetriever(candidate=candidate, k=k)
+
+
+@contextmanager
+def _borrowed_retriever(k: int, candidate: str) -> Iterator[BaseRetriever]:
+    mode = settings.RETRIEVAL_MODE
+    if mode == "lexical":
+        yield BM25Retriever(index=get_lexical_index(candidate), k=k)
+        return
+    if mode not in ("dense", "hybrid"):
+        raise ValueError(f"Unknown RETRIEVAL_MODE: {mode!r} (expected 'dense', 'lexical' or 'hybrid')")
+
+    with _borrowed_vectorstore(candidate) as store:
+        dense = store.as_retriever(search_kwargs={"k": k})
+        if mode == "dense":
+            yield dense
+            return
+        yield HybridRetriever(
+            dense=dense,
+            lexical=BM25Retriever(index=get_lexical_index(candidate), k=k),
+            k=k,
+            rrf_k=settings.RRF_K,
+        )
@@ -0,0 +1,95 @@
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from resume_forge.markdown_loader import list_markdown_files
+
+# (modification time in ns, size) per vault file
+Snapshot = Dict[str, Tuple[int, int]]
+
+
+def snapshot_vault(vault_path: str) -> Snapshot:
+    """Stats every markdown file in the vault (templates excluded); no file is read."""
+    snapshot = {}
+    for path in list_markdown_files(vault_path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue  # deleted between listing and stat
+        snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+
+def changed_files(before: Snapshot, after: Snapshot) -> Set[str]:
+    """Paths added, modified or deleted between two snapshots."""
+    return {path for path in before.keys() | after.keys() if before.get(path) != after.get(path)}
+
+
+class VaultWatcher:
+    """
+    Polls a vault directory for markdown changes and calls `sync` once edits settle.
+
+    Polling (every `interval` seconds) only stats files, so it needs no OS-specific
+    notification API and costs little CPU. A burst of changes (an editor saving
+    several files, a git checkout) is debounced: `sync(changed_paths)` runs once
+    no further change has been seen for `debounce` seconds. If a sync fails, its
+    paths are retried after another `debounce` seconds.
+    """
+
+    def __init__(
+        self,
+        vault_path: str,
+        sync: Callable[[List[str]], object],
+        interval: float = 1.0,
+        debounce: float = 1.0,
+        on_result: Optional[Callable[[List[str], object, Optional[Exception]], None]] = None,
+    ):
+        self.vault_path = vault_path
+        self.sync = sync
+        self.interval = interval
+        self.debounce = debounce
+        self.on_result = on_result
+        self._stop = threading.Event()
+        self._snapshot = snapshot_vault(vault_path)
+        self._pending: Set[str] = set()
+        self._last_change = 0.0
+
+    def poll(self, now: Optional[float] = None) -> bool:
+        """
+        Takes one snapshot and syncs if changes have settled. Returns True when a
+        sync ran (successfully or not).
+        """
+        now = time.monotonic() if now is None else now
+        current = snapshot_vault(self.vault_path)
+        changed = changed_files(self._snapshot, current)
+        self._snapshot = current
+        if changed:
+            self._pending |= changed
+            self._last_change = now
+            return False
+        if not self._pending or now - self._last_change < self.debounce:
+            return False
+
+        paths = sorted(self._pending)
+        self._pending = set()
+        try:
+            result = self.sync(paths)
+        except Exception as e:
+            # Retried after another debounce period (or with the next change)
+            self._pending |= set(paths)
+            self._last_change = now
+            if self.on_result is not None:
+                self.on_result(paths, None, e)
+        else:
+            if self.on_result is not None:
+                self.on_result(paths, result, None)
+        return True
+
+    def run(self) -> None:
+        """Polls until stop() is called."""
+        while not self._stop.wait(self.interval):
+            self.poll()
+
+    def stop(self) -> None:
+        self._stop.set()
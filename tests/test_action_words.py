@@ -0,0 +1,74 @@
+import json
+import os
+from unittest.mock import patch
+
+from resume_forge import action_words
+from resume_forge.action_words import ActionWordIndex, get_action_word_index, select_action_words, stem
+from resume_forge.config import settings
+
+WORDS = {
+    "lead": ["Led", "Directed", "Mentored", "Managed"],
+    "mgmt": ["Managed", "Budgeted", "Planned"],
+    "tech": ["Optimized", "Designed", "Automated", "Deployed"],
+    "comm": ["Negotiated", "Presented"],
+}
+
+
+def test_stem_matches_verbs_to_jd_phrasing():
+    """Test that past-tense verbs and JD nouns/infinitives share a stem."""
+    assert stem("Optimized") == stem("optimize") == stem("optimization")
+    assert stem("Led") == stem("leading") == "lead"
+    assert stem("Managed") == stem("management") == stem("manager")
+    assert stem("Planned") == stem("planning")
+
+
+def test_select_ranks_jd_matches_then_fills_from_categories():
+    """Test that JD-mentioned verbs come first, then section categories in turn, without duplicates."""
+    index = ActionWordIndex(WORDS)
+    jd = "Optimize our pipelines; optimization is key. Negotiate with vendors and lead the team."
+    selected = index.select(jd, ["lead", "tech"], top_n=6)
+
+    assert selected[:3] == ["Optimized", "Led", "Negotiated"]  # 2 mentions first, in-category wins ties
+    assert selected[3:] == ["Directed", "Designed", "Mentored"]  # one per category in turn
+    assert index.select(jd, ["lead", "mgmt"], top_n=0) == ["Led", "Directed", "Mentored", "Managed", "Budgeted", "Planned"]
+
+
+def test_select_action_words_renders_compactly(tmp_path):
+    """Test that section prompts get a short comma-separated list and SKILLS gets none."""
+    path = tmp_path / "action_words.json"
+    path.write_text(json.dumps(WORDS), encoding="utf-8")
+    with patch.object(settings, "ACTION_WORDS_FILE", str(path)), patch.object(settings, "ACTION_WORDS_TOP_N", 3):
+        assert select_action_words("Automate deployments", ["EXPERIENCE"]) == "Automated, Deployed, Led"
+        assert select_action_words("Automate deployments", ["SKILLS"]).startswith("N/A")
+        assert len(select_action_words("", ["EXPERIENCE", "PROJECTS", "SKILLS"]).split(", ")) == 6
+
+
+def test_index_is_cached_until_file_changes(tmp_path):
+    """Test that the index is built once and rebuilt only when the file's contents change."""
+    path = tmp_path / "action_words.json"
+    path.write_text(json.dumps(WORDS), encoding="utf-8")
+    with patch.object(settings, "ACTION_WORDS_FILE", str(path)), \
+            patch.object(action_words, "_cached_index", None):
+        first = get_action_word_index()
+        assert get_action_word_index() is first
+
+        path.write_text(json.dumps({"tech": ["Refactored"]}), encoding="utf-8")
+        rebuilt = get_action_word_index()
+        assert rebuilt is not first and rebuilt.words == ["Refactored"]
+
+
+def test_unchanged_file_is_not_reread(tmp_path):
+    """Test that the file is only re-read and re-hashed when its mtime or size changes."""
+    path = tmp_path / "action_words.json"
+    path.write_text(json.dumps(WORDS), encoding="utf-8")
+    with patch.object(settings, "ACTION_WORDS_FILE", str(path)), \
+            patch.object(action_words, "_cached_index", None), \
+            patch.object(action_words.hashlib, "sha256", wraps=action_words.hashlib.sha256) as sha256:
+        first = get_action_word_index()
+        get_action_word_index()
+        assert sha256.call_count == 1
+
+        os.utime(path, ns=(0, 0))  # touched, same contents: re-hashed but not rebuilt
+        assert get_action_word_index() is first
+        get_action_word_index()
+        assert sha256.call_count == 2
@@ -0,0 +1,65 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from resume_forge.batch import load_jobs, percentile, run_batch
+
+
+def test_load_jobs_from_directory(tmp_path):
+    (tmp_path / "b_backend.txt").write_text("Backend role", encoding="utf-8")
+    (tmp_path / "a_ml.md").write_text("ML role", encoding="utf-8")
+    (tmp_path / "empty.txt").write_text("  ", encoding="utf-8")
+    (tmp_path / "notes.pdf").write_text("ignored", encoding="utf-8")
+
+    jobs = load_jobs(tmp_path)
+    assert [(j.name, j.job_description) for j in jobs] == [("a_ml", "ML role"), ("b_backend", "Backend role")]
+
+
+def test_load_jobs_from_jsonl(tmp_path):
+    path = tmp_path / "jds.jsonl"
+    path.write_text(
+        json.dumps({"id": "acme", "jd": "Python"}) + "\n\n" + json.dumps({"job_description": "Go"}) + "\n",
+        encoding="utf-8",
+    )
+    jobs = load_jobs(path)
+    assert [(j.name, j.job_description) for j in jobs] == [("acme", "Python"), ("jd_003", "Go")]
+
+    path.write_text(json.dumps({"id": "x"}) + "\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_jobs(path)
+
+
+def test_percentile():
+    assert percentile([], 50) == 0.0
+    assert percentile([3.0, 1.0, 2.0], 50) == 2.0
+    assert percentile([1.0, 2.0, 3.0, 4.0], 95) == pytest.approx(3.85)
+
+
+@patch("resume_forge.batch.build_tailor_chain")
+@patch("resume_forge.batch.tailor_resume_section")
+def test_run_batch_reuses_one_chain(mock_tailor, mock_build_chain, tmp_path):
+    """Test that the chain is built once and each JD gets its own output file."""
+    from resume_forge.batch import BatchJob
+
+    chain = MagicMock()
+    mock_build_chain.return_value = chain
+
+    def fake_tailor(jd, template, chain=None, candidate="", validation=None):
+        if jd == "bad":
+            raise RuntimeError("boom")
+        return f"{template}:{jd}"
+
+    mock_tailor.side_effect = fake_tailor
+    jobs = [BatchJob("one", "python"), BatchJob("one", "go"), BatchJob("three", "bad")]
+
+    summary = run_batch(jobs, "TPL", tmp_path / "out", max_workers=2)
+
+    mock_build_chain.assert_called_once()
+    assert all(call.kwargs["chain"] is chain for call in mock_tailor.call_args_list)
+    assert (tmp_path / "out" / "one.tex").read_text() == "TPL:python"
+    assert (tmp_path / "out" / "one_2.tex").read_text() == "TPL:go"
+    assert [r.name for r in summary.results] == ["one", "one", "three"]
+    assert len(summary.succeeded) == 2
+    assert summary.failed[0].error == "boom"
+    assert summary.jds_per_minute > 0
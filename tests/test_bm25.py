@@ -0,0 +1,103 @@
+from typing import List
+from unittest.mock import patch
+
+import pytest
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from resume_forge import vectorstore
+from resume_forge.bm25 import (
+    BM25Index,
+    BM25Retriever,
+    HybridRetriever,
+    reciprocal_rank_fusion,
+    tokenize,
+)
+from resume_forge.config import settings
+
+
+def _index():
+    return BM25Index.build(
+        ["a", "b", "c"],
+        [
+            "Built Airflow DAGs and SQL pipelines",
+            "Trained TensorFlow models in Python",
+            "Wrote C++ and C# services on Node.js",
+        ],
+        [{"source": "vault/role_a.md"}, {"source": "vault/project_b.md"}, {"source": "vault/role_c.md"}],
+    )
+
+
+class StaticRetriever(BaseRetriever):
+    docs: List[Document]
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        return self.docs
+
+
+def test_tokenize_keeps_technology_names():
+    """Test that tokenization keeps names like C++, C# and Node.js and drops stopwords."""
+    assert tokenize("Experience with C++, C# and Node.js is a plus.") == [
+        "experience", "c++", "c#", "node.js", "plus"
+    ]
+
+
+def test_search_ranks_exact_terms():
+    """Test that chunks containing the JD's technology names rank first."""
+    index = _index()
+    assert index.search("Airflow", 3)[0][0] == 0
+    assert [p for p, _ in index.search("We need TensorFlow and Python", 3)] == [1]
+    assert index.document(index.search("c++", 1)[0][0]).id == "c"
+    assert index.search("kubernetes", 3) == []
+
+
+def test_incremental_update_and_round_trip(tmp_path):
+    """Test that removals, replacements and additions survive a save/load round trip."""
+    index = _index()
+    index.remove(["a"])
+    index.add(["b", "d"], ["Ran Kubernetes clusters", "Tuned SQL queries"], [{}, {}])
+    path = str(tmp_path / "index.bm25.json")
+    index.save(path)
+
+    loaded = BM25Index.load(path)
+    assert sorted(loaded.ids) == ["b", "c", "d"]
+    assert [loaded.ids[p] for p, _ in loaded.search("sql", 3)] == ["d"]
+    assert [loaded.ids[p] for p, _ in loaded.search("kubernetes", 3)] == ["b"]
+    assert loaded.search("tensorflow", 3) == []
+    assert BM25Index.load(str(tmp_path / "missing.json")) is None
+
+
+def test_reciprocal_rank_fusion():
+    """Test that chunks ranked well by both lists come first after fusion."""
+    a, b, c = (Document(page_content=t, metadata={"source": t}) for t in "abc")
+    fused = reciprocal_rank_fusion([[a, b, c], [b, c]], k=3)
+    assert [d.page_content for d in fused] == ["b", "c", "a"]
+    assert len(reciprocal_rank_fusion([[a, b, c]], k=2)) == 2
+
+
+def test_hybrid_retriever_fuses_dense_and_lexical():
+    """Test that the hybrid retriever promotes lexical matches the dense ranking missed."""
+    index = _index()
+    dense = StaticRetriever(docs=[index.document(1), index.document(2)])
+    retriever = HybridRetriever(dense=dense, lexical=BM25Retriever(index=index, k=2), k=3)
+    docs = retriever.invoke("Airflow and C++")
+    assert {d.id for d in docs} == {"a", "b", "c"}
+    assert docs[0].id == "c"  # ranked by both lists
+
+
+def test_lexical_mode_skips_vector_store(tmp_path):
+    """Test that lexical retrieval reads the BM25 index without opening the vector store."""
+    with patch.object(settings, "CHROMA_PERSIST_DIR", str(tmp_path)), \
+            patch.object(settings, "RETRIEVAL_MODE", "lexical"), \
+            patch.object(vectorstore, "get_vectorstore", side_effect=AssertionError("vector store opened")):
+        vectorstore._invalidate_vectorstore()
+        with pytest.raises(FileNotFoundError):
+            vectorstore.get_retriever()
+
+        _index().save(vectorstore._lexical_index_path())
+        docs = vectorstore.get_retriever(k=1).invoke("Airflow pipelines")
+        assert [d.id for d in docs] == ["a"]
+        vectorstore._invalidate_vectorstore()
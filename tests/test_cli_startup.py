@@ -0,0 +1,34 @@
+import json
+import subprocess
+import sys
+
+# Generous enough for slow CI machines, far below the multi-second cost of importing torch/LangChain
+STARTUP_BUDGET_SECONDS = 1.5
+
+HEAVY_MODULES = ["torch", "sentence_transformers", "langchain_core", "langchain_openai", "chromadb"]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import resume_forge.cli
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+
+def _probe_import():
+    # A fresh interpreter so modules imported by other tests don't skew the result
+    out = subprocess.run([sys.executable, "-c", _PROBE], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_cli_import_skips_heavy_dependencies():
+    """Test that importing the CLI doesn't pull in torch, LangChain or Chroma."""
+    assert _probe_import()["loaded"] == []
+
+
+def test_cli_import_time_budget():
+    """Test that importing the CLI (what `--help` pays for) stays under the startup budget."""
+    # Best of three to smooth over scheduler noise
+    elapsed = min(_probe_import()["elapsed"] for _ in range(3))
+    assert elapsed < STARTUP_BUDGET_SECONDS, f"resume_forge.cli took {elapsed:.2f}s to import"
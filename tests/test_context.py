@@ -0,0 +1,91 @@
+import random
+
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from resume_forge.context import (
+    estimate_tokens,
+    merge_overlapping_chunks,
+    mmr_order,
+    pack_context,
+)
+
+
+def _doc(text, source="vault/role_a.md"):
+    return Document(page_content=text, metadata={"source": source})
+
+
+def _split(text, source):
+    splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=50)
+    return splitter.split_documents([_doc(text, source)])
+
+
+def _words(seed, count):
+    rng = random.Random(seed)
+    vocab = ["python", "airflow", "pipelines", "latency", "scaled", "team", "sql", "kafka"]
+    return " ".join(rng.choice(vocab) for _ in range(count))
+
+
+def test_merges_splitter_overlap_back_into_source_text():
+    """Test that adjacent chunks are stitched back together in any retrieval order."""
+    text = _words(0, 300)
+    chunks = _split(text, "vault/role_a.md")
+    assert len(chunks) > 2
+    shuffled = chunks[:]
+    random.Random(1).shuffle(shuffled)
+
+    merged = merge_overlapping_chunks(shuffled)
+    assert [d.page_content for d in merged] == [text]
+    assert merged[0].metadata == {"source": "vault/role_a.md"}
+
+
+def test_merge_keeps_sources_apart_and_rank_order():
+    """Test that only chunks from the same file merge and the best rank is kept."""
+    shared = "Built Airflow pipelines that cut latency by 40% for the team"
+    docs = [
+        _doc("Designed Kafka consumers. " + shared[:30], "vault/role_b.md"),
+        _doc(shared, "vault/role_a.md"),
+        _doc(shared, "vault/role_c.md"),
+        _doc(shared[10:], "vault/role_a.md"),  # contained in the second chunk
+    ]
+    merged = merge_overlapping_chunks(docs)
+    assert [d.metadata["source"] for d in merged] == ["vault/role_b.md", "vault/role_a.md", "vault/role_c.md"]
+    assert merged[1].page_content == shared
+
+
+def test_mmr_demotes_near_duplicates():
+    """Test that a chunk repeating an earlier one drops below a distinct chunk."""
+    docs = [
+        _doc("python airflow pipelines latency"),
+        _doc("python airflow pipelines latency team"),
+        _doc("kafka sql streaming warehouse"),
+    ]
+    ordered = mmr_order(docs, lambda_mult=0.5)
+    assert [d.page_content for d in ordered][:2] == [docs[0].page_content, docs[2].page_content]
+    assert mmr_order(docs, lambda_mult=1.0) == docs
+
+
+def test_pack_context_respects_budget_and_reports_savings():
+    """Test that packing stays within the token budget and reports the tokens saved."""
+    docs = _split(_words(2, 400), "vault/role_a.md") + _split(_words(3, 400), "vault/project_b.md")
+    packed, stats = pack_context(docs, token_budget=0, lambda_mult=0.7)
+    assert stats.chunks_before == len(docs)
+    assert stats.chunks_after == 2  # one merged chunk per file
+    assert stats.tokens_saved > 0
+
+    small = [_doc(_words(i, 40), f"vault/project_{i}.md") for i in range(10)]
+    packed, stats = pack_context(small, token_budget=200, lambda_mult=0.7)
+    assert stats.tokens_after <= 200
+    assert 0 < stats.chunks_after < 10
+    assert abs(stats.savings_ratio - stats.tokens_saved / stats.tokens_before) < 1e-9
+
+    huge = [_doc("x" * 8000)]
+    packed, _ = pack_context(huge, token_budget=100, lambda_mult=0.7)
+    assert packed == huge  # always keeps at least one chunk
+
+
+def test_estimate_tokens():
+    """Test the four-characters-per-token estimate."""
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("abcde") == 2
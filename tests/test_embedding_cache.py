@@ -0,0 +1,123 @@
+import pytest
+from unittest.mock import MagicMock
+
+from resume_forge.embedding_cache import CachedEmbeddings, EmbeddingCache
+
+
+def _fake_embedder():
+    embedder = MagicMock()
+    embedder.embed_documents.side_effect = lambda texts: [[float(len(t)), 1.0, 0.0] for t in texts]
+    embedder.embed_query.side_effect = lambda text: [float(len(text)), 0.0, 1.0]
+    return embedder
+
+
+def test_cache_hits_skip_the_model(tmp_path):
+    """Test that repeated texts are served from the cache without calling the model."""
+    embedder = _fake_embedder()
+    embeddings = CachedEmbeddings(EmbeddingCache(str(tmp_path), "test-model", 10), lambda: embedder)
+
+    first = embeddings.embed_documents(["alpha", "beta", "alpha"])
+    assert embedder.embed_documents.call_count == 1
+    assert embedder.embed_documents.call_args[0][0] == ["alpha", "beta"]
+
+    second = embeddings.embed_documents(["beta", "  alpha\n"])
+    assert embedder.embed_documents.call_count == 1
+    assert second == [first[1], first[0]]
+    assert embeddings.stats()["hits"] == 2
+
+
+def test_cache_persists_across_instances(tmp_path):
+    """Test that a new process (new cache instance) reuses vectors from disk and never loads the model."""
+    CachedEmbeddings(EmbeddingCache(str(tmp_path), "test-model", 10), _fake_embedder).embed_query("python jd")
+
+    factory = MagicMock(side_effect=_fake_embedder)
+    embeddings = CachedEmbeddings(EmbeddingCache(str(tmp_path), "test-model", 10), factory)
+    assert embeddings.embed_query("python jd") == pytest.approx([9.0, 0.0, 1.0])
+    factory.assert_not_called()
+
+
+def test_cache_is_keyed_on_model(tmp_path):
+    """Test that vectors from one model are never served for another."""
+    CachedEmbeddings(EmbeddingCache(str(tmp_path), "model-a", 10), _fake_embedder).embed_query("text")
+    cache = EmbeddingCache(str(tmp_path), "model-b", 10)
+    assert cache.get_many(["text"]) == [None]
+
+
+def test_lru_eviction(tmp_path):
+    """Test that the least recently used entry is evicted once the cache is full."""
+    cache = EmbeddingCache(str(tmp_path), "test-model", 2)
+    cache.put_many(["a", "b"], [[1.0, 0.0], [0.0, 1.0]])
+    cache.get_many(["a"])
+    cache.put_many(["c"], [[1.0, 1.0]])
+
+    assert len(cache) == 2
+    a, b, c = cache.get_many(["a", "b", "c"])
+    assert a == [1.0, 0.0]
+    assert b is None
+    assert c == [1.0, 1.0]
+
+
+def test_instances_sharing_a_cache_keep_each_others_vectors(tmp_path):
+    """Test that two caches on one directory (daemon and CLI) never wipe or overwrite each other's vectors."""
+    first = EmbeddingCache(str(tmp_path), "test-model", 10)
+    second = EmbeddingCache(str(tmp_path), "test-model", 10)
+
+    first.put_many(["jd A"], [[1.0, 2.0]])
+    second.put_many(["jd B"], [[3.0, 4.0]])  # must map first's file, not recreate it
+    first.put_many(["jd C"], [[5.0, 6.0]])  # must pick a slot second has not taken
+
+    reader = EmbeddingCache(str(tmp_path), "test-model", 10)
+    assert reader.get_many(["jd A", "jd B", "jd C"]) == [[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]]
+    assert second.get_many(["jd C"]) == [[5.0, 6.0]]
+
+
+def _evict_and_pause(cache_dir: str, written, commit) -> None:
+    """Writer process: evicts "a" for "b", then holds the transaction open until told to commit."""
+    import numpy as np
+    from unittest.mock import patch
+
+    flush = np.memmap.flush
+
+    def paused_flush(vectors):
+        flush(vectors)
+        written.set()
+        commit.wait(10)
+
+    with patch.object(np.memmap, "flush", paused_flush):
+        EmbeddingCache(cache_dir, "test-model", 1).put_many(["b"], [[2.0, 2.0]])
+
+
+def test_reads_never_see_a_slot_another_process_is_rewriting(tmp_path):
+    """Test that a lookup racing another process's eviction returns a miss, not the new text's vector."""
+    import multiprocessing
+    import threading
+
+    cache = EmbeddingCache(str(tmp_path), "test-model", 1)
+    cache.put_many(["a"], [[1.0, 1.0]])
+
+    context = multiprocessing.get_context("spawn")
+    written, commit = context.Event(), context.Event()
+    writer = context.Process(target=_evict_and_pause, args=(str(tmp_path), written, commit))
+    writer.start()
+    try:
+        assert written.wait(30)  # slot 0 now holds b's vector, its entry is not committed yet
+        threading.Timer(0.5, commit.set).start()
+        assert cache.get_many(["a", "b"]) == [None, [2.0, 2.0]]
+    finally:
+        commit.set()
+        writer.join(30)
+    assert writer.exitcode == 0
+
+
+def test_cache_stats_never_create_embeddings(tmp_path):
+    """Test that reporting cache stats after an ingest never builds an embeddings instance."""
+    from unittest.mock import patch
+    from resume_forge import embeddings
+
+    with patch.object(embeddings, "_cached_embeddings", None), \
+            patch.object(embeddings, "_load_model", side_effect=AssertionError("model loaded")):
+        assert embeddings.embedding_cache_stats() is None
+
+    cached = CachedEmbeddings(EmbeddingCache(str(tmp_path), "test-model", 10), _fake_embedder)
+    with patch.object(embeddings, "_cached_embeddings", cached):
+        assert embeddings.embedding_cache_stats() == {"hits": 0, "misses": 0, "entries": 0}
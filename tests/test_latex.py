@@ -0,0 +1,108 @@
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+from resume_forge.latex import (
+    LatexSanitizer,
+    commands_from_template,
+    get_sanitizer,
+    get_validator,
+    reference_sanitize_latex,
+)
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+from bench_sanitizer import pathological_output, synthetic_llm_output  # noqa: E402
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_matches_reference_on_large_outputs(seed):
+    """Test that the single-pass sanitizer reproduces the eight-pass output on large LLM sections."""
+    text = synthetic_llm_output(1500, seed=seed)
+    assert LatexSanitizer().sanitize(text) == reference_sanitize_latex(text)
+
+
+def test_matches_reference_on_random_fragments():
+    """Test that random mixes of markdown and LaTeX artifacts sanitize identically."""
+    atoms = [
+        "*", "**", "_", "__", "x_y", "$", "\\$", "%", "30", "\\%", "&", "\\&", "\\",
+        "\\Foo", "\\textbf{", "\\item", "{", "}", " ", "word", "\n", "# ", "## ", "#",
+    ]
+    sanitizer = LatexSanitizer()
+    rng = random.Random(0)
+    for _ in range(5000):
+        text = "".join(rng.choice(atoms) for _ in range(rng.randint(1, 12)))
+        if "_" in text and "**" in text:
+            continue  # overlapping markup is resolved differently by design
+        assert sanitizer(text) == reference_sanitize_latex(text), text
+
+
+def test_unclosed_italics_are_linear():
+    """Test that a long line of unclosed _italic openers sanitizes without rescanning."""
+    text = pathological_output(20000)
+    assert LatexSanitizer().sanitize(text) == reference_sanitize_latex(text)
+
+
+def test_common_fixes():
+    """Test the individual fixes the sanitizer applies."""
+    sanitizer = get_sanitizer()
+    assert sanitizer("**Python** and _fast_") == "\\textbf{Python} and \\textit{fast}"
+    assert sanitizer("\\textbf{Go** services") == "\\textbf{Go} services"
+    assert sanitizer("cut cost 30% & time") == "cut cost 30\\% \\& time"
+    assert sanitizer("saved $5K") == "saved \\$5K"
+    assert sanitizer("## Experience\n\\item x") == "\n\\item x"
+    assert sanitizer("a \\Scalable system") == "a Scalable system"
+    assert sanitizer("feature__store and snake_case") == "feature__store and snake_case"
+
+
+def test_overlapping_markup_resolved_left_to_right():
+    """Test that an italic span straddling a bold span is resolved in reading order."""
+    assert get_sanitizer()("_a **b_ c**") == "\\textit{a **b} c**"
+
+
+def test_commands_from_template():
+    """Test that commands and environments defined by the template are discovered."""
+    template = (
+        "\\newcommand{\\Role} [2] {#1}\n"
+        "\\renewcommand*\\Skill{x}\n"
+        "\\def\\Dates{y}\n"
+        "\\newenvironment{Highlights}{}{}\n"
+    )
+    assert commands_from_template(template) == {"Role", "Skill", "Dates", "Highlights"}
+
+
+def test_template_commands_are_kept():
+    """Test that capitalized commands defined by the template are not stripped."""
+    template = "\\newcommand{\\Role}[1]{\\textbf{#1}}"
+    text = "\\Role{Engineer} at \\Acme"
+    assert get_sanitizer()(text) == "Role{Engineer} at Acme"
+    assert get_sanitizer(commands_from_template(template))(text) == "\\Role{Engineer} at Acme"
+    assert get_sanitizer({"Role"}) is get_sanitizer(["Role"])
+
+
+def test_validator_accepts_well_formed_fragments():
+    """Test that escapes, comments, nested environments and template commands pass validation."""
+    validator = get_validator({"resumeItem"})
+    fragment = (
+        "\\begin{itemize}\n"
+        "  \\item \\textbf{Python}: cut costs by 30\\% \\& saved \\$2M \\{sic\\} % an aside }\n"
+        "  \\resumeItem{\\begin{tabular}{ l l } a & b \\\\ \\end{tabular}}\n"
+        "\\end{itemize}"
+    )
+    assert validator(fragment) == []
+
+
+def test_validator_reports_structural_problems():
+    """Test that unbalanced braces, mismatched environments, markdown and unknown commands are reported."""
+    validator = get_validator()
+    assert validator("\\textbf{Python") == ["unbalanced braces: 1 '{' never closed"]
+    assert validator("\\begin{itemize}\n\\item a\n\\end{enumerate}") == [
+        "\\begin{itemize} closed by \\end{enumerate}"
+    ]
+    assert validator("\\begin{itemize}\n\\item a") == ["\\begin{itemize} is never closed"]
+    assert validator("\\item a }") == ["unbalanced braces: '}' without a matching '{'"]
+    assert validator("\\item \\faGithub{} **bold\n```") == [
+        "unknown commands: \\faGithub", "markdown left in the fragment: **, ```"
+    ]
+
@@ -0,0 +1,86 @@
+import httpx
+import pytest
+from unittest.mock import patch
+
+from resume_forge import llm
+from resume_forge.config import settings
+
+
+@pytest.fixture
+def server(tmp_path):
+    """A fake LM Studio server recording the paths it receives."""
+    calls = []
+    state = {"models": [{"id": "local-model"}], "chat_status": 200}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if request.url.path.endswith("/models"):
+            return httpx.Response(200, json={"data": state["models"]})
+        return httpx.Response(state["chat_status"], json={})
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    with patch.object(llm, "get_http_client", return_value=client), \
+            patch.object(settings, "LLM_HEALTH_CACHE_PATH", str(tmp_path / "health.json")), \
+            patch.object(settings, "LLM_HEALTH_CHECK_MODE", "light"):
+        yield calls, state
+
+
+def test_first_check_pings_then_cached_result_is_reused(server):
+    calls, _ = server
+    assert llm.check_llm_status() is True
+    assert calls == ["/v1/models", "/v1/chat/completions"]
+
+    # A fresh successful result is served from the persisted cache
+    assert llm.check_llm_status() is True
+    assert len(calls) == 2
+
+
+def test_light_mode_skips_ping_after_successful_check(server):
+    calls, _ = server
+    llm.check_llm_status()
+    calls.clear()
+
+    with patch.object(settings, "LLM_HEALTH_TTL_SECONDS", 0):
+        assert llm.check_llm_status() is True
+    assert calls == ["/v1/models"]
+
+
+def test_failed_check_is_not_cached_and_forces_ping(server):
+    calls, state = server
+    state["chat_status"] = 500
+    assert llm.check_llm_status() is False
+
+    state["chat_status"] = 200
+    calls.clear()
+    assert llm.check_llm_status() is True
+    assert calls == ["/v1/models", "/v1/chat/completions"]
+
+
+def test_full_mode_always_pings(server):
+    calls, _ = server
+    with patch.object(settings, "LLM_HEALTH_CHECK_MODE", "full"):
+        llm.check_llm_status()
+        calls.clear()
+        assert llm.check_llm_status(use_cache=False) is True
+    assert calls == ["/v1/models", "/v1/chat/completions"]
+
+
+def test_no_models_loaded(server):
+    _, state = server
+    state["models"] = []
+    assert llm.check_llm_status() is False
+
+
+def test_unreachable_server(tmp_path):
+    def handler(request):
+        raise httpx.ConnectError("connection refused")
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    with patch.object(llm, "get_http_client", return_value=client), \
+            patch.object(settings, "LLM_HEALTH_CACHE_PATH", str(tmp_path / "health.json")):
+        assert llm.check_llm_status() is False
+
+
+def test_chat_client_shares_pooled_http_client():
+    chat = llm.get_llm()
+    assert chat.http_client is llm.get_http_client()
@@ -0,0 +1,48 @@
+import time
+from unittest.mock import patch
+
+from resume_forge.llm_cache import ResponseCache
+
+
+def test_key_depends_on_prompt_model_temperature_and_prompts_hash():
+    base = ResponseCache.make_key("prompt", "model", 0.1, "abc")
+    assert base == ResponseCache.make_key("prompt", "model", 0.1, "abc")
+    assert base != ResponseCache.make_key("prompt!", "model", 0.1, "abc")
+    assert base != ResponseCache.make_key("prompt", "other", 0.1, "abc")
+    assert base != ResponseCache.make_key("prompt", "model", 0.2, "abc")
+    assert base != ResponseCache.make_key("prompt", "model", 0.1, "def")
+
+
+def test_get_put_roundtrip_persists(tmp_path):
+    path = str(tmp_path / "cache" / "llm.sqlite")
+    ResponseCache(path, ttl_seconds=60, max_entries=10).put("k", "\\textbf{Python}")
+
+    cache = ResponseCache(path, ttl_seconds=60, max_entries=10)
+    assert cache.get("k") == "\\textbf{Python}"
+    assert cache.get("missing") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_ttl_expiry(tmp_path):
+    cache = ResponseCache(str(tmp_path / "llm.sqlite"), ttl_seconds=10, max_entries=10)
+    with patch("resume_forge.llm_cache.time.time", return_value=1000.0):
+        cache.put("k", "v")
+    with patch("resume_forge.llm_cache.time.time", return_value=1005.0):
+        assert cache.get("k") == "v"
+    with patch("resume_forge.llm_cache.time.time", return_value=1011.0):
+        assert cache.get("k") is None
+    assert len(cache) == 0
+
+
+def test_size_eviction_drops_least_recently_used(tmp_path):
+    cache = ResponseCache(str(tmp_path / "llm.sqlite"), ttl_seconds=3600, max_entries=2)
+    now = time.time()
+    with patch("resume_forge.llm_cache.time.time", side_effect=[now, now + 1, now + 2, now + 3]):
+        cache.put("a", "1")
+        cache.put("b", "2")
+        cache.get("a")
+        cache.put("c", "3")
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
@@ -0,0 +1,79 @@
+from resume_forge.markdown_loader import (
+    CHUNK_SIZE,
+    list_markdown_files,
+    load_markdown_chunks,
+    load_vault_chunks,
+    split_sections,
+)
+
+ROLE = """# Role: Backend Engineer @ Acme
+**Dates**: 2021 - Present
+
+## Overview
+Led the payments team.
+
+## Key Metrics
+### Latency
+- Cut p95 latency by 30%
+
+## Technical Details
+```bash
+# not a header
+make deploy
+```
+"""
+
+
+def test_split_sections_tracks_title_and_header_path():
+    """Test that sections follow headers (ignoring code fences) and concatenate back to the file."""
+    sections = split_sections(ROLE)
+    assert [(title, path) for title, path, _ in sections] == [
+        ("Role: Backend Engineer @ Acme", []),
+        ("Role: Backend Engineer @ Acme", ["Overview"]),
+        ("Role: Backend Engineer @ Acme", ["Key Metrics"]),
+        ("Role: Backend Engineer @ Acme", ["Key Metrics", "Latency"]),
+        ("Role: Backend Engineer @ Acme", ["Technical Details"]),
+    ]
+    assert "# not a header" in sections[-1][2]
+    assert "".join(text for _, _, text in sections) == ROLE
+
+
+def test_load_markdown_chunks_attaches_metadata(tmp_path):
+    """Test that chunks carry source, title and section, and header-only sections are dropped."""
+    path = tmp_path / "role_acme.md"
+    path.write_text(ROLE, encoding="utf-8")
+    chunks = load_markdown_chunks(str(path))
+
+    assert [c.metadata["section"] for c in chunks] == [
+        "", "Overview", "Key Metrics > Latency", "Technical Details"
+    ]
+    assert all(c.metadata["title"] == "Role: Backend Engineer @ Acme" for c in chunks)
+    assert all(c.metadata["source"] == str(path) for c in chunks)
+    assert chunks[1].page_content == "## Overview\nLed the payments team."
+
+
+def test_long_sections_fall_back_to_size_splitting(tmp_path):
+    """Test that a section over CHUNK_SIZE is split by size and keeps its section metadata."""
+    bullets = "\n".join(f"- Shipped feature {i} with Python and SQL" for i in range(60))
+    path = tmp_path / "project_big.md"
+    path.write_text(f"## Achievements\n{bullets}\n", encoding="utf-8")
+    chunks = load_markdown_chunks(str(path))
+
+    assert len(chunks) > 1
+    assert all(len(c.page_content) <= CHUNK_SIZE for c in chunks)
+    assert {c.metadata["section"] for c in chunks} == {"Achievements"}
+    assert chunks[0].metadata["title"] == "project_big"  # no # header: file name
+
+
+def test_vault_loading_skips_templates_and_keeps_order(tmp_path):
+    """Test that _-prefixed files are never read and parallel loading matches serial loading."""
+    (tmp_path / "_template_role.md").write_bytes(b"\xff\xfe not utf-8")
+    for i in range(12):
+        (tmp_path / f"role_{i:02d}.md").write_text(f"# Role {i}\n## Overview\nDid thing {i}.\n", encoding="utf-8")
+
+    paths = list_markdown_files(str(tmp_path))
+    assert len(paths) == 12
+    serial = load_vault_chunks(paths, max_workers=1)
+    parallel = load_vault_chunks(paths, max_workers=4)
+    assert [(c.page_content, c.metadata) for c in parallel] == [(c.page_content, c.metadata) for c in serial]
+    assert len(serial) == 12  # the header-only "# Role" sections are dropped
@@ -0,0 +1,93 @@
+from typing import List
+
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from resume_forge.numpy_store import NumpyVectorStore
+
+VOCAB = ["python", "sql", "tensorflow", "kubernetes", "react", "postgres", "airflow", "rust"]
+
+
+class KeywordEmbeddings(Embeddings):
+    """Bag-of-keywords vectors, so the expected ranking is obvious."""
+
+    def _embed(self, text: str) -> List[float]:
+        words = text.lower().split()
+        return [float(words.count(term)) + 0.01 * i for i, term in enumerate(VOCAB)]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
+
+
+def _docs():
+    return [
+        Document(page_content="built python services", metadata={"source": "vault/role_a.md"}),
+        Document(page_content="tuned sql and postgres queries", metadata={"source": "vault/role_b.md"}),
+        Document(page_content="trained tensorflow models with python", metadata={"source": "vault/project_c.md"}),
+        Document(page_content="ran kubernetes clusters", metadata={"source": "vault/project_d.md"}),
+    ]
+
+
+def _store(path, quantize=False):
+    return NumpyVectorStore.from_documents(
+        _docs(),
+        KeywordEmbeddings(),
+        ids=["a", "b", "c", "d"],
+        persist_directory=str(path),
+        collection_name="test",
+        quantize=quantize,
+    )
+
+
+@pytest.mark.parametrize("quantize", [False, True])
+def test_exact_top_k_matches_brute_force(tmp_path, quantize):
+    """Test that the matmul + argpartition search ranks like a brute-force cosine sort."""
+    store = _store(tmp_path, quantize=quantize)
+    embeddings = KeywordEmbeddings()
+    vectors = np.array(embeddings.embed_documents([d.page_content for d in _docs()]))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    for query in ["python", "postgres sql", "kubernetes", "tensorflow python"]:
+        q = np.array(embeddings.embed_query(query))
+        expected = list(np.argsort(-(vectors @ (q / np.linalg.norm(q))))[:2])
+        results = store.similarity_search(query, k=2)
+        assert [doc.id for doc in results] == [["a", "b", "c", "d"][i] for i in expected]
+
+
+def test_retriever_interface_and_reopen(tmp_path):
+    """Test that as_retriever works and a fresh instance reads the persisted index."""
+    _store(tmp_path)
+    reopened = NumpyVectorStore(str(tmp_path), KeywordEmbeddings(), "test")
+    docs = reopened.as_retriever(search_kwargs={"k": 1}).invoke("sql")
+    assert docs[0].page_content == "tuned sql and postgres queries"
+    assert docs[0].metadata == {"source": "vault/role_b.md"}
+    assert len(reopened) == 4
+    assert len(reopened.similarity_search("python", k=50)) == 4
+
+
+def test_add_and_delete(tmp_path):
+    """Test that incremental adds, upserts and deletes are persisted."""
+    store = _store(tmp_path)
+    store.delete(ids=["a", "c"])
+    store.add_documents([Document(page_content="wrote rust tooling")], ids=["e"])
+    store.add_documents([Document(page_content="ran airflow dags")], ids=["d"])
+
+    reopened = NumpyVectorStore(str(tmp_path), KeywordEmbeddings(), "test")
+    assert len(reopened) == 3
+    assert reopened.similarity_search("rust", k=1)[0].id == "e"
+    assert reopened.similarity_search("airflow", k=1)[0].page_content == "ran airflow dags"
+    assert all(doc.id not in ("a", "c") for doc in reopened.similarity_search("python", k=3))
+
+
+def test_empty_store(tmp_path):
+    """Test that searching a missing index returns nothing instead of failing."""
+    store = NumpyVectorStore(str(tmp_path), KeywordEmbeddings(), "missing")
+    assert store.similarity_search("python") == []
+    store.add_texts(["python"], ids=["x"])
+    store.delete(ids=["x"])
+    assert store.similarity_search("python") == []
@@ -1,3 +1,4 @@
+import os
 import pytest
 from unittest.mock import MagicMock, patch
 from resume_forge.pipeline import tailor_resume_section
@@ -30,7 +31,7 @@ def test_tailor_resume_section(mock_get_llm, mock_get_retriever):
 
     # Test inputs
     jd = "Looking for a Python developer."
-    template = "\\resumeItem{...}"
+    template = "\\section{Skills}\n%% SKILLS %%\n\\resumeItem{...}"
 
     # Execution
     # Note: constructing the chain might fail if mocks aren't perfect Runnables.
@@ -47,8 +48,305 @@ def test_tailor_resume_section(mock_get_llm, mock_get_retriever):
         
         result = tailor_resume_section(jd, template)
         
-        assert result == "Tailored LaTeX content"
+        assert result == "\\section{Skills}\nTailored LaTeX content\n\\resumeItem{...}"
         mock_chain.invoke.assert_called_once()
         call_args = mock_chain.invoke.call_args[0][0]
         assert call_args["job_description"] == jd
-        assert call_args["section_template"] == template
+        assert call_args["section_name"] == "SKILLS"
+
+
+def test_tailor_resume_section_concurrent():
+    """
+    Test that sections are generated concurrently but substituted deterministically,
+    and that a failing section only affects its own placeholder.
+    """
+    import threading
+    import time
+
+    in_flight = []
+    lock = threading.Lock()
+    active = [0]
+
+    def fake_invoke(inputs):
+        with lock:
+            active[0] += 1
+            in_flight.append(active[0])
+        # Finish in reverse order of submission
+        time.sleep({"SKILLS": 0.15, "EXPERIENCE": 0.1, "PROJECTS": 0.05}[inputs["section_name"]])
+        with lock:
+            active[0] -= 1
+        if inputs["section_name"] == "EXPERIENCE":
+            raise RuntimeError("server busy")
+        return f"{inputs['section_name'].lower()} content"
+
+    template = "A\n%% SKILLS %%\nB\n%% EXPERIENCE %%\nC\n%% PROJECTS %%"
+
+    with patch("resume_forge.pipeline.build_rag_chain") as mock_build_chain:
+        mock_chain = MagicMock()
+        mock_chain.invoke.side_effect = fake_invoke
+        mock_build_chain.return_value = mock_chain
+
+        result = tailor_resume_section("JD", template)
+
+    assert result == "A\nskills content\nB\n% Error generating EXPERIENCE: server busy\nC\nprojects content"
+    assert max(in_flight) > 1
+
+
+def test_response_cache_skips_llm_on_rerun(tmp_path):
+    """Test that with LLM_CACHE_ENABLED an identical prompt is answered from the cache."""
+    from langchain_core.language_models.fake_chat_models import FakeListChatModel
+    from resume_forge.config import settings
+    from resume_forge.pipeline import build_rag_chain
+
+    llm = FakeListChatModel(responses=["first", "second"])
+    retriever = MagicMock()
+    retriever.invoke.return_value = []
+
+    with patch.object(settings, "LLM_CACHE_ENABLED", True), \
+            patch.object(settings, "LLM_CACHE_PATH", str(tmp_path / "llm.sqlite")), \
+            patch("resume_forge.pipeline.get_llm", return_value=llm), \
+            patch("resume_forge.pipeline.get_retriever", return_value=retriever):
+        chain = build_rag_chain()
+        inputs = {"job_description": "Python developer", "section_name": "SKILLS"}
+        assert chain.invoke(inputs) == "first"
+        assert chain.invoke(inputs) == "first"
+        assert chain.invoke({**inputs, "section_name": "PROJECTS"}) == "second"
+
+
+def test_stream_tailored_resume_matches_buffered_output():
+    """Test that the streaming path writes the same document as tailor_resume_section."""
+    from resume_forge.pipeline import stream_tailored_resume
+
+    responses = {
+        "SKILLS": "```latex\n\\textbf{Languages:} & **Python**, SQL \\\\\n```\n\n",
+        "EXPERIENCE": "\n  \\item Cut costs by 30% & more   \n\n\n\\item _Shipped_ it\n",
+        "PROJECTS": "Plain line",
+    }
+    chain = MagicMock()
+    chain.invoke.side_effect = lambda x: responses[x["section_name"]]
+    # Stream in small, awkwardly split chunks
+    chain.stream.side_effect = lambda x: iter(
+        responses[x["section_name"]][i:i + 3] for i in range(0, len(responses[x["section_name"]]), 3)
+    )
+    template = "  \\begin{document}\n%% SKILLS %%\nA\n%%  EXPERIENCE %%\nB\n%% PROJECTS %%\n\\end{document}\n"
+
+    written = []
+    stats = stream_tailored_resume("JD", template, written.append, chain=chain)
+
+    assert "".join(written) == tailor_resume_section("JD", template, chain=chain)
+    assert [s.section for s in stats] == ["SKILLS", "EXPERIENCE", "PROJECTS"]
+    assert all(s.time_to_first_token is not None and s.tokens > 0 for s in stats)
+
+
+@pytest.mark.parametrize("response, expected", [
+    ("```latex  \n\\item Python\n```   \n", "\\item Python"),
+    ("```LaTeX\t\n\\item a\n```\n\\item b\n```", "\\item a\n\\item b"),
+    ("\\item saved $5K\n\\item \\textbf{Go}", "\\item saved \\$5K\n\\item \\textbf{Go}"),
+    ("\\item 30% cheaper   \n\n\n  **faster**  ", "\\item 30\\% cheaper   \n\n\n  \\textbf{faster}"),
+])
+@pytest.mark.parametrize("chunk_size", [1, 4, 1000])
+def test_streaming_and_buffered_cleanup_agree(response, expected, chunk_size):
+    """Test that fences (with trailing whitespace) and $ are cleaned the same whether streamed or buffered."""
+    from resume_forge.pipeline import StreamingSanitizer, _clean_fragment
+
+    stream = StreamingSanitizer()
+    streamed = "".join(stream.feed(response[i:i + chunk_size]) for i in range(0, len(response), chunk_size))
+    streamed += stream.flush()
+
+    assert streamed == _clean_fragment(response) == expected
+
+
+def test_prompt_prefix_is_shared_across_sections():
+    """Test that the rendered prompts of different sections only differ in the tail."""
+    from langchain_core.documents import Document
+    from langchain_core.runnables import RunnableLambda
+    from resume_forge.pipeline import build_rag_chain
+
+    prompts = []
+    llm = RunnableLambda(lambda prompt_value, **generation_kwargs: prompts.append(prompt_value.to_string()) or "ok")
+    retriever = MagicMock()
+    retriever.invoke.return_value = [
+        Document(page_content="Built Airflow pipelines", metadata={"source": "vault/role_a.md"}),
+        Document(page_content="Kaggle notebook in Python", metadata={"source": "vault/project_b.md"}),
+    ]
+
+    with patch("resume_forge.pipeline.get_llm", return_value=llm), \
+            patch("resume_forge.pipeline.get_retriever", return_value=retriever):
+        chain = build_rag_chain()
+        for section in ["SKILLS", "EXPERIENCE"]:
+            chain.invoke({"job_description": "Unique JD text", "section_name": section})
+
+    skills, experience = prompts
+    shared = len(os.path.commonprefix([skills, experience]))
+    assert "Unique JD text" in skills[:shared]
+    assert "If **SKILLS**" in skills[:shared]  # section formats are part of the prefix
+    assert shared > skills.index("### CONTEXT")  # everything before the section-specific tail
+
+
+def test_multi_section_single_call_with_fallback():
+    """Test that single-call mode splits the delimited response and backfills missing sections."""
+    from resume_forge.config import settings
+
+    combined = MagicMock()
+    combined.invoke.return_value = (
+        "%%% SECTION: SKILLS %%%\n```latex\n**Python** & SQL\n```\n"
+        "%%% SECTION: PROJECTS %%%\nShipped it\n"
+    )
+    per_section = MagicMock()
+    per_section.invoke.side_effect = lambda x: f"{x['section_name'].lower()} content"
+    template = "A\n%% SKILLS %%\nB\n%% EXPERIENCE %%\nC\n%% PROJECTS %%"
+
+    with patch.object(settings, "MULTI_SECTION_GENERATION", True), \
+            patch("resume_forge.pipeline.build_multi_section_chain", return_value=combined), \
+            patch("resume_forge.pipeline.build_rag_chain", return_value=per_section):
+        result = tailor_resume_section("JD", template)
+
+    assert result == "A\n\\textbf{Python} \\& SQL\nB\nexperience content\nC\nShipped it"
+    combined.invoke.assert_called_once_with(
+        {"job_description": "JD", "section_names": ["SKILLS", "EXPERIENCE", "PROJECTS"]}
+    )
+    assert [c.args[0]["section_name"] for c in per_section.invoke.call_args_list] == ["EXPERIENCE"]
+
+
+def test_custom_placeholders_and_options_reach_the_chain():
+    """Test that any placeholder is generated and its max_items option is passed to the prompt inputs."""
+    chain = MagicMock()
+    chain.invoke.side_effect = lambda x: f"{x['section_name'].lower()}:{x.get('section_constraints', '')}"
+    template = "A\n%% SUMMARY %%\nB\n%% EXPERIENCE max_items=2 %%\nC\n%% SUMMARY %%"
+
+    result = tailor_resume_section("JD", template, chain=chain)
+
+    assert result == "A\nsummary:\nB\nexperience:at most 2 items\nC\nsummary:"
+    assert chain.invoke.call_count == 2
+
+
+def test_only_invalid_sections_are_retried_with_feedback():
+    """Test that a section failing LaTeX validation is regenerated alone, with the problems in the prompt."""
+    from resume_forge.config import settings
+    from resume_forge.pipeline import get_validation_stats
+
+    attempts = {"SKILLS": ["\\textbf{Python} & SQL"], "EXPERIENCE": ["\\begin{itemize}\n\\item Did it", "\\item Did it"]}
+    feedback = []
+
+    def fake_invoke(inputs):
+        feedback.append((inputs["section_name"], inputs.get("retry_feedback", "")))
+        return attempts[inputs["section_name"]].pop(0)
+
+    chain = MagicMock()
+    chain.invoke.side_effect = fake_invoke
+    before = get_validation_stats().stats()
+
+    with patch.object(settings, "SECTION_MAX_RETRIES", 1):
+        result = tailor_resume_section("JD", "%% SKILLS %%\n%% EXPERIENCE %%", chain=chain)
+
+    assert result == "\\textbf{Python} \\& SQL\n\\item Did it"
+    assert sorted(name for name, _ in feedback) == ["EXPERIENCE", "EXPERIENCE", "SKILLS"]
+    assert "\\begin{itemize} is never closed" in [text for name, text in feedback if text][0]
+    after = get_validation_stats().stats()
+    assert {key: after[key] - before[key] for key in after} == {"sections": 2, "retried": 1, "retries": 1, "failed": 0}
+
+
+def test_section_still_invalid_after_retries_is_kept_with_warning():
+    """Test that the retry budget is capped and the last attempt is kept behind a warning comment."""
+    from resume_forge.config import settings
+
+    chain = MagicMock()
+    chain.invoke.return_value = "\\textbf{unclosed"
+
+    with patch.object(settings, "SECTION_MAX_RETRIES", 2):
+        result = tailor_resume_section("JD", "%% SKILLS %%", chain=chain)
+
+    assert chain.invoke.call_count == 3
+    assert result == "% Warning: SKILLS failed LaTeX validation: unbalanced braces: 1 '{' never closed\n\\textbf{unclosed"
+
+
+def test_fragment_monitor_cuts_at_marker_and_closing_environment():
+    """Test that the monitor stops at a stop marker or the top-level end of stop_after, across chunk splits."""
+    from resume_forge.pipeline import FragmentMonitor
+
+    def run(monitor, text, size=3):
+        out = [monitor.feed(text[i:i + size]) for i in range(0, len(text), size)]
+        return "".join(out) + monitor.flush()
+
+    text = "\\item Did it\n\\item Shipped\n\\section{Projects}\n\\item more"
+    monitor = FragmentMonitor(["\\section{"])
+    assert run(monitor, text) == "\\item Did it\n\\item Shipped\n"
+    assert monitor.stopped
+
+    skills = "\\begin{tabular}{ll}\n\\begin{tabular}{l} x \\end{tabular} & y \\\\\n\\end{tabular}\nSure, here is"
+    monitor = FragmentMonitor([], stop_after="tabular")
+    assert run(monitor, skills, size=2).endswith("& y \\\\\n\\end{tabular}")
+
+    monitor = FragmentMonitor(["\\section{"])
+    assert monitor.feed("a \\sec") == "a "  # possible marker start held back
+    assert monitor.flush() == "\\sec" and not monitor.stopped
+
+
+def test_section_limits_precedence():
+    """Test that placeholder options override the configured budgets and stop environments."""
+    from resume_forge.config import settings
+    from resume_forge.pipeline import combined_limits, section_limits
+
+    with patch.object(settings, "SECTION_MAX_TOKENS", 1000), \
+            patch.object(settings, "SECTION_TOKEN_BUDGETS", {"SKILLS": 400}), \
+            patch.object(settings, "SECTION_STOP_AFTER", {"SKILLS": "tabular"}):
+        skills = section_limits("SKILLS")
+        assert (skills.max_tokens, skills.stop_after) == (400, "tabular")
+        assert "%%% SECTION" in skills.stop
+        custom = section_limits("SKILLS", {"max_tokens": 50, "stop_after": "itemize"})
+        assert (custom.max_tokens, custom.stop_after) == (50, "itemize")
+        assert section_limits("SUMMARY").max_tokens == 1000
+        assert combined_limits(["SKILLS", "SUMMARY"]).max_tokens == 1400
+        assert "%%% SECTION" not in combined_limits(["SKILLS"]).stop
+
+
+def test_chain_binds_limits_and_stops_early():
+    """Test that the section's budget and stop sequences reach the model and trailing chatter is cut."""
+    from langchain_core.runnables import RunnableLambda
+    from resume_forge.pipeline import build_rag_chain
+
+    calls = []
+
+    def fake_llm(prompt_value, **generation_kwargs):
+        calls.append(generation_kwargs)
+        return "\\begin{tabular}{ll}\n a & b \\\\\n\\end{tabular}\nLet me know if you need more!"
+
+    retriever = MagicMock()
+    retriever.invoke.return_value = []
+
+    with patch("resume_forge.pipeline.get_llm", return_value=RunnableLambda(fake_llm)), \
+            patch("resume_forge.pipeline.get_retriever", return_value=retriever):
+        chain = build_rag_chain()
+        output = chain.invoke({
+            "job_description": "JD", "section_name": "SKILLS",
+            "section_options": {"max_tokens": 120, "stop_after": "tabular"},
+        })
+
+    assert output == "\\begin{tabular}{ll}\n a & b \\\\\n\\end{tabular}"
+    assert calls[0]["max_tokens"] == 120
+    assert "\\section{" in calls[0]["stop"]
+
+
+def test_only_four_stop_sequences_reach_the_server():
+    """Test that extra GENERATION_STOP_MARKERS are left to the stream monitor instead of the stop parameter."""
+    from langchain_core.runnables import RunnableLambda
+    from resume_forge.config import settings
+    from resume_forge.pipeline import build_rag_chain
+
+    calls = []
+
+    def fake_llm(prompt_value, **generation_kwargs):
+        calls.append(generation_kwargs)
+        return "\\item Built it\n\\subsection{Next}\n\\item More"
+
+    retriever = MagicMock()
+    retriever.invoke.return_value = []
+    markers = ["\\header{", "\\section{", "\\cventry{", "\\resumeItem{", "\\subsection{"]
+
+    with patch.object(settings, "GENERATION_STOP_MARKERS", markers), \
+            patch("resume_forge.pipeline.get_llm", return_value=RunnableLambda(fake_llm)), \
+            patch("resume_forge.pipeline.get_retriever", return_value=retriever):
+        output = build_rag_chain().invoke({"job_description": "JD", "section_name": "EXPERIENCE"})
+
+    assert calls[0]["stop"] == markers[:4]
+    assert output == "\\item Built it\n"  # cut at the fifth marker, on the stream
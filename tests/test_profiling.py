@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+from resume_forge import profiling
+
+
+@pytest.fixture(autouse=True)
+def clean_profiler():
+    profiling.disable()
+    profiling.reset()
+    yield
+    profiling.disable()
+    profiling.reset()
+
+
+def test_disabled_profiler_records_nothing():
+    """Test that spans are shared no-ops and nothing is recorded until profiling is enabled."""
+    with profiling.span("retrieval.search", k=4) as span:
+        span.set(results=3)
+    profiling.record("cli.import", 0.0, 1.0)
+    assert profiling.span("a") is profiling.span("b")
+    assert profiling.events() == []
+    assert profiling.summary() == []
+
+
+def test_spans_are_summarized_by_stage():
+    """Test that enabled spans and recorded timings are aggregated per stage."""
+    profiling.enable()
+    for count in (1, 2):
+        with profiling.span("retrieval.search") as span:
+            span.set(results=count)
+    profiling.record("cli.import", 0.0, 0.5)
+    with pytest.raises(ValueError):
+        with profiling.span("pipeline.sanitize"):
+            raise ValueError("boom")
+
+    stages = {stage["name"]: stage for stage in profiling.summary()}
+    assert stages["retrieval.search"]["calls"] == 2
+    assert stages["cli.import"]["total"] == pytest.approx(0.5)
+    assert stages["cli.import"]["mean"] == pytest.approx(0.5)
+    assert [e["args"] for e in profiling.events() if e["name"] == "retrieval.search"] == [
+        {"results": 1}, {"results": 2}
+    ]
+    assert profiling.events()[-1]["args"] == {"error": "ValueError"}
+
+
+def test_write_trace_produces_chrome_trace(tmp_path):
+    """Test that the trace file holds complete events plus metadata and the summary."""
+    profiling.enable()
+    with profiling.span("llm.generate", section="SKILLS"):
+        pass
+    path = tmp_path / "profiles" / "tailor.json"
+    profiling.write_trace(str(path), {"command": "tailor", "model": "local-model"})
+
+    trace = json.loads(path.read_text())
+    [event] = trace["traceEvents"]
+    assert event["ph"] == "X"
+    assert event["cat"] == "llm"
+    assert event["tid"] == 0
+    assert event["args"] == {"section": "SKILLS"}
+    assert trace["otherData"]["command"] == "tailor"
+    assert trace["otherData"]["summary"][0]["name"] == "llm.generate"
@@ -0,0 +1,82 @@
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.documents import Document
+
+from resume_forge.retrieval import clear_retrieval_cache, retrieve_for_jd, select_for_section
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    clear_retrieval_cache()
+    yield
+    clear_retrieval_cache()
+
+
+def _doc(source, text="chunk"):
+    return Document(page_content=text, metadata={"source": f"vault/{source}"})
+
+
+def test_retrieve_once_per_jd():
+    """Test that concurrent section lookups for the same JD share a single search."""
+    barrier = threading.Barrier(3)
+    retriever = MagicMock()
+    retriever.invoke.return_value = [_doc("role_a.md")]
+
+    results = []
+
+    def worker():
+        barrier.wait()
+        results.append(retrieve_for_jd("Python developer", retriever))
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert retriever.invoke.call_count == 1
+    assert all(r == results[0] for r in results)
+
+    retrieve_for_jd("Python developer", retriever)
+    retrieve_for_jd("Go developer", retriever)
+    assert retriever.invoke.call_count == 2
+
+
+def test_failed_retrieval_is_not_memoized():
+    retriever = MagicMock()
+    retriever.invoke.side_effect = [RuntimeError("store offline"), [_doc("role_a.md")]]
+
+    with pytest.raises(RuntimeError):
+        retrieve_for_jd("JD", retriever)
+    assert len(retrieve_for_jd("JD", retriever)) == 1
+
+
+def test_retrieval_cache_keeps_most_recent_jds():
+    """Test that the memoized searches are bounded, evicting the least recently used JD."""
+    from unittest.mock import patch
+    from resume_forge.config import settings
+
+    retriever = MagicMock()
+    retriever.invoke.return_value = [_doc("role_a.md")]
+    with patch.object(settings, "RETRIEVAL_CACHE_MAX_ENTRIES", 2):
+        for jd in ["A", "B", "A", "C"]:  # "A" is used again, so "B" is evicted
+            retrieve_for_jd(jd, retriever)
+        assert retriever.invoke.call_count == 3
+        retrieve_for_jd("A", retriever)
+        assert retriever.invoke.call_count == 3
+        retrieve_for_jd("B", retriever)
+        assert retriever.invoke.call_count == 4
+
+
+def test_select_for_section_prefers_matching_sources():
+    docs = [_doc("project_x.md"), _doc("role_a.md"), _doc("skills.md"), _doc("role_b.md")]
+
+    experience = select_for_section(docs, "EXPERIENCE", k=3)
+    assert [d.metadata["source"] for d in experience] == ["vault/role_a.md", "vault/role_b.md", "vault/project_x.md"]
+
+    projects = select_for_section(docs, "PROJECTS", k=2)
+    assert [d.metadata["source"] for d in projects] == ["vault/project_x.md", "vault/role_a.md"]
+
+    assert select_for_section(docs, "SKILLS", k=2) == docs[:2]
@@ -0,0 +1,152 @@
+import http.client
+import json
+import os
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from resume_forge import client, vectorstore
+from resume_forge.config import settings
+from resume_forge.server import BusyError, ForgeServer, ForgeService
+
+
+@pytest.fixture
+def daemon():
+    """A ForgeServer on a free local port, with the client settings pointing at it."""
+    service = ForgeService(workers=2, max_queue=0)
+    server = ForgeServer("127.0.0.1", 0, service)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    with patch.object(settings, "SERVE_HOST", "127.0.0.1"), \
+            patch.object(settings, "SERVE_PORT", server.server_address[1]):
+        yield service
+    server.shutdown()
+    server.server_close()
+    service.shutdown()
+
+
+def test_pool_rejects_requests_beyond_queue():
+    """Test that the service answers BusyError once workers and queue are full."""
+    service = ForgeService(workers=1, max_queue=1)
+    release = threading.Event()
+    started = threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return "done"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(service.submit(slow))) for _ in range(2)]
+    for t in threads:
+        t.start()
+    started.wait(5)
+    while service.status()["queued"] < 1:
+        time.sleep(0.01)  # second request is waiting for the only worker
+    with pytest.raises(BusyError):
+        service.submit(slow)
+
+    release.set()
+    for t in threads:
+        t.join()
+    assert results == ["done", "done"]
+    service.shutdown()
+
+
+def test_client_round_trip(daemon):
+    """Test that the CLI client finds the daemon and gets tailored output back."""
+    status = client.find_daemon()
+    assert status["workers"] == 2
+    assert client.config_mismatch(status) is None
+    with patch.object(settings, "RETRIEVAL_MODE", "hybrid" if settings.RETRIEVAL_MODE != "hybrid" else "dense"):
+        assert client.config_mismatch(status) == "retrieval_mode"
+
+    with patch.object(ForgeService, "tailor", lambda self, jd, template, candidate, validation: f"{candidate}:{template}:{jd}"):
+        assert client.request("/tailor", {"job_description": "JD", "template": "TPL"})["output"] == ":TPL:JD"
+        payload = {"job_description": "JD", "template": "TPL", "candidate": "alice"}
+        assert client.request("/tailor", payload)["output"] == "alice:TPL:JD"
+
+    for payload in ({"job_description": " ", "template": "TPL"}, {"job_description": "JD", "template": "TPL", "candidate": "a/b"}):
+        with pytest.raises(client.DaemonError) as error:
+            client.request("/tailor", payload)
+        assert error.value.status == 400
+
+
+def _raw_post(path: str, headers: dict, body: bytes = b'{"vault_dir": "/", "incremental": false}'):
+    connection = http.client.HTTPConnection(settings.SERVE_HOST, settings.SERVE_PORT, timeout=5)
+    try:
+        connection.putrequest("POST", path, skip_host=True)
+        for name, value in {"Host": f"{settings.SERVE_HOST}:{settings.SERVE_PORT}", **headers}.items():
+            connection.putheader(name, value)
+        connection.putheader("Content-Length", str(len(body)))
+        connection.endheaders(body)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+
+@pytest.mark.parametrize("headers, status", [
+    ({"Content-Type": "text/plain"}, 415),
+    ({}, 415),
+    ({"Content-Type": "application/json", "Host": "evil.example:8765"}, 403),
+    ({"Content-Type": "application/json", "Host": "127.0.0.1:1"}, 403),
+    ({"Content-Type": "application/json", "Origin": "https://evil.example"}, 403),
+    ({"Content-Type": "application/json", "Origin": "null"}, 403),
+])
+def test_requests_a_web_page_could_send_are_rejected(daemon, headers, status):
+    """Test that simple-content-type, foreign-Host and Origin-carrying requests never reach the service."""
+    with patch.object(ForgeService, "ingest", side_effect=AssertionError("ingest must not run")):
+        assert _raw_post("/ingest", headers)[0] == status
+
+
+def test_local_json_requests_are_accepted(daemon, tmp_path):
+    """Test that a JSON request addressed to the daemon's own host and port gets through."""
+    payload = json.dumps({"vault_dir": str(tmp_path)}).encode("utf-8")
+    with patch.object(ForgeService, "ingest", lambda self, *args: {"ingested": 0}):
+        for host in (f"127.0.0.1:{settings.SERVE_PORT}", f"localhost:{settings.SERVE_PORT}"):
+            headers = {"Content-Type": "application/json; charset=utf-8", "Host": host}
+            assert _raw_post("/ingest", headers, payload)[0] == 200
+
+
+def test_tailor_reports_only_its_own_validation(daemon):
+    """Test that /tailor returns the validation outcomes of that request, not the daemon's running totals."""
+    def fake_tailor(self, jd, template, candidate, validation):
+        validation.record(retries=int(jd), failed=False)
+        return "out"
+
+    with patch.object(ForgeService, "tailor", fake_tailor):
+        payload = {"job_description": "2", "template": "TPL"}
+        for _ in range(2):
+            assert client.request("/tailor", payload)["validation"] == {
+                "sections": 1, "retried": 1, "retries": 2, "failed": 0,
+            }
+
+
+def test_no_daemon_running():
+    """Test that find_daemon returns None quickly when nothing listens on the port."""
+    with patch.object(settings, "SERVE_PORT", 9):  # discard port, never a daemon
+        assert client.find_daemon() is None
+
+
+def test_chain_rebuilt_when_index_changes_on_disk(tmp_path):
+    """Test that an ingest by another process (new manifest) reopens the index and chain."""
+    manifest = tmp_path / "ingest_manifest.json"
+    manifest.write_text("{}")
+    chains = iter(["chain-1", "chain-2"])
+
+    with patch.object(vectorstore, "_manifest_path", return_value=str(manifest)), \
+            patch("resume_forge.pipeline.build_tailor_chain", side_effect=lambda candidate: next(chains)), \
+            patch("resume_forge.llm.check_llm_status", return_value=True), \
+            patch("resume_forge.pipeline.tailor_resume_section", side_effect=lambda jd, tpl, chain, candidate, validation: chain):
+        service = ForgeService(workers=1, max_queue=0)
+        assert service.tailor("JD", "TPL") == "chain-1"
+        assert service.tailor("JD", "TPL") == "chain-1"
+
+        manifest.write_text('{"files": {}}')
+        stat = manifest.stat()
+        os.utime(manifest, (stat.st_atime, stat.st_mtime + 10))
+        assert service.tailor("JD", "TPL") == "chain-2"
+        service.shutdown()
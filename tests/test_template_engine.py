@@ -0,0 +1,58 @@
+import pytest
+
+from resume_forge.template_engine import TemplateError, describe_options, parse_template
+
+TEMPLATE = (
+    "\\newcommand{\\bull}{$\\bullet$}\n"
+    "%%%%%%%%%%%%%% DEFINITIONS %%%%%%%%%%%%%%\n"
+    "\\header{Summary}\n%% SUMMARY %%\n"
+    "\\header{Experience}\n%%  EXPERIENCE max_items=3 %%\n"
+    "% footer: %% lower case is not a placeholder %%\n"
+    "%% SUMMARY %%\n"
+)
+
+
+def test_parse_discovers_placeholders_and_options():
+    """Test that any upper-case placeholder is found, with options, and comment rules are ignored."""
+    template = parse_template(TEMPLATE)
+
+    assert template.sections == ["SUMMARY", "EXPERIENCE"]
+    assert [p.name for p in template.placeholders] == ["SUMMARY", "EXPERIENCE", "SUMMARY"]
+    assert template.placeholders[1].options == {"max_items": 3}
+    assert describe_options(template.placeholders[1].options) == "at most 3 items"
+    assert "bull" in template.commands
+    assert "%% DEFINITIONS %%" in template.segments[0]
+
+
+def test_generation_options_are_parsed_but_not_described():
+    """Test that max_tokens and stop_after are kept as section options without adding prompt text."""
+    template = parse_template("%% SKILLS max_tokens=300 stop_after=tabular %%\n%% EXPERIENCE max_items=2 %%\n%% SUMMARY %%")
+
+    assert template.section_options() == {
+        "SKILLS": {"max_tokens": 300, "stop_after": "tabular"},
+        "EXPERIENCE": {"max_items": 2},
+    }
+    assert [describe_options(options) for options in template.section_options().values()] == ["", "at most 2 items"]
+
+
+def test_render_fills_every_occurrence_in_one_pass():
+    """Test that rendering fills repeated placeholders and leaves the literal text untouched."""
+    template = parse_template(TEMPLATE)
+    output = template.render({"SUMMARY": "Backend engineer.", "EXPERIENCE": "\\item Did $x$ 100%"})
+
+    assert output.count("Backend engineer.") == 2
+    assert "\\header{Experience}\n\\item Did $x$ 100%\n" in output  # no regex escapes applied
+    assert "SUMMARY" not in output and "EXPERIENCE" not in output
+
+
+def test_parse_is_cached_by_content():
+    """Test that parsing the same content twice returns the cached parse."""
+    assert parse_template(TEMPLATE) is parse_template(str(TEMPLATE))
+    assert parse_template(TEMPLATE + "\n") is not parse_template(TEMPLATE)
+
+
+@pytest.mark.parametrize("placeholder", ["%% SKILLS max_item=3 %%", "%% SKILLS max_items=three %%", "%% SKILLS max_items=0 %%", "%% SKILLS max_tokens=0 %%"])
+def test_invalid_options_raise(placeholder):
+    """Test that unknown or invalid placeholder options are reported instead of ignored."""
+    with pytest.raises(TemplateError, match="SKILLS"):
+        parse_template(f"A\n{placeholder}\nB")
@@ -4,7 +4,7 @@ import shutil
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
-from resume_forge.vectorstore import ingest_vault, get_retriever
+from resume_forge.vectorstore import ingest_vault, sync_vault, get_retriever, list_candidates
 from resume_forge.config import settings
 
 @pytest.fixture
@@ -59,3 +59,170 @@ def test_retriever(mock_settings, temp_vault):
     docs = retriever.invoke("SQL")
     assert len(docs) > 0
     assert "Project 2" in docs[0].page_content
+
+def test_sync_vault_incremental(mock_settings, temp_vault):
+    """Test that an incremental ingest only touches chunks from changed files."""
+    ingest_vault(str(temp_vault))
+
+    stats = sync_vault(str(temp_vault))
+    assert (stats.added, stats.removed, stats.unchanged) == (0, 0, 2)
+
+    (temp_vault / "project2.md").write_text("# Project 2\nMigrated a database to Postgres.", encoding="utf-8")
+    (temp_vault / "project3.md").write_text("# Project 3\nTrained a model with TensorFlow.", encoding="utf-8")
+    stats = sync_vault(str(temp_vault))
+    assert (stats.added, stats.removed, stats.unchanged) == (2, 1, 1)
+    assert stats.total == 3
+
+    (temp_vault / "project1.md").unlink()
+    stats = sync_vault(str(temp_vault))
+    assert (stats.added, stats.removed, stats.unchanged) == (0, 1, 2)
+
+    docs = get_retriever().invoke("TensorFlow")
+    assert "Project 3" in docs[0].page_content
+
+def test_sync_vault_only_hashes_changed_paths(mock_settings, temp_vault):
+    """Test that sync_vault with changed_paths leaves other (even modified) files untouched."""
+    with patch.object(settings, "RETRIEVAL_MODE", "lexical"):
+        ingest_vault(str(temp_vault))
+
+        (temp_vault / "project1.md").write_text("# Project 1\nRewrote it in Rust.", encoding="utf-8")
+        (temp_vault / "project2.md").unlink()
+        (temp_vault / "project3.md").write_text("# Project 3\nTrained a model with TensorFlow.", encoding="utf-8")
+        stats = sync_vault(str(temp_vault), [str(temp_vault / "project2.md"), str(temp_vault / "project3.md")])
+        assert (stats.added, stats.removed) == (1, 1)
+        assert stats.total == 2
+
+        # project1.md was not reported, so only a full sync picks it up
+        stats = sync_vault(str(temp_vault))
+        assert (stats.added, stats.removed, stats.unchanged) == (1, 1, 1)
+
+
+def test_candidates_have_isolated_indexes(mock_settings, temp_vault, tmp_path):
+    """Test that each candidate's ingest only replaces its own index, including the default one."""
+    other_vault = tmp_path / "other_vault"
+    other_vault.mkdir()
+    (other_vault / "role_a.md").write_text("# Role A\nRan Kubernetes clusters on AWS.", encoding="utf-8")
+
+    with patch.object(settings, "RETRIEVAL_MODE", "lexical"):
+        ingest_vault(str(other_vault), "alice")
+        ingest_vault(str(temp_vault))  # default candidate
+        ingest_vault(str(temp_vault), "bob")
+        ingest_vault(str(temp_vault))  # re-ingesting the default keeps the named candidates
+
+        assert list_candidates() == ["alice", "bob"]
+        alice = get_retriever(k=5, candidate="alice").invoke("Kubernetes Python")
+        default = get_retriever(k=5).invoke("Kubernetes Python")
+        assert [d.metadata["title"] for d in alice] == ["Role A"]
+        assert "Role A" not in [d.metadata["title"] for d in default]
+
+    with pytest.raises(ValueError, match="Invalid candidate name"):
+        get_retriever(candidate="../alice")
+
+
+def test_store_client_cache_evicts_least_recently_used(mock_settings, temp_vault):
+    """Test that at most STORE_CACHE_MAX_ENTRIES candidate indexes stay open and reused ones are hits."""
+    from resume_forge import vectorstore
+
+    with patch.object(settings, "RETRIEVAL_MODE", "lexical"), \
+            patch.object(settings, "STORE_CACHE_MAX_ENTRIES", 2):
+        for name in ("a", "b", "c"):
+            ingest_vault(str(temp_vault), name)
+        vectorstore._invalidate_vectorstore()
+        before = vectorstore.store_cache_stats()
+
+        first = vectorstore.get_lexical_index("a")
+        vectorstore.get_lexical_index("b")
+        assert vectorstore.get_lexical_index("a") is first
+        vectorstore.get_lexical_index("c")  # evicts "b", the least recently used
+        assert vectorstore.get_lexical_index("a") is first
+
+        after = vectorstore.store_cache_stats()
+        assert after["open_lexical_indexes"] == 2
+        assert {key: after[key] - before[key] for key in ("hits", "misses", "evictions")} == {
+            "hits": 2, "misses": 3, "evictions": 1,
+        }
+
+
+def test_evicted_and_reingested_chroma_clients_are_released(mock_settings, temp_vault):
+    """Test that evicting or re-ingesting a candidate stops its Chroma System and leaves the others open."""
+    from chromadb.api.client import SharedSystemClient
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+
+    from resume_forge import vectorstore
+
+    def open_systems():
+        return {
+            os.path.basename(identifier) or "default"
+            for identifier in SharedSystemClient._identifier_to_system
+            if identifier.startswith(settings.CHROMA_PERSIST_DIR)
+        }
+
+    with patch.object(settings, "VECTOR_BACKEND", "chroma"), \
+            patch.object(settings, "RETRIEVAL_MODE", "dense"), \
+            patch.object(settings, "STORE_CACHE_MAX_ENTRIES", 1), \
+            patch.object(vectorstore, "get_embeddings", return_value=DeterministicFakeEmbedding(size=8)):
+        for name in ("a", "b", "c"):
+            ingest_vault(str(temp_vault), name)
+        assert open_systems() == set()  # ingest closes the store it builds
+
+        for name in ("a", "b", "c"):
+            vectorstore.get_vectorstore(name)
+        assert open_systems() == {"c"}
+
+        ingest_vault(str(temp_vault), "a")
+        ingest_vault(str(temp_vault), "a")
+        assert open_systems() == {"c"}
+        retriever = get_retriever(k=1, candidate="a")  # evicts and closes "c"
+        assert open_systems() == {"a"}
+        vectorstore.get_vectorstore("b")
+        assert len(retriever.invoke("Python")) == 1  # reopens "a" through the cache
+        assert open_systems() == {"a"}
+
+        vectorstore._invalidate_vectorstore()
+        assert open_systems() == set()
+
+
+def test_store_evicted_during_a_query_is_closed_after_it(mock_settings):
+    """Test that a store evicted while a query searches it stays open until that query returns."""
+    import threading
+
+    from langchain_core.documents import Document
+    from langchain_core.runnables import RunnableLambda
+
+    from resume_forge import vectorstore
+
+    searching, release = threading.Event(), threading.Event()
+
+    class FakeStore:
+        def __init__(self, candidate):
+            self.candidate = candidate
+            self._client = MagicMock()
+
+        def as_retriever(self, search_kwargs):
+            return RunnableLambda(self.search)
+
+        def search(self, query):
+            searching.set()
+            release.wait(5)
+            assert not self._client.close.called, "store closed mid-query"
+            return [Document(page_content=self.candidate)]
+
+    with patch.object(settings, "RETRIEVAL_MODE", "dense"), \
+            patch.object(settings, "STORE_CACHE_MAX_ENTRIES", 1), \
+            patch.object(vectorstore, "_open_vectorstore", side_effect=FakeStore):
+        vectorstore._invalidate_vectorstore()
+        retriever = get_retriever(k=1, candidate="a")
+        store_a = vectorstore.get_vectorstore("a")
+        results = []
+        query = threading.Thread(target=lambda: results.append(retriever.invoke("Python")))
+        query.start()
+        assert searching.wait(5)
+
+        vectorstore.get_vectorstore("b")  # evicts "a" while the query is using it
+        assert not store_a._client.close.called
+        release.set()
+        query.join(5)
+
+        assert [doc.page_content for doc in results[0]] == ["a"]
+        store_a._client.close.assert_called_once()
+        vectorstore._invalidate_vectorstore()
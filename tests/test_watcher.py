@@ -0,0 +1,63 @@
+from resume_forge.watcher import VaultWatcher, changed_files, snapshot_vault
+
+
+def _vault(tmp_path):
+    (tmp_path / "role_a.md").write_text("# A\nDid a thing.", encoding="utf-8")
+    (tmp_path / "_template_role.md").write_text("# Template", encoding="utf-8")
+    return tmp_path
+
+
+def test_changed_files_reports_adds_edits_and_deletes(tmp_path):
+    """Test that snapshots skip templates and diff to added, modified and deleted paths."""
+    vault = _vault(tmp_path)
+    before = snapshot_vault(str(vault))
+    assert list(before) == [str(vault / "role_a.md")]
+
+    (vault / "role_a.md").write_text("# A\nDid a bigger thing.", encoding="utf-8")
+    (vault / "role_b.md").write_text("# B", encoding="utf-8")
+    assert changed_files(before, snapshot_vault(str(vault))) == {str(vault / "role_a.md"), str(vault / "role_b.md")}
+
+    after = snapshot_vault(str(vault))
+    (vault / "role_b.md").unlink()
+    assert changed_files(after, snapshot_vault(str(vault))) == {str(vault / "role_b.md")}
+
+
+def test_watcher_debounces_bursts_into_one_sync(tmp_path):
+    """Test that sync runs once, with every changed path, after changes settle."""
+    vault = _vault(tmp_path)
+    calls = []
+    watcher = VaultWatcher(str(vault), calls.append, debounce=1.0)
+
+    assert watcher.poll(now=0.0) is False  # nothing changed
+    (vault / "role_b.md").write_text("# B", encoding="utf-8")
+    assert watcher.poll(now=1.0) is False
+    (vault / "role_c.md").write_text("# C", encoding="utf-8")
+    assert watcher.poll(now=1.5) is False
+    assert watcher.poll(now=2.0) is False  # still within the debounce window
+    assert watcher.poll(now=2.6) is True
+    assert calls == [[str(vault / "role_b.md"), str(vault / "role_c.md")]]
+    assert watcher.poll(now=10.0) is False
+
+
+def test_watcher_retries_failed_sync(tmp_path):
+    """Test that paths from a failed sync are retried after another debounce period."""
+    vault = _vault(tmp_path)
+    attempts, results = [], []
+
+    def sync(paths):
+        attempts.append(paths)
+        if len(attempts) == 1:
+            raise RuntimeError("daemon busy")
+        return {"added": 1}
+
+    watcher = VaultWatcher(
+        str(vault), sync, debounce=1.0, on_result=lambda paths, result, error: results.append((result, error))
+    )
+    (vault / "role_b.md").write_text("# B", encoding="utf-8")
+    watcher.poll(now=0.0)
+    assert watcher.poll(now=1.0) is True
+    assert isinstance(results[0][1], RuntimeError)
+    assert watcher.poll(now=1.5) is False
+    assert watcher.poll(now=2.0) is True
+    assert attempts == [[str(vault / "role_b.md")]] * 2
+    assert results[1] == ({"added": 1}, None)